@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Synthetic catalogue loader for benchmarks
+Loads a reproducible catalogue of any size (10k to 1M components) built by
+synthetic_data.SyntheticCatalogue through the bulk-load path. Use a
+dedicated benchmark database: --reset truncates the catalogue.
+
+    python backend/benchmarks/catalogue.py --components 100000 --reset
+"""
+
+import os
+import sys
+import argparse
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+from migrate import get_database_url, migration_lock, migrate
+from synthetic_data import DEFAULT_SEED, SyntheticCatalogue, load_synthetic_catalogue
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def reset_catalogue(engine):
+    with engine.begin() as conn:
+        conn.execute(text("""
+            TRUNCATE component_compatibility, vehicle_models, vehicle_manufacturers,
+                     supply_chain_relationships, components, suppliers, categories,
+                     catalogue_sync_state RESTART IDENTITY CASCADE
+        """))
+
+def load_catalogue(engine, components, avg_degree=1.0, seed=DEFAULT_SEED, reset=False, depth=6):
+    """Migrate, optionally truncate, then bulk load the synthetic catalogue; returns stats"""
+    with migration_lock(engine):
+        migrate(engine)
+        if reset:
+            reset_catalogue(engine)
+        catalogue = SyntheticCatalogue(components, seed=seed, depth=depth, cross_links=avg_degree)
+        return load_synthetic_catalogue(engine, catalogue)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load a synthetic catalogue for benchmarks")
+    parser.add_argument('--components', type=int, default=10000, help="Number of components to generate")
+    parser.add_argument('--avg-degree', type=float, default=1.0,
+                        help="Mean lateral relationships per component, on top of the part_of chains")
+    parser.add_argument('--depth', type=int, default=6, help="Assembly tiers")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--reset', action='store_true', help="Truncate the catalogue tables first")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    engine = create_engine(get_database_url())
+    load_catalogue(engine, args.components, args.avg_degree, args.seed, args.reset, args.depth)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Compare two benchmark result files from run.py
+Prints per-endpoint deltas and exits non-zero when any endpoint's p95
+latency or query count regressed beyond the threshold.
+
+    python backend/benchmarks/compare.py baseline.json current.json --threshold 15
+"""
+
+import sys
+import json
+import argparse
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+def change(before, after):
+    if before in (None, 0) or after is None:
+        return None
+    return (after - before) / before * 100
+
+def compare(baseline, current, threshold):
+    rows, regressions = [], []
+    for name, after in current['endpoints'].items():
+        before = baseline['endpoints'].get(name)
+        if before is None:
+            continue
+        p95 = change(before['latency_ms']['p95'], after['latency_ms']['p95'])
+        rps = change(before['throughput_rps'], after['throughput_rps'])
+        queries_before = before['db_queries_per_request']['mean']
+        queries_after = after['db_queries_per_request']['mean']
+        rows.append((name, before['latency_ms']['p95'], after['latency_ms']['p95'], p95, rps,
+                     queries_before, queries_after))
+        if (p95 is not None and p95 > threshold) or (queries_after or 0) > (queries_before or 0):
+            regressions.append(name)
+    return rows, regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files")
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=10.0, help="Allowed p95 increase in percent")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    baseline, current = load(args.baseline), load(args.current)
+    rows, regressions = compare(baseline, current, args.threshold)
+
+    print(f"baseline {baseline['meta'].get('git_revision')}  current {current['meta'].get('git_revision')}")
+    print(f"{'endpoint':28} {'p95 before':>11} {'p95 after':>10} {'p95 %':>7} {'rps %':>7} {'queries':>11}")
+    fmt = lambda v: '-' if v is None else f"{v:+.1f}"
+    for name, p95_before, p95_after, p95, rps, q_before, q_after in rows:
+        flag = '  REGRESSED' if name in regressions else ''
+        print(f"{name:28} {p95_before:>11} {p95_after:>10} {fmt(p95):>7} {fmt(rps):>7} "
+              f"{q_before:>5}->{q_after:<5}{flag}")
+
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+In-process load generator for the Flask API
+Drives endpoints through the WSGI test client from a fixed number of
+threads, so results measure the application and the database rather than
+the network. SQL statements are counted per request with SQLAlchemy
+cursor events.
+"""
+
+import math
+import time
+import random
+import threading
+from collections import Counter
+from sqlalchemy import event
+
+class QueryCounter:
+    """Counts statements and database time per thread"""
+
+    def __init__(self, engine):
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._before)
+        event.listen(engine, 'after_cursor_execute', self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        # Counted before execution so statements that fail are included
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+        self._local.started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        self._local.db_seconds = getattr(self._local, 'db_seconds', 0.0) + \
+            time.perf_counter() - getattr(self._local, 'started', time.perf_counter())
+
+    def reset(self):
+        self._local.queries = 0
+        self._local.db_seconds = 0.0
+
+    def read(self):
+        return getattr(self._local, 'queries', 0), getattr(self._local, 'db_seconds', 0.0)
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = min(len(sorted_values), max(1, math.ceil(pct / 100 * len(sorted_values)))) - 1
+    return sorted_values[rank]
+
+def run_endpoint(app, counter, path_factory, requests, concurrency, warmup=0, seed=42):
+    """
+    Issue `requests` GETs from `concurrency` threads after `warmup` unmeasured
+    requests. path_factory(rng) returns the path for each request.
+    """
+    client = app.test_client()
+    warm_rng = random.Random(seed)
+    for _ in range(warmup):
+        client.get(path_factory(warm_rng))
+
+    remaining = [requests]
+    remaining_lock = threading.Lock()
+    samples = []
+    samples_lock = threading.Lock()
+
+    def worker(worker_id):
+        rng = random.Random(seed * 1000 + worker_id)
+        worker_client = app.test_client()
+        local = []
+        while True:
+            with remaining_lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            path = path_factory(rng)
+            counter.reset()
+            started = time.perf_counter()
+            response = worker_client.get(path)
+            body = response.get_data()
+            elapsed = time.perf_counter() - started
+            queries, db_seconds = counter.read()
+            local.append((elapsed, response.status_code, queries, db_seconds, len(body)))
+        with samples_lock:
+            samples.extend(local)
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    return summarise(samples, wall)
+
+def summarise(samples, wall_seconds):
+    latencies = sorted(s[0] * 1000 for s in samples)
+    statuses = Counter(str(s[1]) for s in samples)
+    queries = [s[2] for s in samples]
+    db_ms = [s[3] * 1000 for s in samples]
+    sizes = [s[4] for s in samples]
+    count = len(samples)
+
+    return {
+        'requests': count,
+        'errors': sum(n for status, n in statuses.items() if not status.startswith('2')),
+        'status_counts': dict(statuses),
+        'wall_seconds': round(wall_seconds, 3),
+        'throughput_rps': round(count / wall_seconds, 2) if wall_seconds else None,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 50), 3) if count else None,
+            'p95': round(percentile(latencies, 95), 3) if count else None,
+            'p99': round(percentile(latencies, 99), 3) if count else None,
+            'mean': round(sum(latencies) / count, 3) if count else None,
+            'max': round(latencies[-1], 3) if count else None,
+        },
+        'db_queries_per_request': {
+            'mean': round(sum(queries) / count, 2) if count else None,
+            'max': max(queries) if count else None,
+        },
+        'db_ms_per_request_mean': round(sum(db_ms) / count, 3) if count else None,
+        'response_bytes_mean': int(sum(sizes) / count) if count else None,
+    }
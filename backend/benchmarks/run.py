@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+API benchmark runner for RE4DY Supply Chain
+Optionally loads a synthetic catalogue, then drives each endpoint at a
+fixed concurrency and writes latency percentiles, throughput and DB query
+counts per endpoint as JSON. Compare two result files with compare.py.
+
+    python backend/benchmarks/run.py --load --components 100000 --reset \
+        --concurrency 8 --requests 500 --output bench-$(git rev-parse --short HEAD).json
+
+Point DATABASE_URL at a dedicated benchmark database.
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import subprocess
+import logging
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# The IP Screener blueprint needs credentials at import time; benchmarks never call it
+os.environ.setdefault('IPS_DATA_KEY', 'benchmark')
+os.environ.setdefault('IPS_SYSTEM_KEY', 'benchmark')
+os.environ.setdefault('IPS_CACHE_SWEEP_MINUTES', '0')
+# One access log line per measured request would swamp the report
+os.environ.setdefault('ACCESS_LOG', '0')
+
+from sqlalchemy import text
+from catalogue import load_catalogue
+from loadgen import QueryCounter, run_endpoint
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# name -> path template; {component_id}, {category} and {term} are sampled per request
+ENDPOINTS = {
+    'components_list': '/api/components?page=1&limit=50',
+    'components_list_summary': '/api/components?page=1&limit=50&fields=summary',
+    'components_page_deep': '/api/components?page=20&limit=50',
+    'components_by_category': '/api/components?category={category}&limit=50',
+    'components_faceted': '/api/components?search={term}&facets=true&limit=50',
+    'components_search': '/api/components/search?q={term}',
+    'component_detail': '/api/components/{component_id}',
+    'component_compatibility': '/api/components/{component_id}/compatibility',
+    'suppliers': '/api/suppliers',
+    'categories': '/api/categories',
+    'graph': '/api/visualization/graph?maxNodes=200',
+    'graph_clusters': '/api/visualization/graph/clusters?by=supplier&maxNodes=100',
+    'sankey': '/api/visualization/sankey?maxNodes=50',
+    'sankey_by_category': '/api/visualization/sankey?category={category}&maxNodes=50',
+    'component_relationships': '/api/visualization/component/{component_id}/relationships',
+    'relationships_sankey': '/api/relationships/sankey',
+    'statistics': '/api/visualization/statistics',
+    'component_impact': '/api/impact?component={component_id}&limit=100',
+    'cost_rollup': '/api/costs/rollup?component={component_id}&sub_components=10',
+    'component_alternatives': '/api/components/{component_id}/alternatives?k=10',
+}
+SEARCH_TERMS = ['brake', 'pump', 'sensor', 'turbo', 'filter', 'valve', 'light', 'seat']
+
+def sample_parameters(engine, seed, sample_size=1000):
+    """Component ids and category names that request paths are filled from"""
+    with engine.connect() as conn:
+        conn.execute(text("SELECT setseed(:seed)"), {'seed': (seed % 1000) / 1000})
+        component_ids = [row[0] for row in conn.execute(text("""
+            SELECT id FROM components WHERE is_active = true ORDER BY random() LIMIT :n
+        """), {'n': sample_size})]
+        categories = [row[0] for row in conn.execute(text("SELECT name FROM categories ORDER BY name"))]
+    return component_ids or [1], categories or ['Engine']
+
+def path_factory(template, component_ids, categories):
+    def build(rng):
+        return template.format(
+            component_id=rng.choice(component_ids),
+            category=rng.choice(categories),
+            term=rng.choice(SEARCH_TERMS)
+        )
+    return build
+
+def git_revision():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=BACKEND_DIR,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the RE4DY supply chain API")
+    parser.add_argument('--load', action='store_true', help="Load a synthetic catalogue before benchmarking")
+    parser.add_argument('--reset', action='store_true', help="With --load, truncate the catalogue first")
+    parser.add_argument('--components', type=int, default=10000)
+    parser.add_argument('--avg-degree', type=float, default=1.0,
+                        help="Mean lateral relationships per component, on top of the part_of chains")
+    parser.add_argument('--depth', type=int, default=6, help="Assembly tiers in the synthetic catalogue")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=200, help="Measured requests per endpoint")
+    parser.add_argument('--warmup', type=int, default=10, help="Unmeasured requests per endpoint")
+    parser.add_argument('--endpoints', help=f"Comma-separated subset of: {', '.join(ENDPOINTS)}")
+    parser.add_argument('--output', help="Write JSON results here (default: stdout)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    from src.main import app
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+
+    load_stats = None
+    if args.load:
+        load_stats = load_catalogue(engine, args.components, args.avg_degree, args.seed, args.reset, args.depth)
+        logger.info(f"Loaded synthetic catalogue in {load_stats['seconds']}s")
+
+    with engine.connect() as conn:
+        server_version = conn.execute(text("SHOW server_version")).scalar()
+        catalogue = dict(conn.execute(text("""
+            SELECT (SELECT COUNT(*) FROM components WHERE is_active = true) AS components,
+                   (SELECT COUNT(*) FROM supply_chain_relationships) AS relationships,
+                   (SELECT COUNT(*) FROM suppliers) AS suppliers
+        """)).fetchone()._mapping)
+
+    component_ids, categories = sample_parameters(engine, args.seed)
+    counter = QueryCounter(engine)
+    selected = args.endpoints.split(',') if args.endpoints else list(ENDPOINTS)
+
+    results = {}
+    for name in selected:
+        template = ENDPOINTS[name]
+        logger.info(f"Benchmarking {name} ({args.requests} requests, concurrency {args.concurrency})...")
+        results[name] = {'path': template, **run_endpoint(
+            app, counter, path_factory(template, component_ids, categories),
+            requests=args.requests, concurrency=args.concurrency, warmup=args.warmup, seed=args.seed
+        )}
+        latency = results[name]['latency_ms']
+        logger.info(f"  p50 {latency['p50']} ms, p95 {latency['p95']} ms, p99 {latency['p99']} ms, "
+                    f"{results[name]['throughput_rps']} req/s, "
+                    f"{results[name]['db_queries_per_request']['mean']} queries/request, "
+                    f"{results[name]['errors']} errors")
+
+    report = {
+        'meta': {
+            'git_revision': git_revision(),
+            'started_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'postgres': server_version,
+            'catalogue': catalogue,
+            'load': load_stats,
+            'concurrency': args.concurrency,
+            'requests_per_endpoint': args.requests,
+            'warmup': args.warmup,
+            'seed': args.seed,
+            'depth': args.depth,
+        },
+        'endpoints': results,
+    }
+
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output)
+        logger.info(f"Results written to {args.output}")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,506 @@
+#!/usr/bin/env python3
+"""
+Bulk loader for RE4DY Supply Chain catalogue data
+Streams rows into temporary staging tables with COPY, resolves supplier
+and category IDs with set-based joins and merges everything into the
+live tables in a single transaction, either appending new rows or
+delta-syncing against row fingerprints
+"""
+
+import csv
+import hashlib
+import io
+import os
+import logging
+from itertools import islice
+from sqlalchemy import text
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Column order of the staging tables and of CSV/Parquet input files
+COMPONENT_COLUMNS = [
+    'part_name', 'part_number', 'subcategory', 'description', 'specifications',
+    'price_min', 'price_max', 'currency', 'supplier_name', 'supplier_country',
+    'supplier_website', 'category_name', 'category_description'
+]
+RELATIONSHIP_COLUMNS = ['source_part_number', 'target_part_number', 'relationship_type', 'strength']
+SUPPLY_COLUMNS = ['supplier_name', 'part_number', 'relationship_type', 'strength', 'volume_annual', 'value_annual']
+VEHICLE_MODEL_COLUMNS = [
+    'manufacturer_name', 'manufacturer_country', 'model_name', 'model_year_start',
+    'model_year_end', 'vehicle_type', 'generation'
+]
+COMPATIBILITY_COLUMNS = ['part_number', 'manufacturer_name', 'model_name']
+
+# Rows buffered per COPY batch when loading from Python iterables
+COPY_BATCH_ROWS = 10000
+
+def _raw_cursor(conn):
+    """psycopg2 cursor sharing the SQLAlchemy connection's transaction"""
+    return conn.connection.cursor()
+
+def _create_staging_table(conn, table, columns):
+    column_defs = ', '.join(f"{column} TEXT" for column in columns)
+    conn.execute(text(f"CREATE TEMP TABLE {table} ({column_defs}) ON COMMIT DROP"))
+
+def copy_rows(conn, table, columns, rows):
+    """COPY an iterable of row tuples into table in bounded batches; returns the row count"""
+    cursor = _raw_cursor(conn)
+    copy_sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    total = 0
+    rows = iter(rows)
+
+    while True:
+        batch = list(islice(rows, COPY_BATCH_ROWS))
+        if not batch:
+            break
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in batch:
+            writer.writerow(['' if value is None else value for value in row])
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)
+        total += len(batch)
+
+    return total
+
+def copy_csv_file(conn, table, allowed_columns, path):
+    """COPY a CSV file with a header row straight into table; Python never parses the rows"""
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        header = next(csv.reader([f.readline()]))
+        columns = [column.strip() for column in header]
+        unknown = set(columns) - set(allowed_columns)
+        if unknown:
+            raise ValueError(f"Unknown columns in {path}: {', '.join(sorted(unknown))}")
+
+        cursor = _raw_cursor(conn)
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", f)
+        return cursor.rowcount
+
+def iter_parquet_rows(path, columns):
+    """Yield row tuples from a Parquet file one record batch at a time"""
+    import pyarrow.parquet as pq
+
+    parquet_file = pq.ParquetFile(path)
+    present = [column for column in columns if column in parquet_file.schema_arrow.names]
+    for batch in parquet_file.iter_batches(columns=present):
+        data = batch.to_pydict()
+        for values in zip(*(data[column] for column in present)):
+            row = dict(zip(present, values))
+            yield tuple(row.get(column) for column in columns)
+
+def _stage_source(conn, table, columns, source):
+    """Stage a CSV path, Parquet path or iterable of row tuples"""
+    if isinstance(source, (str, os.PathLike)):
+        path = os.fspath(source)
+        if path.endswith('.parquet'):
+            return copy_rows(conn, table, columns, iter_parquet_rows(path, columns))
+        return copy_csv_file(conn, table, columns, path)
+    return copy_rows(conn, table, columns, source)
+
+def merge_staged_components(conn):
+    """Merge stage_components into categories, suppliers and components; returns counts"""
+    rejected = conn.execute(text("""
+        SELECT COUNT(*) FROM stage_components
+        WHERE COALESCE(part_name, '') = '' OR COALESCE(supplier_name, '') = ''
+           OR COALESCE(category_name, '') = ''
+    """)).scalar()
+
+    categories = conn.execute(text("""
+        INSERT INTO categories (name, description)
+        SELECT DISTINCT ON (category_name) category_name, category_description
+        FROM stage_components
+        WHERE COALESCE(category_name, '') <> ''
+        ORDER BY category_name, category_description NULLS LAST
+        ON CONFLICT (name) DO NOTHING
+    """)).rowcount
+
+    suppliers = conn.execute(text("""
+        INSERT INTO suppliers (name, country, website)
+        SELECT DISTINCT ON (st.supplier_name) st.supplier_name, st.supplier_country, st.supplier_website
+        FROM stage_components st
+        WHERE COALESCE(st.supplier_name, '') <> ''
+          AND NOT EXISTS (SELECT 1 FROM suppliers s WHERE s.name = st.supplier_name)
+        ORDER BY st.supplier_name, st.supplier_country NULLS LAST
+    """)).rowcount
+
+    components = conn.execute(text("""
+        INSERT INTO components (part_name, part_number, subcategory, description, specifications,
+                                price_min, price_max, currency, supplier_id, category_id)
+        SELECT st.part_name, st.part_number, st.subcategory, st.description, st.specifications,
+               CAST(NULLIF(st.price_min, '') AS DECIMAL(10,2)),
+               CAST(NULLIF(st.price_max, '') AS DECIMAL(10,2)),
+               COALESCE(NULLIF(st.currency, ''), 'EUR'),
+               s.id, cat.id
+        FROM (
+            SELECT DISTINCT ON (part_number, supplier_name) *
+            FROM stage_components
+            WHERE COALESCE(part_name, '') <> ''
+            ORDER BY part_number, supplier_name
+        ) st
+        JOIN (SELECT DISTINCT ON (name) id, name FROM suppliers ORDER BY name, id) s
+          ON s.name = st.supplier_name
+        JOIN categories cat ON cat.name = st.category_name
+        WHERE NOT EXISTS (
+            SELECT 1 FROM components c
+            WHERE c.part_number = st.part_number AND c.supplier_id = s.id
+        )
+    """)).rowcount
+
+    return {
+        'categories_created': categories,
+        'suppliers_created': suppliers,
+        'components_inserted': components,
+        'rejected': rejected
+    }
+
+def merge_staged_relationships(conn):
+    """Resolve part numbers to component IDs and insert new component-to-component relationships"""
+    inserted = conn.execute(text("""
+        INSERT INTO supply_chain_relationships (source_type, source_id, target_type, target_id,
+                                                relationship_type, relationship_strength)
+        SELECT DISTINCT ON (src.id, tgt.id, st.relationship_type)
+               'component', src.id, 'component', tgt.id, st.relationship_type,
+               COALESCE(CAST(NULLIF(st.strength, '') AS DECIMAL(3,2)), 1.0)
+        FROM stage_relationships st
+        JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components ORDER BY part_number, id) src
+          ON src.part_number = st.source_part_number
+        JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components ORDER BY part_number, id) tgt
+          ON tgt.part_number = st.target_part_number
+        ORDER BY src.id, tgt.id, st.relationship_type
+        ON CONFLICT (source_type, source_id, target_type, target_id, relationship_type) DO NOTHING
+    """)).rowcount
+
+    unresolved = conn.execute(text("""
+        SELECT COUNT(*) FROM stage_relationships st
+        WHERE NOT EXISTS (SELECT 1 FROM components c WHERE c.part_number = st.source_part_number)
+           OR NOT EXISTS (SELECT 1 FROM components c WHERE c.part_number = st.target_part_number)
+    """)).scalar()
+
+    return {'relationships_inserted': inserted, 'rejected': unresolved}
+
+def _bulk_load(engine, table, columns, merge, source, label):
+    with engine.begin() as conn:
+        _create_staging_table(conn, table, columns)
+        staged = _stage_source(conn, table, columns, source)
+        stats = merge(conn)
+
+    stats['staged'] = staged
+    logger.info(f"Bulk loaded {label}: {stats}")
+    return stats
+
+def bulk_load_components(engine, source):
+    """
+    Load components (with their suppliers and categories) from a CSV path,
+    Parquet path or iterable of tuples in COMPONENT_COLUMNS order
+    """
+    return _bulk_load(engine, 'stage_components', COMPONENT_COLUMNS, merge_staged_components, source, 'components')
+
+def bulk_load_relationships(engine, source):
+    """
+    Load component relationships from a CSV path, Parquet path or iterable
+    of tuples in RELATIONSHIP_COLUMNS order
+    """
+    return _bulk_load(engine, 'stage_relationships', RELATIONSHIP_COLUMNS, merge_staged_relationships,
+                      source, 'relationships')
+
+def merge_staged_supply(conn):
+    """Insert supplier-to-component edges into supply_chain_relationships; returns counts"""
+    inserted = conn.execute(text("""
+        INSERT INTO supply_chain_relationships (source_type, source_id, target_type, target_id,
+                                                relationship_type, relationship_strength,
+                                                volume_annual, value_annual)
+        SELECT DISTINCT ON (s.id, c.id, st.relationship_type)
+               'supplier', s.id, 'component', c.id, st.relationship_type,
+               COALESCE(CAST(NULLIF(st.strength, '') AS DECIMAL(3,2)), 1.0),
+               CAST(NULLIF(st.volume_annual, '') AS INTEGER),
+               CAST(NULLIF(st.value_annual, '') AS DECIMAL(15,2))
+        FROM stage_supply st
+        JOIN suppliers s ON s.name = st.supplier_name
+        JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components ORDER BY part_number, id) c
+          ON c.part_number = st.part_number
+        ORDER BY s.id, c.id, st.relationship_type
+        ON CONFLICT (source_type, source_id, target_type, target_id, relationship_type) DO NOTHING
+    """)).rowcount
+
+    staged = conn.execute(text("SELECT COUNT(*) FROM stage_supply")).scalar()
+    return {'supply_edges_inserted': inserted, 'skipped': staged - inserted}
+
+def merge_staged_vehicle_models(conn):
+    """Insert manufacturers and vehicle models that do not exist yet; returns counts"""
+    manufacturers = conn.execute(text("""
+        INSERT INTO vehicle_manufacturers (name, country)
+        SELECT DISTINCT ON (manufacturer_name) manufacturer_name, NULLIF(manufacturer_country, '')
+        FROM stage_vehicle_models
+        WHERE COALESCE(manufacturer_name, '') <> ''
+        ORDER BY manufacturer_name, manufacturer_country NULLS LAST
+        ON CONFLICT (name) DO NOTHING
+    """)).rowcount
+
+    models = conn.execute(text("""
+        INSERT INTO vehicle_models (manufacturer_id, model_name, model_year_start, model_year_end,
+                                    vehicle_type, generation)
+        SELECT DISTINCT ON (m.id, st.model_name)
+               m.id, st.model_name,
+               CAST(NULLIF(st.model_year_start, '') AS INTEGER),
+               CAST(NULLIF(st.model_year_end, '') AS INTEGER),
+               NULLIF(st.vehicle_type, ''), NULLIF(st.generation, '')
+        FROM stage_vehicle_models st
+        JOIN vehicle_manufacturers m ON m.name = st.manufacturer_name
+        WHERE COALESCE(st.model_name, '') <> ''
+          AND NOT EXISTS (
+              SELECT 1 FROM vehicle_models vm
+              WHERE vm.manufacturer_id = m.id AND vm.model_name = st.model_name
+          )
+        ORDER BY m.id, st.model_name
+    """)).rowcount
+
+    return {'manufacturers_created': manufacturers, 'vehicle_models_inserted': models}
+
+def merge_staged_compatibility(conn):
+    """Resolve part numbers and model names into component_compatibility rows; returns counts"""
+    inserted = conn.execute(text("""
+        INSERT INTO component_compatibility (component_id, vehicle_model_id)
+        SELECT DISTINCT c.id, vm.id
+        FROM stage_compatibility st
+        JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components ORDER BY part_number, id) c
+          ON c.part_number = st.part_number
+        JOIN vehicle_manufacturers m ON m.name = st.manufacturer_name
+        JOIN (SELECT DISTINCT ON (manufacturer_id, model_name) id, manufacturer_id, model_name
+              FROM vehicle_models ORDER BY manufacturer_id, model_name, id) vm
+          ON vm.manufacturer_id = m.id AND vm.model_name = st.model_name
+        ON CONFLICT (component_id, vehicle_model_id) DO NOTHING
+    """)).rowcount
+
+    staged = conn.execute(text("SELECT COUNT(*) FROM stage_compatibility")).scalar()
+    return {'compatibility_inserted': inserted, 'skipped': staged - inserted}
+
+def bulk_load_supply_edges(engine, source):
+    """Load supplier-to-component edges from a path or iterable of tuples in SUPPLY_COLUMNS order"""
+    return _bulk_load(engine, 'stage_supply', SUPPLY_COLUMNS, merge_staged_supply, source, 'supply edges')
+
+def bulk_load_vehicle_models(engine, source):
+    """Load manufacturers and vehicle models from a path or iterable of tuples in VEHICLE_MODEL_COLUMNS order"""
+    return _bulk_load(engine, 'stage_vehicle_models', VEHICLE_MODEL_COLUMNS, merge_staged_vehicle_models,
+                      source, 'vehicle models')
+
+def bulk_load_compatibility(engine, source):
+    """Load component/vehicle compatibility from a path or iterable of tuples in COMPATIBILITY_COLUMNS order"""
+    return _bulk_load(engine, 'stage_compatibility', COMPATIBILITY_COLUMNS, merge_staged_compatibility,
+                      source, 'compatibility')
+
+def fingerprint_file(path):
+    """SHA-256 of a file's contents, read in 1 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def fingerprint_rows(rows):
+    """SHA-256 of an in-memory row list (used for the built-in seed data)"""
+    return hashlib.sha256(repr(list(rows)).encode('utf-8')).hexdigest()
+
+def get_sync_fingerprint(engine, source_name):
+    """Fingerprint recorded by the last successful sync of source_name, if any"""
+    with engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT fingerprint FROM catalogue_sync_state WHERE source = :source
+        """), {'source': source_name}).scalar()
+
+def record_sync(conn, source_name, fingerprint, stats):
+    """Store the sync watermark for source_name inside the merge transaction"""
+    conn.execute(text("""
+        INSERT INTO catalogue_sync_state (source, fingerprint, rows_staged, rows_inserted,
+                                          rows_updated, rows_deactivated, synced_at)
+        VALUES (:source, :fingerprint, :staged, :inserted, :updated, :deactivated, CURRENT_TIMESTAMP)
+        ON CONFLICT (source) DO UPDATE SET
+            fingerprint = EXCLUDED.fingerprint,
+            rows_staged = EXCLUDED.rows_staged,
+            rows_inserted = EXCLUDED.rows_inserted,
+            rows_updated = EXCLUDED.rows_updated,
+            rows_deactivated = EXCLUDED.rows_deactivated,
+            synced_at = EXCLUDED.synced_at
+    """), {
+        'source': source_name,
+        'fingerprint': fingerprint,
+        'staged': stats.get('staged', 0),
+        'inserted': stats.get('inserted', 0),
+        'updated': stats.get('updated', 0),
+        'deactivated': stats.get('deactivated', 0)
+    })
+
+def merge_staged_components_delta(conn, source_name):
+    """
+    Upsert stage_components into the live tables, touching only rows whose
+    fingerprint changed, and soft-delete parts that an earlier sync of the
+    same source loaded but that are missing from this input. Parts owned
+    by other sources or loaded in append mode are left alone.
+    """
+    conn.execute(text("ANALYZE stage_components"))
+
+    rejected = conn.execute(text("""
+        SELECT COUNT(*) FROM stage_components
+        WHERE COALESCE(part_name, '') = '' OR COALESCE(part_number, '') = ''
+           OR COALESCE(supplier_name, '') = '' OR COALESCE(category_name, '') = ''
+    """)).scalar()
+
+    conn.execute(text("""
+        INSERT INTO categories (name, description)
+        SELECT DISTINCT ON (category_name) category_name, category_description
+        FROM stage_components
+        WHERE COALESCE(category_name, '') <> ''
+        ORDER BY category_name, category_description NULLS LAST
+        ON CONFLICT (name) DO NOTHING
+    """))
+
+    conn.execute(text("""
+        INSERT INTO suppliers (name, country, website)
+        SELECT DISTINCT ON (supplier_name) supplier_name, NULLIF(supplier_country, ''), NULLIF(supplier_website, '')
+        FROM stage_components
+        WHERE COALESCE(supplier_name, '') <> ''
+        ORDER BY supplier_name, supplier_country NULLS LAST
+        ON CONFLICT (name) DO UPDATE SET
+            country = COALESCE(EXCLUDED.country, suppliers.country),
+            website = COALESCE(EXCLUDED.website, suppliers.website)
+        WHERE (suppliers.country, suppliers.website) IS DISTINCT FROM
+              (COALESCE(EXCLUDED.country, suppliers.country), COALESCE(EXCLUDED.website, suppliers.website))
+    """))
+
+    upserted = conn.execute(text("""
+        WITH staged AS (
+            SELECT DISTINCT ON (supplier_name, part_number)
+                part_name, part_number, NULLIF(subcategory, '') AS subcategory,
+                NULLIF(description, '') AS description, NULLIF(specifications, '') AS specifications,
+                CAST(NULLIF(price_min, '') AS DECIMAL(10,2)) AS price_min,
+                CAST(NULLIF(price_max, '') AS DECIMAL(10,2)) AS price_max,
+                COALESCE(NULLIF(currency, ''), 'EUR') AS currency,
+                supplier_name, category_name
+            FROM stage_components
+            WHERE COALESCE(part_name, '') <> '' AND COALESCE(part_number, '') <> ''
+            ORDER BY supplier_name, part_number
+        ),
+        upserted AS (
+            INSERT INTO components (part_name, part_number, subcategory, description, specifications,
+                                    price_min, price_max, currency, supplier_id, category_id,
+                                    is_active, row_hash, sync_source, updated_at)
+            SELECT st.part_name, st.part_number, st.subcategory, st.description, st.specifications,
+                   st.price_min, st.price_max, st.currency, s.id, cat.id, true,
+                   md5(concat_ws('|', st.part_name, st.subcategory, st.description, st.specifications,
+                                 st.price_min::text, st.price_max::text, st.currency, cat.id::text)),
+                   :source, CURRENT_TIMESTAMP
+            FROM staged st
+            JOIN suppliers s ON s.name = st.supplier_name
+            JOIN categories cat ON cat.name = st.category_name
+            ON CONFLICT (supplier_id, part_number) DO UPDATE SET
+                part_name = EXCLUDED.part_name,
+                subcategory = EXCLUDED.subcategory,
+                description = EXCLUDED.description,
+                specifications = EXCLUDED.specifications,
+                price_min = EXCLUDED.price_min,
+                price_max = EXCLUDED.price_max,
+                currency = EXCLUDED.currency,
+                category_id = EXCLUDED.category_id,
+                is_active = true,
+                row_hash = EXCLUDED.row_hash,
+                sync_source = EXCLUDED.sync_source,
+                updated_at = EXCLUDED.updated_at
+            WHERE components.row_hash IS DISTINCT FROM EXCLUDED.row_hash
+               OR components.sync_source IS DISTINCT FROM EXCLUDED.sync_source
+               OR NOT components.is_active
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+               COUNT(*) FILTER (WHERE NOT inserted) AS updated
+        FROM upserted
+    """), {'source': source_name}).fetchone()
+
+    deactivated = conn.execute(text("""
+        UPDATE components c
+        SET is_active = false, updated_at = CURRENT_TIMESTAMP
+        FROM suppliers s
+        WHERE c.supplier_id = s.id
+          AND c.is_active
+          AND c.sync_source = :source
+          AND NOT EXISTS (
+              SELECT 1 FROM stage_components st
+              WHERE st.supplier_name = s.name AND st.part_number = c.part_number
+          )
+    """), {'source': source_name}).rowcount
+
+    return {
+        'inserted': upserted.inserted,
+        'updated': upserted.updated,
+        'deactivated': deactivated,
+        'rejected': rejected
+    }
+
+def merge_staged_relationships_delta(conn, source_name):
+    """Upsert relationships keyed by (source, target, type); unchanged rows are not rewritten"""
+    conn.execute(text("ANALYZE stage_relationships"))
+
+    upserted = conn.execute(text("""
+        WITH resolved AS (
+            SELECT DISTINCT ON (src.id, tgt.id, st.relationship_type)
+                src.id AS source_id, tgt.id AS target_id, st.relationship_type,
+                COALESCE(CAST(NULLIF(st.strength, '') AS DECIMAL(3,2)), 1.0) AS strength
+            FROM stage_relationships st
+            JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components
+                  WHERE is_active ORDER BY part_number, id) src
+              ON src.part_number = st.source_part_number
+            JOIN (SELECT DISTINCT ON (part_number) id, part_number FROM components
+                  WHERE is_active ORDER BY part_number, id) tgt
+              ON tgt.part_number = st.target_part_number
+            ORDER BY src.id, tgt.id, st.relationship_type
+        ),
+        upserted AS (
+            INSERT INTO supply_chain_relationships (source_type, source_id, target_type, target_id,
+                                                    relationship_type, relationship_strength)
+            SELECT 'component', source_id, 'component', target_id, relationship_type, strength FROM resolved
+            ON CONFLICT (source_type, source_id, target_type, target_id, relationship_type) DO UPDATE SET
+                relationship_strength = EXCLUDED.relationship_strength
+            WHERE supply_chain_relationships.relationship_strength IS DISTINCT FROM EXCLUDED.relationship_strength
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT COUNT(*) FILTER (WHERE inserted) AS inserted,
+               COUNT(*) FILTER (WHERE NOT inserted) AS updated
+        FROM upserted
+    """)).fetchone()
+
+    unresolved = conn.execute(text("""
+        SELECT COUNT(*) FROM stage_relationships st
+        WHERE NOT EXISTS (SELECT 1 FROM components c WHERE c.part_number = st.source_part_number)
+           OR NOT EXISTS (SELECT 1 FROM components c WHERE c.part_number = st.target_part_number)
+    """)).scalar()
+
+    return {'inserted': upserted.inserted, 'updated': upserted.updated, 'rejected': unresolved}
+
+def _sync(engine, table, columns, merge, source, source_name, fingerprint):
+    if fingerprint and get_sync_fingerprint(engine, source_name) == fingerprint:
+        logger.info(f"{source_name} unchanged since last sync, nothing to do")
+        return {'skipped': True, 'inserted': 0, 'updated': 0, 'deactivated': 0}
+
+    with engine.begin() as conn:
+        _create_staging_table(conn, table, columns)
+        staged = _stage_source(conn, table, columns, source)
+        stats = merge(conn, source_name)
+        stats['staged'] = staged
+        record_sync(conn, source_name, fingerprint, stats)
+
+    stats['skipped'] = False
+    logger.info(f"Delta synced {source_name}: {stats}")
+    return stats
+
+def sync_components(engine, source, source_name, fingerprint=None):
+    """
+    Delta-sync components from a CSV path, Parquet path or iterable of tuples.
+    When fingerprint matches the stored watermark for source_name the call is a no-op.
+    """
+    return _sync(engine, 'stage_components', COMPONENT_COLUMNS, merge_staged_components_delta,
+                 source, source_name, fingerprint)
+
+def sync_relationships(engine, source, source_name, fingerprint=None):
+    """Delta-sync relationships; a no-op when fingerprint matches the stored watermark"""
+    return _sync(engine, 'stage_relationships', RELATIONSHIP_COLUMNS, merge_staged_relationships_delta,
+                 source, source_name, fingerprint)
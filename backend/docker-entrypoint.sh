@@ -0,0 +1,17 @@
+#!/bin/sh
+# Container start-up for the API image.
+#   RUN_MIGRATIONS=1  apply pending schema migrations (python migrate.py) before serving
+#   RUN_SEED=1        migrate and load the demo data (python import_data.py) before serving
+# Both are off by default: run them once per deploy as a release step, or set
+# them on a single instance, rather than on every replica.
+set -e
+
+if [ "$RUN_SEED" = "1" ]; then
+    echo "Migrating and seeding database..."
+    python import_data.py
+elif [ "$RUN_MIGRATIONS" = "1" ]; then
+    echo "Applying database migrations..."
+    python migrate.py
+fi
+
+exec "$@"
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Streaming catalogue ingestion for RE4DY Supply Chain data
+Reads CSV/Parquet files in fixed-size chunks, validates and normalises
+each chunk, and streams accepted rows into the bulk-load path so memory
+use stays flat regardless of file size
+"""
+
+import csv
+import os
+import time
+import logging
+import pandas as pd
+from bulk_load import (
+    COMPONENT_COLUMNS, RELATIONSHIP_COLUMNS,
+    bulk_load_components, bulk_load_relationships,
+    sync_components, sync_relationships,
+    fingerprint_file, get_sync_fingerprint
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 50000
+
+# Common header spellings in supplier exports, mapped to staging column names
+COLUMN_ALIASES = {
+    'name': 'part_name',
+    'part': 'part_name',
+    'part_no': 'part_number',
+    'sku': 'part_number',
+    'supplier': 'supplier_name',
+    'category': 'category_name',
+    'country': 'supplier_country',
+    'website': 'supplier_website',
+    'source': 'source_part_number',
+    'target': 'target_part_number',
+    'type': 'relationship_type',
+}
+
+# Column length limits from the live schema
+MAX_LENGTHS = {
+    'part_name': 200,
+    'part_number': 100,
+    'subcategory': 100,
+    'supplier_name': 200,
+    'supplier_country': 100,
+    'supplier_website': 255,
+    'category_name': 100,
+    'relationship_type': 50,
+}
+
+def read_chunks(path, chunksize=DEFAULT_CHUNK_SIZE):
+    """Yield DataFrames of at most chunksize rows, all values as strings"""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas().astype('string').fillna('')
+    else:
+        yield from pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+
+def _normalise_columns(df):
+    df = df.rename(columns=lambda c: str(c).strip().lower().replace(' ', '_'))
+    return df.rename(columns={k: v for k, v in COLUMN_ALIASES.items() if v not in df.columns})
+
+def _strip(df, columns):
+    """Ensure every column exists and hold trimmed strings"""
+    for column in columns:
+        if column not in df.columns:
+            df[column] = ''
+        df[column] = df[column].fillna('').astype(str).str.strip()
+    return df
+
+def _reject(reasons, mask, reason):
+    """Record reason for rows in mask that have not already been rejected"""
+    reasons[mask & (reasons == '')] = reason
+
+def validate_components(df):
+    """Split a chunk into (accepted rows in COMPONENT_COLUMNS order, rejected rows with a reason)"""
+    df = _strip(_normalise_columns(df), COMPONENT_COLUMNS)
+    original = df.copy()
+    reasons = pd.Series('', index=df.index, dtype=object)
+
+    # part_number is half of the natural key both merge modes deduplicate on
+    for column in ('part_name', 'part_number', 'supplier_name', 'category_name'):
+        _reject(reasons, df[column] == '', f"missing {column}")
+
+    for column in ('price_min', 'price_max'):
+        cleaned = df[column].str.replace(r'[^\d.\-]', '', regex=True)
+        numeric = pd.to_numeric(cleaned, errors='coerce')
+        _reject(reasons, (df[column] != '') & numeric.isna(), f"invalid {column}")
+        _reject(reasons, numeric < 0, f"negative {column}")
+        df[column] = numeric.round(2)
+
+    _reject(reasons, df['price_min'].notna() & df['price_max'].notna() & (df['price_min'] > df['price_max']),
+            "price_min greater than price_max")
+
+    for column, limit in MAX_LENGTHS.items():
+        if column in df.columns:
+            _reject(reasons, df[column].str.len() > limit, f"{column} longer than {limit} characters")
+
+    df['currency'] = df['currency'].str.upper().where(df['currency'] != '', 'EUR')
+    _reject(reasons, df['currency'].str.len() != 3, "currency must be a 3-letter code")
+
+    accepted = df[reasons == '']
+    rejected = original[reasons != ''].assign(reject_reason=reasons[reasons != ''])
+    return accepted[COMPONENT_COLUMNS], rejected
+
+def validate_relationships(df):
+    """Split a chunk into (accepted rows in RELATIONSHIP_COLUMNS order, rejected rows with a reason)"""
+    df = _strip(_normalise_columns(df), RELATIONSHIP_COLUMNS)
+    original = df.copy()
+    reasons = pd.Series('', index=df.index, dtype=object)
+
+    for column in ('source_part_number', 'target_part_number', 'relationship_type'):
+        _reject(reasons, df[column] == '', f"missing {column}")
+    _reject(reasons, df['source_part_number'] == df['target_part_number'], "self-referencing relationship")
+    _reject(reasons, df['relationship_type'].str.len() > MAX_LENGTHS['relationship_type'],
+            "relationship_type longer than 50 characters")
+
+    df['relationship_type'] = df['relationship_type'].str.lower().str.replace(' ', '_')
+    strength = pd.to_numeric(df['strength'], errors='coerce')
+    _reject(reasons, (df['strength'] != '') & strength.isna(), "invalid strength")
+    _reject(reasons, (strength < 0) | (strength > 1), "strength outside 0-1")
+    df['strength'] = strength.round(2)
+
+    accepted = df[reasons == '']
+    rejected = original[reasons != ''].assign(reject_reason=reasons[reasons != ''])
+    return accepted[RELATIONSHIP_COLUMNS], rejected
+
+class RejectReport:
+    """Appends rejected rows to a CSV file as chunks are processed"""
+
+    def __init__(self, path):
+        self.path = path
+        self.count = 0
+        self._file = None
+        self._writer = None
+        self._columns = None
+
+    def write(self, rejected, first_row_number):
+        if rejected.empty or not self.path:
+            self.count += len(rejected)
+            return
+        if self._writer is None:
+            self._columns = ['row_number', 'reject_reason'] + \
+                [c for c in rejected.columns if c != 'reject_reason']
+            self._file = open(self.path, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(self._columns)
+
+        for index, row in rejected.iterrows():
+            # +2: one for the header line, one because file rows are 1-based
+            values = {'row_number': first_row_number + index + 2, **row.to_dict()}
+            self._writer.writerow(['' if pd.isna(values.get(c)) else values.get(c, '') for c in self._columns])
+        self._file.flush()
+        self.count += len(rejected)
+
+    def close(self):
+        if self._file:
+            self._file.close()
+
+def _validated_rows(path, validate, chunksize, report, progress):
+    """Generator feeding bulk_load: yields accepted row tuples chunk by chunk"""
+    started = time.monotonic()
+    read = 0
+
+    for chunk in read_chunks(path, chunksize):
+        first_row = read
+        chunk = chunk.reset_index(drop=True)
+        accepted, rejected = validate(chunk)
+        report.write(rejected, first_row)
+        read += len(chunk)
+        progress['read'] = read
+        progress['accepted'] += len(accepted)
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        logger.info(f"{os.path.basename(path)}: {read} rows read, {progress['accepted']} accepted, "
+                    f"{report.count} rejected ({read / elapsed:,.0f} rows/s)")
+
+        for row in accepted.itertuples(index=False, name=None):
+            yield tuple(None if pd.isna(value) else value for value in row)
+
+def _ingest(engine, path, validate, load, sync, chunksize, rejects_path, mode):
+    if mode == 'delta':
+        # Keyed by absolute path so re-running the same file is a no-op until its contents change
+        source_name = f"file:{os.path.abspath(path)}"
+        fingerprint = fingerprint_file(path)
+        if get_sync_fingerprint(engine, source_name) == fingerprint:
+            logger.info(f"{path} unchanged since last sync, nothing to do")
+            return {'skipped': True}
+        load = lambda engine, rows: sync(engine, rows, source_name, fingerprint)
+
+    if rejects_path is None:
+        rejects_path = f"{os.path.splitext(path)[0]}.rejected.csv"
+    report = RejectReport(rejects_path)
+    progress = {'read': 0, 'accepted': 0}
+    started = time.monotonic()
+
+    try:
+        stats = load(engine, _validated_rows(path, validate, chunksize, report, progress))
+    finally:
+        report.close()
+
+    stats.update({
+        'rows_read': progress['read'],
+        'rows_rejected_validation': report.count,
+        'rejects_file': rejects_path if report.count else None,
+        'seconds': round(time.monotonic() - started, 2)
+    })
+    logger.info(f"Ingested {path}: {stats}")
+    return stats
+
+def ingest_components(engine, path, chunksize=DEFAULT_CHUNK_SIZE, rejects_path=None, mode='append'):
+    """Validate and bulk load (mode='append') or delta-sync (mode='delta') a component catalogue file"""
+    return _ingest(engine, path, validate_components, bulk_load_components, sync_components,
+                   chunksize, rejects_path, mode)
+
+def ingest_relationships(engine, path, chunksize=DEFAULT_CHUNK_SIZE, rejects_path=None, mode='append'):
+    """Validate and bulk load (mode='append') or delta-sync (mode='delta') a relationships file"""
+    return _ingest(engine, path, validate_relationships, bulk_load_relationships, sync_relationships,
+                   chunksize, rejects_path, mode)
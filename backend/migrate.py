@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""
+Schema migrations for the RE4DY Supply Chain Database
+Applies numbered migrations in order, records each one in schema_migrations
+and holds a Postgres advisory lock so only one instance migrates at a time.
+Run it once per deploy (release/pre-deploy step), not from the web process:
+
+    python backend/migrate.py            # apply pending migrations
+    python backend/migrate.py --status   # list applied and pending migrations
+    python backend/migrate.py --index-report
+"""
+
+import os
+import sys
+import argparse
+import logging
+from contextlib import contextmanager
+from sqlalchemy import create_engine, text
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Arbitrary application-wide key for pg_advisory_lock
+MIGRATION_LOCK_KEY = 0x1F5C0034
+
+# Tables whose writes bump catalogue_versions (see src/services/data_version.py)
+VERSIONED_TABLES = (
+    'categories', 'suppliers', 'components', 'supply_chain_relationships',
+    'vehicle_manufacturers', 'vehicle_models', 'component_compatibility'
+)
+
+def get_database_url():
+    """Get database URL from environment variable"""
+    database_url = os.environ.get('DATABASE_URL')
+    if not database_url:
+        raise ValueError("DATABASE_URL environment variable is required")
+    return database_url
+
+def create_tables(conn):
+    """Create the catalogue tables if they don't exist"""
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS categories (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            description TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS suppliers (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(200) NOT NULL,
+            country VARCHAR(100),
+            website VARCHAR(255),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS components (
+            id SERIAL PRIMARY KEY,
+            part_name VARCHAR(200) NOT NULL,
+            part_number VARCHAR(100),
+            subcategory VARCHAR(100),
+            description TEXT,
+            specifications TEXT,
+            price_min DECIMAL(10,2),
+            price_max DECIMAL(10,2),
+            currency VARCHAR(3) DEFAULT 'EUR',
+            supplier_id INTEGER REFERENCES suppliers(id),
+            category_id INTEGER REFERENCES categories(id),
+            is_active BOOLEAN DEFAULT true,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS relationships (
+            id SERIAL PRIMARY KEY,
+            source_component_id INTEGER REFERENCES components(id),
+            target_component_id INTEGER REFERENCES components(id),
+            relationship_type VARCHAR(50),
+            strength DECIMAL(3,2) DEFAULT 1.0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+def _foreign_keys_to(conn, table):
+    """(table, column) pairs holding a foreign key to table.id"""
+    return conn.execute(text("""
+        SELECT c.conrelid::regclass::text AS ref_table, a.attname AS ref_column
+        FROM pg_constraint c
+        JOIN pg_attribute a ON a.attrelid = c.conrelid AND a.attnum = ANY(c.conkey)
+        WHERE c.contype = 'f' AND c.confrelid = CAST(:table AS regclass)
+    """), {'table': table}).fetchall()
+
+def _deduplicate(conn, table, key_columns, node_type=None):
+    """
+    Collapse rows sharing key_columns onto the lowest id, re-pointing
+    foreign keys first. supply_chain_relationships refers to nodes by
+    (type, id) without foreign keys, so for tables that are graph nodes
+    (node_type given) its edges are re-pointed too; edges that become
+    copies of another edge, or loops from a node to itself, are dropped.
+    """
+    keys = ', '.join(key_columns)
+    duplicates = f"""
+        SELECT id, keep_id FROM (
+            SELECT id, MIN(id) OVER (PARTITION BY {keys}) AS keep_id FROM {table}
+            WHERE {' AND '.join(f'{column} IS NOT NULL' for column in key_columns)}
+        ) ranked WHERE id <> keep_id
+    """
+    typed_edges = node_type is not None and 'source_type' in _columns(conn, 'supply_chain_relationships')
+    for ref in _foreign_keys_to(conn, table):
+        # Typed edges are re-pointed by (type, id) below, not by the legacy foreign key alone
+        if typed_edges and ref.ref_table == 'supply_chain_relationships':
+            continue
+        conn.execute(text(f"""
+            UPDATE {ref.ref_table} t SET {ref.ref_column} = d.keep_id
+            FROM ({duplicates}) d WHERE t.{ref.ref_column} = d.id
+        """))
+    if typed_edges:
+        _repoint_edges(conn, duplicates, node_type)
+    removed = conn.execute(text(f"""
+        DELETE FROM {table} t USING ({duplicates}) d WHERE t.id = d.id
+    """)).rowcount
+    if removed:
+        logger.info(f"Removed {removed} duplicate rows from {table}")
+
+def _repoint_edges(conn, duplicates, node_type):
+    """Move supply_chain_relationships edges of node_type duplicates onto the kept rows"""
+    # Unique on the edge key, so drop the edges that would collide before moving the rest
+    dropped = conn.execute(text(f"""
+        WITH d AS ({duplicates}),
+        mapped AS (
+            SELECT r.id, r.source_type, r.target_type,
+                   COALESCE(ds.keep_id, r.source_id) AS source_id,
+                   COALESCE(dt.keep_id, r.target_id) AS target_id,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY r.source_type, COALESCE(ds.keep_id, r.source_id),
+                                    r.target_type, COALESCE(dt.keep_id, r.target_id), r.relationship_type
+                       ORDER BY (ds.id IS NOT NULL OR dt.id IS NOT NULL), r.id
+                   ) AS copy
+            FROM supply_chain_relationships r
+            LEFT JOIN d ds ON r.source_type = :node_type AND ds.id = r.source_id
+            LEFT JOIN d dt ON r.target_type = :node_type AND dt.id = r.target_id
+        )
+        DELETE FROM supply_chain_relationships r USING mapped m
+        WHERE r.id = m.id
+          AND (m.copy > 1 OR (m.source_type = m.target_type AND m.source_id = m.target_id
+                              AND (r.source_id <> m.source_id OR r.target_id <> m.target_id)))
+    """), {'node_type': node_type}).rowcount
+
+    moved = 0
+    for side in ('source', 'target'):
+        moved += conn.execute(text(f"""
+            UPDATE supply_chain_relationships r SET {side}_id = d.keep_id
+            FROM ({duplicates}) d
+            WHERE r.{side}_type = :node_type AND r.{side}_id = d.id
+        """), {'node_type': node_type}).rowcount
+    if dropped or moved:
+        logger.info(f"Re-pointed {moved} and dropped {dropped} supply_chain_relationships edges "
+                    f"of duplicate {node_type} rows")
+
+def prepare_delta_sync(conn):
+    """
+    Add the fingerprint columns, natural-key unique indexes and sync
+    watermark table that delta sync relies on. Duplicates left behind by
+    earlier append-only imports are merged before the indexes are built.
+    """
+    conn.execute(text("""
+        ALTER TABLE components
+            ADD COLUMN IF NOT EXISTS row_hash CHAR(32),
+            ADD COLUMN IF NOT EXISTS sync_source VARCHAR(255),
+            ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    """))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS catalogue_sync_state (
+            source VARCHAR(255) PRIMARY KEY,
+            fingerprint CHAR(64),
+            rows_staged INTEGER,
+            rows_inserted INTEGER,
+            rows_updated INTEGER,
+            rows_deactivated INTEGER,
+            synced_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+    if conn.execute(text("SELECT to_regclass('uq_components_supplier_part')")).scalar() is None:
+        _deduplicate(conn, 'suppliers', ['name'], node_type='supplier')
+        _deduplicate(conn, 'components', ['supplier_id', 'part_number'], node_type='component')
+        _deduplicate(conn, 'relationships', ['source_component_id', 'target_component_id', 'relationship_type'])
+
+    conn.execute(text("CREATE UNIQUE INDEX IF NOT EXISTS uq_suppliers_name ON suppliers (name)"))
+    conn.execute(text("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_components_supplier_part
+        ON components (supplier_id, part_number)
+    """))
+    conn.execute(text("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_relationships_edge
+        ON relationships (source_component_id, target_component_id, relationship_type)
+    """))
+
+def _columns(conn, table):
+    return {row.column_name for row in conn.execute(text("""
+        SELECT column_name FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = :table
+    """), {'table': table})}
+
+def _has_unique_index(conn, table, column):
+    return conn.execute(text("""
+        SELECT EXISTS (
+            SELECT 1 FROM pg_index i
+            JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE i.indrelid = CAST(:table AS regclass) AND i.indisunique
+              AND i.indnatts = 1 AND a.attname = :column
+        )
+    """), {'table': table, 'column': column}).scalar()
+
+def reconcile_schema(conn):
+    """
+    Bring databases created by init-db.sql or by earlier imports to the
+    schema the API queries: the columns the routes read, the vehicle
+    tables, and a single typed supply_chain_relationships table that
+    absorbs the legacy component-only relationships table.
+    """
+    conn.execute(text("ALTER TABLE categories ADD COLUMN IF NOT EXISTS description TEXT"))
+    conn.execute(text("ALTER TABLE suppliers ADD COLUMN IF NOT EXISTS website VARCHAR(255)"))
+    conn.execute(text("""
+        ALTER TABLE components
+            ADD COLUMN IF NOT EXISTS subcategory VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS specifications TEXT,
+            ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT true
+    """))
+    if not _has_unique_index(conn, 'categories', 'name'):
+        _deduplicate(conn, 'categories', ['name'], node_type='category')
+        conn.execute(text("CREATE UNIQUE INDEX uq_categories_name ON categories (name)"))
+
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS vehicle_manufacturers (
+            id SERIAL PRIMARY KEY,
+            name VARCHAR(100) NOT NULL UNIQUE,
+            country VARCHAR(100),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS vehicle_models (
+            id SERIAL PRIMARY KEY,
+            manufacturer_id INTEGER NOT NULL REFERENCES vehicle_manufacturers(id),
+            model_name VARCHAR(100) NOT NULL,
+            model_year_start INTEGER,
+            model_year_end INTEGER,
+            vehicle_type VARCHAR(50),
+            generation VARCHAR(50),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS component_compatibility (
+            id SERIAL PRIMARY KEY,
+            component_id INTEGER NOT NULL REFERENCES components(id),
+            vehicle_model_id INTEGER NOT NULL REFERENCES vehicle_models(id),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (component_id, vehicle_model_id)
+        )
+    """))
+
+    # source/target ids point at suppliers, categories or components depending on *_type
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS supply_chain_relationships (
+            id SERIAL PRIMARY KEY,
+            source_type VARCHAR(20) NOT NULL DEFAULT 'component',
+            source_id INTEGER NOT NULL,
+            target_type VARCHAR(20) NOT NULL DEFAULT 'component',
+            target_id INTEGER NOT NULL,
+            relationship_type VARCHAR(100),
+            relationship_strength DECIMAL(3,2) DEFAULT 1.0,
+            volume_annual INTEGER,
+            value_annual DECIMAL(15,2),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("""
+        ALTER TABLE supply_chain_relationships
+            ADD COLUMN IF NOT EXISTS source_type VARCHAR(20) NOT NULL DEFAULT 'component',
+            ADD COLUMN IF NOT EXISTS target_type VARCHAR(20) NOT NULL DEFAULT 'component',
+            ADD COLUMN IF NOT EXISTS relationship_strength DECIMAL(3,2) DEFAULT 1.0,
+            ADD COLUMN IF NOT EXISTS volume_annual INTEGER,
+            ADD COLUMN IF NOT EXISTS value_annual DECIMAL(15,2)
+    """))
+
+    # init-db.sql named the column strength and tied both ends to components
+    if 'strength' in _columns(conn, 'supply_chain_relationships'):
+        conn.execute(text("""
+            UPDATE supply_chain_relationships SET relationship_strength = strength WHERE strength IS NOT NULL
+        """))
+        conn.execute(text("ALTER TABLE supply_chain_relationships DROP COLUMN strength"))
+    for constraint in conn.execute(text("""
+        SELECT conname FROM pg_constraint
+        WHERE conrelid = CAST('supply_chain_relationships' AS regclass) AND contype = 'f'
+    """)).scalars().all():
+        conn.execute(text(f'ALTER TABLE supply_chain_relationships DROP CONSTRAINT "{constraint}"'))
+
+    if conn.execute(text("SELECT to_regclass('relationships')")).scalar() is not None:
+        moved = conn.execute(text("""
+            INSERT INTO supply_chain_relationships (source_type, source_id, target_type, target_id,
+                                                    relationship_type, relationship_strength, created_at)
+            SELECT 'component', r.source_component_id, 'component', r.target_component_id,
+                   r.relationship_type, r.strength, r.created_at
+            FROM relationships r
+            WHERE r.source_component_id IS NOT NULL AND r.target_component_id IS NOT NULL
+              AND NOT EXISTS (
+                  SELECT 1 FROM supply_chain_relationships scr
+                  WHERE scr.source_type = 'component' AND scr.source_id = r.source_component_id
+                    AND scr.target_type = 'component' AND scr.target_id = r.target_component_id
+                    AND scr.relationship_type IS NOT DISTINCT FROM r.relationship_type
+              )
+        """)).rowcount
+        conn.execute(text("DROP TABLE relationships"))
+        logger.info(f"Moved {moved} rows from relationships into supply_chain_relationships")
+
+    _deduplicate(conn, 'supply_chain_relationships',
+                 ['source_type', 'source_id', 'target_type', 'target_id', 'relationship_type'])
+    # Natural key for upserts; its leading columns also serve (source_type, source_id) lookups
+    conn.execute(text("""
+        CREATE UNIQUE INDEX IF NOT EXISTS uq_supply_chain_relationships_edge
+        ON supply_chain_relationships (source_type, source_id, target_type, target_id, relationship_type)
+    """))
+
+def add_query_indexes(conn):
+    """Composite and partial indexes matching the listing, graph and Sankey queries"""
+    # Single-column source_id/target_id indexes from init-db.sql cannot serve the typed joins
+    conn.execute(text("DROP INDEX IF EXISTS idx_relationships_source"))
+    conn.execute(text("DROP INDEX IF EXISTS idx_relationships_target"))
+
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_scr_target ON supply_chain_relationships (target_type, target_id)",
+        "CREATE INDEX IF NOT EXISTS idx_scr_strength ON supply_chain_relationships (relationship_strength DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_components_active_part_name ON components (part_name) WHERE is_active",
+        "CREATE INDEX IF NOT EXISTS idx_components_active_category ON components (category_id, part_name) WHERE is_active",
+        "CREATE INDEX IF NOT EXISTS idx_components_active_supplier ON components (supplier_id, part_name) WHERE is_active",
+        "CREATE INDEX IF NOT EXISTS idx_vehicle_models_manufacturer ON vehicle_models (manufacturer_id)",
+        "CREATE INDEX IF NOT EXISTS idx_component_compatibility_model ON component_compatibility (vehicle_model_id)",
+    ):
+        conn.execute(text(statement))
+
+    for table in ('components', 'supply_chain_relationships', 'vehicle_models', 'component_compatibility'):
+        conn.execute(text(f"ANALYZE {table}"))
+
+
+def track_data_versions(conn):
+    """
+    Per-table change counters bumped by statement-level triggers, so caches
+    can tell with one primary-key read whether the catalogue has changed.
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS catalogue_versions (
+            table_name VARCHAR(63) PRIMARY KEY,
+            version BIGINT NOT NULL DEFAULT 0,
+            changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    conn.execute(text("""
+        CREATE OR REPLACE FUNCTION bump_catalogue_version() RETURNS trigger AS $$
+        BEGIN
+            UPDATE catalogue_versions SET version = version + 1, changed_at = CURRENT_TIMESTAMP
+            WHERE table_name = TG_TABLE_NAME;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """))
+    for table in VERSIONED_TABLES:
+        conn.execute(text("""
+            INSERT INTO catalogue_versions (table_name) VALUES (:table) ON CONFLICT (table_name) DO NOTHING
+        """), {'table': table})
+        conn.execute(text(f"DROP TRIGGER IF EXISTS trg_{table}_version ON {table}"))
+        conn.execute(text(f"""
+            CREATE TRIGGER trg_{table}_version
+            AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table}
+            FOR EACH STATEMENT EXECUTE FUNCTION bump_catalogue_version()
+        """))
+
+def create_graph_metrics(conn):
+    """
+    Network metrics written by the graph metrics job (src/services/graph_metrics.py).
+    One row per supplier, category and component; columns that do not apply
+    to a node type stay NULL. graph_metrics_runs records which data version
+    the rows were computed from.
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS graph_metrics (
+            node_type VARCHAR(20) NOT NULL,
+            node_id INTEGER NOT NULL,
+            degree_in INTEGER NOT NULL,
+            degree_out INTEGER NOT NULL,
+            degree INTEGER NOT NULL,
+            betweenness DOUBLE PRECISION NOT NULL,
+            component_count INTEGER,
+            supplier_count INTEGER,
+            country_count INTEGER,
+            single_source BOOLEAN,
+            single_country BOOLEAN,
+            sole_source_components INTEGER,
+            hhi DOUBLE PRECISION,
+            top_supplier_id INTEGER,
+            top_supplier_share DOUBLE PRECISION,
+            PRIMARY KEY (node_type, node_id)
+        )
+    """))
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS graph_metrics_runs (
+            id SERIAL PRIMARY KEY,
+            data_version TEXT,
+            rows INTEGER NOT NULL,
+            duration_ms INTEGER NOT NULL,
+            computed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+    for statement in (
+        "CREATE INDEX IF NOT EXISTS idx_graph_metrics_betweenness ON graph_metrics (node_type, betweenness DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_graph_metrics_degree ON graph_metrics (node_type, degree DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_graph_metrics_single_source ON graph_metrics (node_id) "
+        "WHERE node_type = 'component' AND single_source",
+    ):
+        conn.execute(text(statement))
+
+def create_ip_screener_cache(conn):
+    """
+    Shared IP screener result cache (src/services/ip_screener_cache.py),
+    keyed by SHA-256 query hash. Older deployments created the table with
+    32-character MD5 keys and without the size and access columns.
+    """
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS ip_screener_cache (
+            query_hash VARCHAR(64) PRIMARY KEY,
+            part_name VARCHAR(200),
+            description TEXT,
+            response_data TEXT NOT NULL,
+            is_simulation BOOLEAN DEFAULT false,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP NOT NULL
+        )
+    """))
+    # Legacy rows used 32-character MD5 keys
+    conn.execute(text("ALTER TABLE ip_screener_cache ALTER COLUMN query_hash TYPE VARCHAR(64)"))
+    conn.execute(text("""
+        ALTER TABLE ip_screener_cache
+            ADD COLUMN IF NOT EXISTS reference VARCHAR(100),
+            ADD COLUMN IF NOT EXISTS size_bytes INTEGER,
+            ADD COLUMN IF NOT EXISTS hit_count INTEGER DEFAULT 0,
+            ADD COLUMN IF NOT EXISTS last_accessed_at TIMESTAMP
+    """))
+    conn.execute(text("CREATE INDEX IF NOT EXISTS idx_ip_screener_cache_expires ON ip_screener_cache (expires_at)"))
+
+# (version, name, function taking a connection); append only, never renumber
+MIGRATIONS = [
+    (1, 'create_catalogue_tables', create_tables),
+    (2, 'delta_sync_keys', prepare_delta_sync),
+    (3, 'reconcile_relationship_schema', reconcile_schema),
+    (4, 'query_indexes', add_query_indexes),
+    (5, 'catalogue_data_versions', track_data_versions),
+    (6, 'graph_metrics', create_graph_metrics),
+    (7, 'ip_screener_cache', create_ip_screener_cache),
+]
+
+def _ensure_version_table(conn):
+    conn.execute(text("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            name VARCHAR(100) NOT NULL,
+            applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """))
+
+def applied_versions(conn):
+    """Set of migration versions recorded in schema_migrations"""
+    if conn.execute(text("SELECT to_regclass('schema_migrations')")).scalar() is None:
+        return set()
+    return {row.version for row in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+def schema_version(engine):
+    """Highest applied migration version, or 0 for an unmigrated database"""
+    with engine.connect() as conn:
+        return max(applied_versions(conn), default=0)
+
+@contextmanager
+def migration_lock(engine):
+    """Hold the migration advisory lock for the duration of the block, waiting for other holders"""
+    with engine.connect() as conn:
+        acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {'key': MIGRATION_LOCK_KEY}).scalar()
+        if not acquired:
+            logger.info("Another instance is migrating, waiting for it to finish...")
+            conn.execute(text("SELECT pg_advisory_lock(:key)"), {'key': MIGRATION_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': MIGRATION_LOCK_KEY})
+            conn.commit()
+
+def migrate(engine):
+    """
+    Apply pending migrations in order, each in its own transaction.
+    Callers must hold migration_lock. Returns the versions applied.
+    """
+    with engine.begin() as conn:
+        _ensure_version_table(conn)
+        done = applied_versions(conn)
+
+    applied = []
+    for version, name, apply in MIGRATIONS:
+        if version in done:
+            continue
+        logger.info(f"Applying migration {version:03d} {name}...")
+        with engine.begin() as conn:
+            apply(conn)
+            conn.execute(text("""
+                INSERT INTO schema_migrations (version, name) VALUES (:version, :name)
+            """), {'version': version, 'name': name})
+        applied.append(version)
+
+    if applied:
+        logger.info(f"Applied {len(applied)} migrations, schema now at version {applied[-1]}")
+    else:
+        logger.info("Schema is up to date")
+    return applied
+
+def index_usage(engine):
+    """Scan counts and sizes for every index, plus sequential vs index scans per table"""
+    with engine.connect() as conn:
+        indexes = [dict(r._mapping) for r in conn.execute(text("""
+            SELECT s.relname AS table_name, s.indexrelname AS index_name, s.idx_scan,
+                   s.idx_tup_read, pg_relation_size(s.indexrelid) AS size_bytes, i.indisunique AS is_unique
+            FROM pg_stat_user_indexes s
+            JOIN pg_index i ON i.indexrelid = s.indexrelid
+            ORDER BY s.relname, s.idx_scan DESC
+        """))]
+        tables = [dict(r._mapping) for r in conn.execute(text("""
+            SELECT relname AS table_name, seq_scan, seq_tup_read, COALESCE(idx_scan, 0) AS idx_scan, n_live_tup
+            FROM pg_stat_user_tables
+            ORDER BY seq_tup_read DESC
+        """))]
+    return {'indexes': indexes, 'tables': tables}
+
+def log_index_report(engine):
+    report = index_usage(engine)
+    for table in report['tables']:
+        logger.info(f"{table['table_name']}: {table['n_live_tup']} rows, {table['seq_scan']} seq scans "
+                    f"({table['seq_tup_read']} rows read), {table['idx_scan']} index scans")
+    for index in report['indexes']:
+        # Unused non-unique indexes only cost writes; unique ones still enforce keys
+        flag = '  UNUSED' if index['idx_scan'] == 0 and not index['is_unique'] else ''
+        logger.info(f"  {index['table_name']}.{index['index_name']}: {index['idx_scan']} scans, "
+                    f"{index['idx_tup_read']} tuples, {index['size_bytes'] // 1024} kB{flag}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Apply RE4DY supply chain schema migrations")
+    parser.add_argument('--status', action='store_true', help="List applied and pending migrations and exit")
+    parser.add_argument('--index-report', action='store_true',
+                        help="Log index and sequential scan counts since statistics were last reset, then exit")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    try:
+        engine = create_engine(get_database_url())
+
+        if args.status:
+            with engine.connect() as conn:
+                done = applied_versions(conn)
+            for version, name, _ in MIGRATIONS:
+                logger.info(f"{version:03d} {name}: {'applied' if version in done else 'pending'}")
+            return
+
+        if args.index_report:
+            log_index_report(engine)
+            return
+
+        with migration_lock(engine):
+            migrate(engine)
+
+    except Exception as e:
+        logger.error(f"Error migrating database: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+import os
+import logging
+
+# One JSON object per request; see the after_request hook in main.py
+ACCESS_LOGGER = 'src.access'
+
+def configure_logging() -> None:
+    """
+    Logging for the API process, configured once at startup.
+    LOG_LEVEL sets the application level (default INFO). The access log
+    writes bare JSON lines so log shippers can parse them without a
+    pattern; ACCESS_LOG=0 turns it off.
+    """
+    logging.basicConfig(
+        level=os.getenv('LOG_LEVEL', 'INFO').upper(),
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s'
+    )
+
+    access_logger = logging.getLogger(ACCESS_LOGGER)
+    access_logger.propagate = False
+    access_logger.setLevel(logging.INFO if os.getenv('ACCESS_LOG', '1') != '0' else logging.CRITICAL)
+    if not access_logger.handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        access_logger.addHandler(handler)
@@ -3,13 +3,27 @@ import sys
 # DON’T CHANGE THIS!
 sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
-from flask import Flask, send_from_directory
+import json
+import logging
+from flask import Flask, request, send_from_directory
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
+from src.logging_config import ACCESS_LOGGER, configure_logging
+
+# Configure logging before the blueprints import their services, which log at startup
+configure_logging()
+
 from src.routes.components import components_bp
 from src.routes.visualization import visualization_bp
 from src.routes.ip_screener import ip_screener_bp
 from src.routes.relationships import relationships_bp
+from src.routes.profiling import profiling_bp
+from src.routes.impact import impact_bp
+from src.routes.paths import paths_bp
+from src.routes.metrics import metrics_bp
+from src.routes.costs import costs_bp
+from src.routes.similarity import similarity_bp
+from src.services import request_metrics
 
 # Initialise the Flask application and point to the static folder
 app = Flask(
@@ -25,12 +39,32 @@ app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 # Initialise extensions
 db = SQLAlchemy(app)
 CORS(app)
+# Per-request db/transform/serialize timings for Server-Timing and the access log
+request_metrics.init_app(app)
+access_logger = logging.getLogger(ACCESS_LOGGER)
 
 # Register API blueprints under the /api prefix
 app.register_blueprint(components_bp, url_prefix='/api')
 app.register_blueprint(visualization_bp, url_prefix='/api')
 app.register_blueprint(ip_screener_bp, url_prefix='/api')
 app.register_blueprint(relationships_bp, url_prefix='/api')
+app.register_blueprint(profiling_bp, url_prefix='/api')
+app.register_blueprint(impact_bp, url_prefix='/api')
+app.register_blueprint(paths_bp, url_prefix='/api')
+app.register_blueprint(metrics_bp, url_prefix='/api')
+app.register_blueprint(costs_bp, url_prefix='/api')
+app.register_blueprint(similarity_bp, url_prefix='/api')
+
+# Registered after the blueprints so it runs before their after_request hooks
+@app.after_request
+def record_request(response):
+    """Attach Server-Timing and write one JSON access log line per request"""
+    metrics = request_metrics.current_metrics()
+    if metrics is None:
+        return response
+    response.headers['Server-Timing'] = metrics.server_timing()
+    access_logger.info(json.dumps(metrics.access_record(request, response)))
+    return response
 
 # Serve React’s single-page app from the static folder
 @app.route('/', defaults={'path': ''})
@@ -1,97 +1,183 @@
 from flask import Blueprint, request, jsonify
 from flask import current_app as app   
 from sqlalchemy import text
+from src.services.facets import FACETS, facet_counts
+from src.services.statistics import price_band_sql
 import logging
 
 
 components_bp = Blueprint('components', __name__)
 
+MAX_FACET_VALUES = 500
+
+# Selectable fields per endpoint: response key -> SQL expression, in response order
+LIST_FIELDS = {
+    'id': 'c.id',
+    'part_name': 'c.part_name',
+    'part_number': 'c.part_number',
+    'subcategory': 'c.subcategory',
+    'description': 'c.description',
+    'specifications': 'c.specifications',
+    'price_min': 'c.price_min',
+    'price_max': 'c.price_max',
+    'currency': 'c.currency',
+    'original_supplier': 's.name',
+    'supplier_country': 's.country',
+    'category_name': 'cat.name',
+}
+DETAIL_FIELDS = {
+    'id': 'c.id',
+    'part_name': 'c.part_name',
+    'part_number': 'c.part_number',
+    'subcategory': 'c.subcategory',
+    'description': 'c.description',
+    'specifications': 'c.specifications',
+    'price_min': 'c.price_min',
+    'price_max': 'c.price_max',
+    'currency': 'c.currency',
+    'supplier_id': 'c.supplier_id',
+    'category_id': 'c.category_id',
+    'is_active': 'c.is_active',
+    'created_at': 'c.created_at',
+    'updated_at': 'c.updated_at',
+    'row_hash': 'c.row_hash',
+    'sync_source': 'c.sync_source',
+    'supplier_name': 's.name',
+    'supplier_country': 's.country',
+    'supplier_website': 's.website',
+    'category_name': 'cat.name',
+    'category_description': 'cat.description',
+}
+
+# Named field sets; summary leaves out the large description and specifications text
+LIST_PRESETS = {
+    'summary': ('id', 'part_name', 'part_number', 'price_min', 'price_max', 'currency',
+                'original_supplier', 'supplier_country', 'category_name'),
+    'full': tuple(LIST_FIELDS),
+}
+DETAIL_PRESETS = {
+    'summary': ('id', 'part_name', 'part_number', 'subcategory', 'price_min', 'price_max', 'currency',
+                'supplier_id', 'category_id', 'supplier_name', 'supplier_country', 'category_name'),
+    'full': tuple(DETAIL_FIELDS),
+}
+
+def _projection(available, presets):
+    """
+    SELECT list for ?fields=, a comma-separated mix of preset names and
+    field names (default full). id is always included. Raises ValueError
+    naming any unknown field.
+    """
+    requested = _value_list('fields') or ['full']
+    unknown = [name for name in requested if name not in presets and name not in available]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}; "
+                         f"use {' or '.join(presets)} or any of {', '.join(available)}")
+    selected = {'id'}
+    for name in requested:
+        selected.update(presets.get(name, (name,)))
+    return ', '.join(f"{expression} AS {name}" for name, expression in available.items() if name in selected)
+
+def _id_list(name):
+    return [int(value) for value in request.args.get(name, '').split(',') if value.strip()]
+
+def _value_list(name):
+    return [value.strip() for value in request.args.get(name, '').split(',') if value.strip()]
+
+def _component_filters():
+    """
+    Search conditions, per-facet filter conditions and their parameters
+    for the components listing. Within a facet the conditions AND
+    together; listed ids/values within one parameter OR together.
+    """
+    search = request.args.get('search', '')
+    category = request.args.get('category', '')
+    supplier = request.args.get('supplier', '')
+    category_ids = _id_list('category_id')
+    supplier_ids = _id_list('supplier_id')
+    countries = _value_list('country')
+    price_bands = _value_list('price_band')
+
+    base, facets, params = [], {facet: [] for facet in FACETS}, {}
+    if search:
+        base.append("c.part_name ILIKE :search OR c.description ILIKE :search OR s.name ILIKE :search")
+        params['search'] = f"%{search}%"
+    if category:
+        facets['category'].append("cat.name ILIKE :category")
+        params['category'] = f"%{category}%"
+    if category_ids:
+        facets['category'].append("c.category_id = ANY(:category_ids)")
+        params['category_ids'] = category_ids
+    if supplier:
+        facets['supplier'].append("s.name ILIKE :supplier")
+        params['supplier'] = f"%{supplier}%"
+    if supplier_ids:
+        facets['supplier'].append("c.supplier_id = ANY(:supplier_ids)")
+        params['supplier_ids'] = supplier_ids
+    if countries:
+        facets['country'].append("s.country = ANY(:countries)")
+        params['countries'] = countries
+    if price_bands:
+        facets['price_band'].append(f"{price_band_sql()} = ANY(:price_bands)")
+        params['price_bands'] = price_bands
+    return base, facets, params
+
 @components_bp.route('/components', methods=['GET'])
 def get_components():
-    """Get all components with optional filtering and pagination"""
+    """
+    Get all components with optional filtering and pagination.
+    Filters: search, category/supplier (name substrings), category_id,
+    supplier_id, country and price_band (comma-separated lists).
+    facets=true adds category, supplier, country and price band counts
+    for the current filters, computed in the same statement as the total.
+    fields=summary (or a list of field names) skips the large text columns.
+    """
     try:
-        # Get query parameters
-        search = request.args.get('search', '')
-        category = request.args.get('category', '')
-        supplier = request.args.get('supplier', '')
         page = int(request.args.get('page', 1))
         limit = int(request.args.get('limit', 200))
         offset = (page - 1) * limit
+        with_facets = request.args.get('facets', 'false').lower() == 'true'
+        facet_limit = min(max(int(request.args.get('facet_limit', 50)), 1), MAX_FACET_VALUES)
+        base, facet_filters, params = _component_filters()
+    except ValueError:
+        return jsonify({'success': False, 'error': 'page, limit, facet_limit and ids must be integers'}), 400
+    try:
+        columns = _projection(LIST_FIELDS, LIST_PRESETS)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    try:
+        conditions = base + [condition for facet in FACETS for condition in facet_filters[facet]]
+        where = ''.join(f" AND ({condition})" for condition in conditions)
 
         with app.app_context():
             engine = app.extensions['sqlalchemy'].engine
             with engine.connect() as conn:
-                # Build query
-                query = """
-                    SELECT 
-                        c.id,
-                        c.part_name,
-                        c.part_number,
-                        c.subcategory,
-                        c.description,
-                        c.specifications,
-                        c.price_min,
-                        c.price_max,
-                        c.currency,
-                        s.name as original_supplier,
-                        s.country as supplier_country,
-                        cat.name as category_name
+                query = f"""
+                    SELECT {columns}
                     FROM components c
                     JOIN suppliers s ON c.supplier_id = s.id
                     JOIN categories cat ON c.category_id = cat.id
-                    WHERE c.is_active = true
+                    WHERE c.is_active = true{where}
+                    ORDER BY c.part_name LIMIT :limit OFFSET :offset
                 """
-                
-                params = {}
-                
-                # Add search filter
-                if search:
-                    query += " AND (c.part_name ILIKE :search OR c.description ILIKE :search OR s.name ILIKE :search)"
-                    params['search'] = f"%{search}%"
-                
-                # Add category filter
-                if category:
-                    query += " AND cat.name ILIKE :category"
-                    params['category'] = f"%{category}%"
-                
-                # Add supplier filter
-                if supplier:
-                    query += " AND s.name ILIKE :supplier"
-                    params['supplier'] = f"%{supplier}%"
-                
-                # Add ordering and pagination
-                query += " ORDER BY c.part_name LIMIT :limit OFFSET :offset"
-                params.update({'limit': limit, 'offset': offset})
-
-                result = conn.execute(text(query), params)
+                result = conn.execute(text(query), dict(params, limit=limit, offset=offset))
                 components = [dict(r._mapping) for r in result]
-                
-                # Get total count for pagination
-                count_query = """
-                    SELECT COUNT(*)
-                    FROM components c
-                    JOIN suppliers s ON c.supplier_id = s.id
-                    JOIN categories cat ON c.category_id = cat.id
-                    WHERE c.is_active = true
-                """
-                count_params = {}
-                
-                if search:
-                    count_query += " AND (c.part_name ILIKE :search OR c.description ILIKE :search OR s.name ILIKE :search)"
-                    count_params['search'] = f"%{search}%"
-                
-                if category:
-                    count_query += " AND cat.name ILIKE :category"
-                    count_params['category'] = f"%{category}%"
-                
-                if supplier:
-                    count_query += " AND s.name ILIKE :supplier"
-                    count_params['supplier'] = f"%{supplier}%"
-                
-                count_result = conn.execute(text(count_query), count_params)
-                total_count = count_result.scalar()
 
-        return jsonify({
+                # The facet scan yields the total count as well
+                if with_facets:
+                    counts = facet_counts(conn, base, facet_filters, params, facet_limit)
+                    total_count = counts['total']
+                else:
+                    count_query = f"""
+                        SELECT COUNT(*)
+                        FROM components c
+                        JOIN suppliers s ON c.supplier_id = s.id
+                        JOIN categories cat ON c.category_id = cat.id
+                        WHERE c.is_active = true{where}
+                    """
+                    total_count = conn.execute(text(count_query), params).scalar()
+
+        response = {
             'success': True,
             'components': components,
             'pagination': {
@@ -100,7 +186,10 @@ def get_components():
                 'total': total_count,
                 'pages': (total_count + limit - 1) // limit
             }
-        }), 200
+        }
+        if with_facets:
+            response['facets'] = counts['facets']
+        return jsonify(response), 200
 
     except Exception as e:
         logging.error(f"Error fetching components: {e}")
@@ -108,19 +197,18 @@ def get_components():
 
 @components_bp.route('/components/<int:component_id>', methods=['GET'])
 def get_component_by_id(component_id):
-    """Get detailed component information by ID"""
+    """Get detailed component information by ID (fields= as for the listing)"""
+    try:
+        columns = _projection(DETAIL_FIELDS, DETAIL_PRESETS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
     try:
         with app.app_context():
             engine = app.extensions['sqlalchemy'].engine
             with engine.connect() as conn:
-                query = """
-                    SELECT 
-                        c.*,
-                        s.name as supplier_name,
-                        s.country as supplier_country,
-                        s.website as supplier_website,
-                        cat.name as category_name,
-                        cat.description as category_description
+                query = f"""
+                    SELECT {columns}
                     FROM components c
                     JOIN suppliers s ON c.supplier_id = s.id
                     JOIN categories cat ON c.category_id = cat.id
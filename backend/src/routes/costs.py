@@ -0,0 +1,69 @@
+from flask import Blueprint, request, jsonify
+from flask import current_app as app
+from sqlalchemy import text
+from src.services.bom_costs import CostService
+import logging
+
+logger = logging.getLogger(__name__)
+
+costs_bp = Blueprint('costs', __name__)
+
+# BOM roll-up index, updated when the catalogue data version changes
+cost_service = CostService()
+
+MAX_ASSEMBLIES = 1000
+MAX_SUB_COMPONENTS = 100
+
+def _parse_components():
+    """Component ids from a JSON body {"components": [...]} or ?component=1,2,3"""
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        return [int(value) for value in data.get('components', [])]
+    return [int(value) for value in request.args.get('component', '').split(',') if value.strip()]
+
+def _details(engine, entries):
+    """Add part names and numbers for display"""
+    ids = [entry['id'] for entry in entries]
+    with engine.connect() as conn:
+        rows = {row.id: row for row in conn.execute(text("""
+            SELECT id, part_name, part_number FROM components WHERE id = ANY(:ids)
+        """), {'ids': ids})} if ids else {}
+    for entry in entries:
+        row = rows.get(entry['id'])
+        if row is not None:
+            entry['part_name'], entry['part_number'] = row.part_name, row.part_number
+
+@costs_bp.route('/costs/rollup', methods=['GET', 'POST'])
+def get_cost_rollup():
+    """
+    Bill-of-materials cost roll-up for one or many assemblies: own price
+    range plus the summed min/max price of every sub-component reached
+    through part_of and requires (each use counted once).
+    Components in a dependency cycle share their cycle's roll-up.
+    sub_components=N also lists the N most expensive direct
+    sub-components.
+    """
+    try:
+        component_ids = _parse_components()
+        sub_components = min(max(int(request.args.get('sub_components', 0)), 0), MAX_SUB_COMPONENTS)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Component ids and sub_components must be integers'}), 400
+
+    if not component_ids:
+        return jsonify({'error': 'Give at least one component id (?component=1,2 or {"components": [...]})'}), 400
+    if len(component_ids) > MAX_ASSEMBLIES:
+        return jsonify({'error': f"At most {MAX_ASSEMBLIES} components per request"}), 400
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        result = cost_service.roll_ups(engine, component_ids, sub_components)
+        if request.args.get('details', 'true').lower() != 'false':
+            entries = list(result['assemblies'])
+            for assembly in result['assemblies']:
+                entries.extend(assembly.get('sub_components', []))
+            _details(engine, entries)
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Cost roll-up error: {e}")
+        return jsonify({'error': 'Failed to compute cost roll-up'}), 500
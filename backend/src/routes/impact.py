@@ -0,0 +1,84 @@
+from flask import Blueprint, request, jsonify
+from flask import current_app as app
+from sqlalchemy import text
+from src.services.impact import ImpactService
+import logging
+
+logger = logging.getLogger(__name__)
+
+impact_bp = Blueprint('impact', __name__)
+
+# Reachability index, rebuilt when the catalogue data version changes
+impact_service = ImpactService()
+
+FAILABLE_TYPES = ('supplier', 'component', 'vehicle_model')
+MAX_FAILED_NODES = 1000
+MAX_LIMIT = 10000
+
+def _parse_failed():
+    """Failed nodes from a JSON body {"failed": [{"type": ..., "id": ...}]} or ?supplier=1,2&component=3"""
+    failed = []
+    if request.method == 'POST':
+        data = request.get_json(silent=True) or {}
+        for entry in data.get('failed', []):
+            failed.append((entry.get('type'), int(entry.get('id'))))
+    else:
+        for node_type in FAILABLE_TYPES:
+            for value in request.args.get(node_type, '').split(','):
+                if value.strip():
+                    failed.append((node_type, int(value)))
+    return failed
+
+def _details(engine, affected):
+    """Replace affected id lists with names for display"""
+    with engine.connect() as conn:
+        component_ids = affected['components'].pop('ids')
+        affected['components']['items'] = [dict(row._mapping) for row in conn.execute(text("""
+            SELECT c.id, c.part_name, c.part_number, s.name AS supplier_name, cat.name AS category_name
+            FROM components c
+            JOIN suppliers s ON s.id = c.supplier_id
+            JOIN categories cat ON cat.id = c.category_id
+            WHERE c.id = ANY(:ids)
+            ORDER BY c.part_name
+        """), {'ids': component_ids})] if component_ids else []
+
+        model_ids = affected['vehicle_models'].pop('ids')
+        affected['vehicle_models']['items'] = [dict(row._mapping) for row in conn.execute(text("""
+            SELECT vm.id, vm.model_name, vm.generation, vm.vehicle_type, vmf.name AS manufacturer
+            FROM vehicle_models vm
+            JOIN vehicle_manufacturers vmf ON vmf.id = vm.manufacturer_id
+            WHERE vm.id = ANY(:ids)
+            ORDER BY vmf.name, vm.model_name
+        """), {'ids': model_ids})] if model_ids else []
+
+@impact_bp.route('/impact', methods=['GET', 'POST'])
+def get_impact():
+    """
+    Components and vehicle models affected if the given suppliers,
+    components or vehicle models fail together. Returns total counts, up to
+    `limit` affected items per type and per-node counts.
+    """
+    try:
+        failed = _parse_failed()
+        limit = min(int(request.args.get('limit', 500)), MAX_LIMIT)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'Failed nodes need a type and an integer id'}), 400
+
+    if not failed:
+        return jsonify({'error': f"Give at least one failed node ({', '.join(FAILABLE_TYPES)})"}), 400
+    if len(failed) > MAX_FAILED_NODES:
+        return jsonify({'error': f"At most {MAX_FAILED_NODES} failed nodes per request"}), 400
+    unknown_types = sorted({node_type for node_type, _ in failed if node_type not in FAILABLE_TYPES})
+    if unknown_types:
+        return jsonify({'error': f"Unsupported node types: {', '.join(map(str, unknown_types))}"}), 400
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        result = impact_service.analyse(engine, failed, limit)
+        if request.args.get('details', 'true').lower() != 'false':
+            _details(engine, result['affected'])
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error computing impact: {e}")
+        return jsonify({'error': 'Failed to compute impact'}), 500
@@ -2,12 +2,8 @@ from flask import Blueprint, request, jsonify
 from src.models.database import DatabaseConnection
 from src.services.ip_screener_live import IPScreenerService
 import logging
-import json
-import hashlib
-from datetime import datetime, timedelta
+from datetime import datetime
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 ip_screener_bp = Blueprint('ip_screener', __name__)
@@ -110,66 +106,21 @@ def analyze_component_legacy():
                 component_name = component['part_name']
                 component_description = component.get('description', f"{component['part_name']} from {component['supplier_name']}")
                 
-                # Check cache first if not forcing refresh
-                if not force_refresh:
-                    query_text = f"{component_name} {component_description}"
-                    query_hash = hashlib.md5(query_text.encode()).hexdigest()
-                    
-                    cursor.execute("""
-                        SELECT * FROM ip_screener_cache 
-                        WHERE query_hash = %s AND expires_at > %s
-                    """, (query_hash, datetime.now()))
-                    
-                    cached_result = cursor.fetchone()
-                    if cached_result:
-                        cached_data = json.loads(cached_result['response_data'])
-                        return jsonify({
-                            'componentId': component_id,
-                            'analysisDate': cached_result['created_at'].isoformat(),
-                            'cached': True,
-                            **cached_data
-                        })
-                
-                # Call live IP Screener service
+                # Call live IP Screener service; it owns the shared cache
                 result = ip_service.analyze_component(
                     component_name=component_name,
                     component_description=component_description,
-                    reference=f"RE4DY_COMP_{component_id}"
+                    reference=f"RE4DY_COMP_{component_id}",
+                    force_refresh=force_refresh
                 )
                 
                 # Convert result to legacy format
                 legacy_result = convert_to_legacy_format(result, component)
                 
-                # Cache the result in database
-                if result.get('success'):
-                    query_text = f"{component_name} {component_description}"
-                    query_hash = hashlib.md5(query_text.encode()).hexdigest()
-                    expires_at = datetime.now() + timedelta(hours=24)
-                    
-                    cursor.execute("""
-                        INSERT INTO ip_screener_cache 
-                        (query_hash, part_name, description, response_data, is_simulation, expires_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (query_hash) 
-                        DO UPDATE SET 
-                            response_data = EXCLUDED.response_data,
-                            is_simulation = EXCLUDED.is_simulation,
-                            expires_at = EXCLUDED.expires_at,
-                            created_at = CURRENT_TIMESTAMP
-                    """, (
-                        query_hash,
-                        component_name,
-                        component_description,
-                        json.dumps(legacy_result),
-                        False,  # Not simulation anymore
-                        expires_at
-                    ))
-                    conn.commit()
-                
                 return jsonify({
                     'componentId': component_id,
-                    'analysisDate': datetime.now().isoformat(),
-                    'cached': False,
+                    'analysisDate': result.get('analyzed_at') or datetime.now().isoformat(),
+                    'cached': result.get('from_cache', False),
                     **legacy_result
                 })
                 
@@ -263,7 +214,13 @@ def get_status():
             'service_available': True,
             'api_key_configured': bool(ip_service.api.data_key),
             'cache_enabled': True,
+            'cache_backend': ip_service.cache.backend.name,
             'cache_ttl_hours': ip_service.cache.ttl_hours,
+            'memory_cache_entries': len(ip_service.cache.memory),
+            'memory_cache_bytes': ip_service.cache.memory.total_bytes,
+            'cache_max_mb': ip_service.maintenance.max_bytes // (1024 * 1024),
+            'refresh_ahead_minutes': ip_service.maintenance.refresh_ahead_minutes,
+            'last_maintenance': ip_service.maintenance.last_run,
             'throttle_minutes': ip_service.cache.throttle_minutes,
             'default_rows': ip_service.api.default_rows,
             'max_rows': ip_service.api.max_rows,
@@ -286,16 +243,12 @@ def get_status():
 @ip_screener_bp.route('/cache/clear', methods=['POST'])
 def clear_cache():
     """
-    Clear IP Screener cache (admin function).
+    Clear IP Screener cache (admin function). The shared backend is
+    cleared at once; other workers drop their in-memory entries within
+    IPS_MEMORY_CACHE_CHECK_SECONDS.
     """
     try:
-        import os
-        import shutil
-        
-        cache_dir = ip_service.cache.cache_dir
-        if os.path.exists(cache_dir):
-            shutil.rmtree(cache_dir)
-            os.makedirs(cache_dir, exist_ok=True)
+        ip_service.cache.clear()
         
         logger.info("IP Screener cache cleared")
         
@@ -311,6 +264,27 @@ def clear_cache():
             'error': str(e)
         }), 500
 
+@ip_screener_bp.route('/cache/maintenance', methods=['POST'])
+def run_cache_maintenance():
+    """
+    Run one cache maintenance pass now (admin function).
+    Sweeps expired entries, enforces the size cap and refreshes popular entries.
+    """
+    try:
+        stats = ip_service.maintenance.run_once()
+        
+        return jsonify({
+            'success': True,
+            'maintenance': stats
+        })
+        
+    except Exception as e:
+        logger.error(f"Cache maintenance error: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
 @ip_screener_bp.route('/test', methods=['POST'])
 def test_api():
     """
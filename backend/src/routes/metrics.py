@@ -0,0 +1,154 @@
+from flask import Blueprint, request, jsonify
+from flask import current_app as app
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from src.services.graph_metrics import GraphMetricsService
+import logging
+
+logger = logging.getLogger(__name__)
+
+metrics_bp = Blueprint('metrics', __name__)
+
+# Refreshes the graph_metrics table in the background when the catalogue changes
+graph_metrics_service = GraphMetricsService()
+
+@metrics_bp.record_once
+def start_metrics_job(state):
+    graph_metrics_service.start(state.app)
+
+COMMON_SORTS = ('betweenness', 'degree', 'degree_in', 'degree_out')
+
+# kind -> (node_type, joins, selected columns, sortable columns, default sort)
+METRIC_VIEWS = {
+    'suppliers': (
+        'supplier',
+        "JOIN suppliers s ON s.id = m.node_id",
+        "s.name, s.country, m.component_count, m.sole_source_components",
+        COMMON_SORTS + ('component_count', 'sole_source_components'),
+        'betweenness',
+    ),
+    'components': (
+        'component',
+        """JOIN components c ON c.id = m.node_id
+           JOIN suppliers s ON s.id = c.supplier_id
+           JOIN categories cat ON cat.id = c.category_id""",
+        """c.part_name, c.part_number, s.name AS supplier_name, cat.name AS category_name,
+           m.supplier_count, m.country_count, m.single_source, m.single_country""",
+        COMMON_SORTS + ('supplier_count', 'country_count'),
+        'betweenness',
+    ),
+    'categories': (
+        'category',
+        """JOIN categories cat ON cat.id = m.node_id
+           LEFT JOIN suppliers ts ON ts.id = m.top_supplier_id""",
+        """cat.name, m.component_count, m.supplier_count, m.hhi,
+           m.top_supplier_id, ts.name AS top_supplier_name, m.top_supplier_share""",
+        COMMON_SORTS + ('hhi', 'component_count', 'supplier_count', 'top_supplier_share'),
+        'hhi',
+    ),
+}
+
+MAX_LIMIT = 1000
+
+def _flag(name):
+    value = request.args.get(name)
+    if value is None:
+        return None
+    return value.lower() in ('true', '1', 'yes')
+
+@metrics_bp.route('/metrics/<kind>', methods=['GET'])
+def get_metrics(kind):
+    """
+    Precomputed network metrics for suppliers, components or categories,
+    sorted by any metric column (sort=..., order=asc|desc) and paginated.
+    Components can be filtered with single_source, single_country and
+    category_id. The metrics block reports which data version the rows
+    were computed from and whether the catalogue has changed since.
+    """
+    if kind not in METRIC_VIEWS:
+        return jsonify({'success': False, 'error': f"kind must be one of: {', '.join(METRIC_VIEWS)}"}), 404
+    node_type, joins, columns, sortable, default_sort = METRIC_VIEWS[kind]
+
+    try:
+        sort = request.args.get('sort', default_sort)
+        order = request.args.get('order', 'desc').lower()
+        page = max(int(request.args.get('page', 1)), 1)
+        limit = min(max(int(request.args.get('limit', 50)), 1), MAX_LIMIT)
+        category_id = request.args.get('category_id')
+        category_id = int(category_id) if category_id not in (None, '') else None
+    except ValueError:
+        return jsonify({'success': False, 'error': 'page, limit and category_id must be integers'}), 400
+    if sort not in sortable:
+        return jsonify({'success': False, 'error': f"sort must be one of: {', '.join(sortable)}"}), 400
+    if order not in ('asc', 'desc'):
+        return jsonify({'success': False, 'error': 'order must be asc or desc'}), 400
+
+    conditions = ["m.node_type = :node_type"]
+    params = {'node_type': node_type, 'limit': limit, 'offset': (page - 1) * limit}
+    if kind == 'components':
+        for flag in ('single_source', 'single_country'):
+            value = _flag(flag)
+            if value is not None:
+                conditions.append(f"m.{flag} = :{flag}")
+                params[flag] = value
+        if category_id is not None:
+            conditions.append("c.category_id = :category_id")
+            params['category_id'] = category_id
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        with engine.connect() as conn:
+            rows = conn.execute(text(f"""
+                SELECT m.node_id AS id, {columns},
+                       m.degree, m.degree_in, m.degree_out, m.betweenness,
+                       COUNT(*) OVER () AS total_count
+                FROM graph_metrics m
+                {joins}
+                WHERE {' AND '.join(conditions)}
+                ORDER BY m.{sort} {order} NULLS LAST, m.node_id
+                LIMIT :limit OFFSET :offset
+            """), params).fetchall()
+            total = rows[0].total_count if rows else conn.execute(text(f"""
+                SELECT COUNT(*) FROM graph_metrics m {joins} WHERE {' AND '.join(conditions)}
+            """), params).scalar()
+            status = graph_metrics_service.status(conn)
+
+        items = []
+        for row in rows:
+            item = dict(row._mapping)
+            del item['total_count']
+            items.append(item)
+
+        return jsonify({
+            'success': True,
+            kind: items,
+            'pagination': {
+                'page': page,
+                'limit': limit,
+                'total': total,
+                'pages': (total + limit - 1) // limit
+            },
+            'sort': {'by': sort, 'order': order},
+            'metrics': status,
+        }), 200
+
+    except ProgrammingError:
+        return jsonify({'success': False, 'error': 'Graph metrics are not set up; run backend/migrate.py'}), 503
+    except Exception as e:
+        logger.error(f"Error fetching {kind} metrics: {e}")
+        return jsonify({'success': False, 'error': f"Failed to fetch {kind} metrics"}), 500
+
+@metrics_bp.route('/metrics/refresh', methods=['POST'])
+def refresh_metrics():
+    """
+    Recompute graph metrics now if the catalogue changed since the last
+    run, or unconditionally with ?force=true (admin function).
+    """
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        stats = graph_metrics_service.refresh(engine, force=_flag('force') or False)
+        return jsonify({'success': True, 'refresh': stats}), 200
+
+    except Exception as e:
+        logger.error(f"Graph metrics refresh error: {e}")
+        return jsonify({'success': False, 'error': 'Failed to refresh graph metrics'}), 500
@@ -0,0 +1,82 @@
+from flask import Blueprint, request, jsonify
+from flask import current_app as app
+from src.services.paths import PathService, WEIGHTS, DIRECTIONS
+from src.services.supply_graph import NODE_TYPES, node_names
+import logging
+
+logger = logging.getLogger(__name__)
+
+paths_bp = Blueprint('paths', __name__)
+
+# Adjacency over the shared supply graph, rebuilt when the catalogue data version changes
+path_service = PathService()
+
+MAX_K = 10
+MAX_BUDGET_NODES = 2000000
+MAX_TIMEOUT_MS = 10000
+
+def _parse_node(value):
+    """'supplier:12' -> ('supplier', 12)"""
+    node_type, _, node_id = (value or '').partition(':')
+    if node_type not in NODE_TYPES:
+        raise ValueError(f"Node must be one of {', '.join(NODE_TYPES)} followed by :id, got '{value}'")
+    return node_type, int(node_id)
+
+@paths_bp.route('/paths', methods=['GET'])
+def get_paths():
+    """
+    Shortest dependency paths between two nodes, e.g.
+    /api/paths?from=supplier:3&to=vehicle_model:12&k=3.
+    weight=strength (default) ranks by the product of relationship
+    strengths, weight=hops by length; direction=downstream (default)
+    follows supply direction, direction=any ignores it. max_nodes and
+    timeout_ms bound the search; a partial answer reports
+    status=budget_exceeded.
+    """
+    try:
+        source = _parse_node(request.args.get('from'))
+        target = _parse_node(request.args.get('to'))
+        k = min(max(int(request.args.get('k', 1)), 1), MAX_K)
+        max_nodes = min(int(request.args.get('max_nodes', 200000)), MAX_BUDGET_NODES)
+        timeout_ms = min(float(request.args.get('timeout_ms', 2000)), MAX_TIMEOUT_MS)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    weight = request.args.get('weight', 'strength')
+    direction = request.args.get('direction', 'downstream')
+    if weight not in WEIGHTS:
+        return jsonify({'error': f"weight must be one of: {', '.join(WEIGHTS)}"}), 400
+    if direction not in DIRECTIONS:
+        return jsonify({'error': f"direction must be one of: {', '.join(DIRECTIONS)}"}), 400
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        finder = path_service.get_finder(engine)
+        graph = finder.graph
+        missing = [f"{t}:{i}" for t, i in (source, target) if graph.node(t, i) is None]
+        if missing:
+            return jsonify({'error': f"Unknown or inactive nodes: {', '.join(missing)}"}), 404
+
+        result = finder.find(graph.node(*source), graph.node(*target), k=k, weight=weight,
+                             direction=direction, max_nodes=max_nodes, timeout_ms=timeout_ms)
+
+        keys = {(node['type'], node['id']) for path in result['paths'] for node in path['nodes']}
+        if keys:
+            with engine.connect() as conn:
+                names = node_names(conn, keys)
+            for path in result['paths']:
+                for node in path['nodes']:
+                    node['name'] = names.get((node['type'], node['id']))
+
+        result.update({
+            'from': {'type': source[0], 'id': source[1]},
+            'to': {'type': target[0], 'id': target[1]},
+            'weight': weight,
+            'direction': direction,
+            'data_version': graph.version,
+        })
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error finding paths: {e}")
+        return jsonify({'error': 'Failed to find paths'}), 500
@@ -0,0 +1,83 @@
+from flask import Blueprint, request, jsonify, g, send_from_directory
+from src.services.profiling import RequestProfiler, PROFILE_FORMATS
+import logging
+
+logger = logging.getLogger(__name__)
+
+profiling_bp = Blueprint('profiling', __name__)
+
+# Off unless PROFILE_TOKEN is set
+request_profiler = RequestProfiler()
+
+def _supplied_token():
+    return request.headers.get('X-Profile-Token') or request.args.get('_profile')
+
+@profiling_bp.before_app_request
+def start_request_profile():
+    """
+    Profile this request when it carries the profiling token, either as the
+    X-Profile-Token header or the _profile query parameter. The format is
+    chosen with X-Profile-Format or _profile_format (folded or pstats).
+    """
+    if not request_profiler.enabled or request.blueprint == profiling_bp.name:
+        return None
+    if not request_profiler.authorised(_supplied_token()):
+        return None
+
+    profile_format = request.headers.get('X-Profile-Format') or request.args.get('_profile_format', 'folded')
+    if profile_format not in PROFILE_FORMATS:
+        return jsonify({'error': f"Profile format must be one of: {', '.join(PROFILE_FORMATS)}"}), 400
+
+    g.profile_session = request_profiler.start(profile_format)
+    g.profile_requested = True
+    return None
+
+@profiling_bp.after_app_request
+def finish_request_profile(response):
+    if not g.get('profile_requested'):
+        return response
+
+    session = g.pop('profile_session', None)
+    if session is None:
+        response.headers['X-Profile-Status'] = 'busy'
+    else:
+        name = request_profiler.stop(session, request.endpoint)
+        if name:
+            response.headers['X-Profile-Id'] = name
+            logger.info(f"Profiled {request.method} {request.path} -> {name}")
+    return response
+
+@profiling_bp.teardown_app_request
+def discard_request_profile(error=None):
+    # after_request is skipped on unhandled errors; never leave the profiler locked
+    session = g.pop('profile_session', None)
+    if session is not None:
+        request_profiler.stop(session, request.endpoint)
+
+def _check_token():
+    if not request_profiler.enabled:
+        return jsonify({'error': 'Not found'}), 404
+    if not request_profiler.authorised(_supplied_token()):
+        return jsonify({'error': 'Invalid profiling token'}), 403
+    return None
+
+@profiling_bp.route('/profiles', methods=['GET'])
+def list_profiles():
+    """List stored request profiles, newest first"""
+    denied = _check_token()
+    if denied:
+        return denied
+    try:
+        return jsonify({'profiles': request_profiler.list_profiles()})
+
+    except Exception as e:
+        logger.error(f"Error listing profiles: {e}")
+        return jsonify({'error': 'Failed to list profiles'}), 500
+
+@profiling_bp.route('/profiles/<name>', methods=['GET'])
+def get_profile(name):
+    """Download a stored profile (folded stacks or pstats dump)"""
+    denied = _check_token()
+    if denied:
+        return denied
+    return send_from_directory(request_profiler.output_dir, name, as_attachment=True)
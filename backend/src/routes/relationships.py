@@ -2,8 +2,6 @@ from flask import Blueprint, request, jsonify
 from src.models.database import DatabaseConnection
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 relationships_bp = Blueprint('relationships', __name__)
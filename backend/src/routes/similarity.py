@@ -0,0 +1,115 @@
+from flask import Blueprint, request, jsonify
+from flask import current_app as app
+from sqlalchemy import text
+from src.services.similarity import SimilarityService
+import logging
+
+logger = logging.getLogger(__name__)
+
+similarity_bp = Blueprint('similarity', __name__)
+
+# Text similarity index over active components, synced when the components table changes
+similarity_service = SimilarityService()
+
+MAX_K = 100
+MAX_QUERY_COMPONENTS = 100
+
+def _truthy(value, default):
+    """Query-string or JSON flag: booleans as given, strings 'true'/'1'/'yes'"""
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('true', '1', 'yes')
+
+def _flag(name, default):
+    return _truthy(request.args.get(name), default)
+
+def _alternatives(engine, component_ids, k, other_suppliers, same_category):
+    """Nearest parts per component, with display details and known 'alternative' relationships"""
+    found = similarity_service.alternatives(engine, component_ids, k, other_suppliers, same_category)
+    results = found['results']
+    candidate_ids = sorted({cid for matches in results.values() if matches for cid, _ in matches})
+
+    with engine.connect() as conn:
+        details = {row.id: dict(row._mapping) for row in conn.execute(text("""
+            SELECT c.id, c.part_name, c.part_number, c.price_min, c.price_max,
+                   s.name AS supplier_name, s.country AS supplier_country, cat.name AS category_name
+            FROM components c
+            JOIN suppliers s ON s.id = c.supplier_id
+            JOIN categories cat ON cat.id = c.category_id
+            WHERE c.id = ANY(:ids)
+        """), {'ids': candidate_ids})} if candidate_ids else {}
+        known = {(row.a, row.b) for row in conn.execute(text("""
+            SELECT source_id AS a, target_id AS b FROM supply_chain_relationships
+            WHERE relationship_type = 'alternative' AND source_type = 'component' AND target_type = 'component'
+              AND source_id = ANY(:ids) AND target_id = ANY(:candidates)
+            UNION
+            SELECT target_id, source_id FROM supply_chain_relationships
+            WHERE relationship_type = 'alternative' AND source_type = 'component' AND target_type = 'component'
+              AND target_id = ANY(:ids) AND source_id = ANY(:candidates)
+        """), {'ids': component_ids, 'candidates': candidate_ids})} if candidate_ids else set()
+
+    components = []
+    for component_id in component_ids:
+        matches = results.get(component_id)
+        entry = {'id': component_id, 'found': matches is not None}
+        if matches is not None:
+            entry['alternatives'] = [dict(details.get(cid, {'id': cid}), score=score,
+                                          known_alternative=(component_id, cid) in known)
+                                     for cid, score in matches]
+        components.append(entry)
+    return {'components': components, 'query_ms': found['query_ms'], 'index': found['index']}
+
+@similarity_bp.route('/components/<int:component_id>/alternatives', methods=['GET'])
+def get_alternatives(component_id):
+    """
+    Parts from other suppliers whose name, description, specifications
+    and subcategory are most similar (hashed TF-IDF cosine) to this
+    component. k (default 10) limits the result; same_category=false
+    searches the whole catalogue, other_suppliers=false includes the
+    component's own supplier.
+    """
+    try:
+        k = min(max(int(request.args.get('k', 10)), 1), MAX_K)
+    except ValueError:
+        return jsonify({'error': 'k must be an integer'}), 400
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        result = _alternatives(engine, [component_id], k, _flag('other_suppliers', True),
+                               _flag('same_category', True))
+        entry = result['components'][0]
+        if not entry['found']:
+            return jsonify({'error': 'Component not found or inactive'}), 404
+        return jsonify(dict(entry, query_ms=result['query_ms'], index=result['index']))
+
+    except Exception as e:
+        logger.error(f"Error finding alternatives for component {component_id}: {e}")
+        return jsonify({'error': 'Failed to find alternative parts'}), 500
+
+@similarity_bp.route('/components/alternatives', methods=['POST'])
+def get_alternatives_batch():
+    """
+    Alternatives for many components in one batched query:
+    {"components": [1, 2, 3], "k": 10, "same_category": true, "other_suppliers": true}
+    """
+    data = request.get_json(silent=True) or {}
+    try:
+        component_ids = [int(value) for value in data.get('components', [])]
+        k = min(max(int(data.get('k', 10)), 1), MAX_K)
+    except (TypeError, ValueError):
+        return jsonify({'error': 'components must be a list of integer ids and k an integer'}), 400
+    if not component_ids:
+        return jsonify({'error': 'Give at least one component id'}), 400
+    if len(component_ids) > MAX_QUERY_COMPONENTS:
+        return jsonify({'error': f"At most {MAX_QUERY_COMPONENTS} components per request"}), 400
+
+    try:
+        engine = app.extensions['sqlalchemy'].engine
+        return jsonify(_alternatives(engine, component_ids, k, _truthy(data.get('other_suppliers'), True),
+                                     _truthy(data.get('same_category'), True)))
+
+    except Exception as e:
+        logger.error(f"Error finding alternatives: {e}")
+        return jsonify({'error': 'Failed to find alternative parts'}), 500
@@ -0,0 +1,282 @@
+import math
+import time
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from src.services.supply_graph import SupplyGraph, supply_graph_cache, strongly_connected, COMPONENT
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Relationship types that put one component in another's bill of materials:
+# 'forward' means the source assembly contains the target, 'reverse' that
+# the target contains the source. Each distinct pair counts as one unit.
+# These agree with impact.DEPENDENCY_DIRECTIONS (a failed part affects its
+# assembly); 'connects' links peers rather than parts and is left out.
+BOM_EDGES = {
+    'part_of': 'reverse',
+    'requires': 'forward',
+}
+
+# Rows of the rolled-up quantity matrices
+MIN, MAX, PARTS, UNPRICED = range(4)
+
+# Above this share of assemblies changed, an incremental update recomputes everything
+FULL_RECOMPUTE_SHARE = 0.25
+
+# Full roll-ups loop in plain Python when levels average fewer edges than this
+NARROW_LEVEL_EDGES = 32
+
+def _csr(rows: np.ndarray, columns: np.ndarray, weights: np.ndarray, row_count: int):
+    order = np.argsort(rows, kind='stable')
+    offsets = np.zeros(row_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=row_count), out=offsets[1:])
+    return offsets, columns[order], weights[order]
+
+class CostIndex:
+    """
+    Bill-of-materials cost roll-up over active components. Cycles are
+    condensed into strongly connected components, each rolled up as one
+    assembly; the condensation is a DAG whose SCC numbers are already in
+    reverse topological order. Subtree totals (min/max cost, part count,
+    unpriced parts) are memoised per SCC, so a sub-assembly shared by many
+    parents is summed once and counted once per use. Full builds process
+    one height level at a time with NumPy (one plain loop for deep, narrow
+    BOMs); price changes recompute only the changed assemblies and their
+    ancestors.
+    """
+
+    def __init__(self, graph: SupplyGraph):
+        self.graph = graph
+        node_type = np.frombuffer(graph.node_type, dtype=np.int8)
+        self.components = np.flatnonzero(node_type == COMPONENT)
+        count = len(self.components)
+        local = np.full(len(graph), -1, dtype=np.int64)
+        local[self.components] = np.arange(count)
+        self.local = local
+        self.parents, self.children = self._bom_pairs(graph, local)
+
+        successors: List[List[int]] = [[] for _ in range(count)]
+        for parent, child in zip(self.parents.tolist(), self.children.tolist()):
+            successors[parent].append(child)
+        scc, scc_count = strongly_connected(successors)
+        del successors
+        self.scc = np.frombuffer(scc, dtype=np.int32).astype(np.int64)
+        self.scc_count = scc_count
+        self.scc_size = np.bincount(self.scc, minlength=scc_count)
+
+        # Condensed DAG with multiplicities, forwards for roll-ups and backwards for ancestors
+        source, target = self.scc[self.parents], self.scc[self.children]
+        cross = source != target
+        pairs, uses = np.unique(source[cross] * scc_count + target[cross], return_counts=True)
+        dag_parent, dag_child = pairs // scc_count, pairs % scc_count
+        self.child_offsets, self.dag_child, self.dag_uses = _csr(dag_parent, dag_child, uses.astype(np.float64),
+                                                                 scc_count)
+        self.parent_offsets, self.dag_parent, _ = _csr(dag_child, dag_parent, uses, scc_count)
+
+        # Height above the deepest leaf; children always have lower SCC numbers
+        height = [0] * scc_count
+        offsets, children = self.child_offsets.tolist(), self.dag_child.tolist()
+        for current in range(scc_count):
+            for position in range(offsets[current], offsets[current + 1]):
+                if height[children[position]] + 1 > height[current]:
+                    height[current] = height[children[position]] + 1
+        self.height = np.array(height, dtype=np.int64)
+        self.max_depth = int(self.height.max()) + 1 if scc_count else 0
+
+        # Edges grouped by their parent's height, parents sorted within each level
+        edge_parent = np.repeat(np.arange(scc_count), np.diff(self.child_offsets))
+        order = np.lexsort((edge_parent, self.height[edge_parent]))
+        self.level_parent = edge_parent[order]
+        self.level_child = self.dag_child[order]
+        self.level_uses = self.dag_uses[order]
+        self.level_bounds = np.searchsorted(self.height[self.level_parent], np.arange(self.max_depth + 1))
+
+        self.own = self._own_quantities(graph)
+        self.total = self._roll_up_all()
+        self.build = {'mode': 'full', 'recomputed': scc_count}
+
+    @staticmethod
+    def _bom_pairs(graph: SupplyGraph, local: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Distinct (assembly, sub-component) pairs in local component numbering"""
+        edge_type = np.frombuffer(graph.edge_type, dtype=np.int16)
+        edge_source = np.frombuffer(graph.edge_source, dtype=np.int32)
+        edge_target = np.frombuffer(graph.edge_target, dtype=np.int32)
+        parents, children = [], []
+        for relationship_type, direction in BOM_EDGES.items():
+            if relationship_type not in graph.relationship_types:
+                continue
+            selected = edge_type == graph.relationship_types.index(relationship_type)
+            source, target = local[edge_source[selected]], local[edge_target[selected]]
+            if direction == 'reverse':
+                source, target = target, source
+            keep = (source >= 0) & (target >= 0) & (source != target)
+            parents.append(source[keep])
+            children.append(target[keep])
+        count = max(len(local), 1)
+        pairs = np.unique(np.concatenate(parents or [np.zeros(0, dtype=np.int64)]) * count +
+                          np.concatenate(children or [np.zeros(0, dtype=np.int64)]))
+        return pairs // count, pairs % count
+
+    def _own_quantities(self, graph: SupplyGraph) -> np.ndarray:
+        """Per-SCC sums of the members' own prices and counts"""
+        price_min = np.frombuffer(graph.price_min, dtype=np.float64)[self.components]
+        price_max = np.frombuffer(graph.price_max, dtype=np.float64)[self.components]
+        unpriced = np.isnan(price_min) | np.isnan(price_max)
+        own = np.empty((4, self.scc_count))
+        own[MIN] = np.bincount(self.scc, weights=np.where(unpriced, 0.0, price_min), minlength=self.scc_count)
+        own[MAX] = np.bincount(self.scc, weights=np.where(unpriced, 0.0, price_max), minlength=self.scc_count)
+        own[PARTS] = self.scc_size
+        own[UNPRICED] = np.bincount(self.scc, weights=unpriced, minlength=self.scc_count)
+        return own
+
+    def _roll_up_all(self) -> np.ndarray:
+        if self.max_depth * NARROW_LEVEL_EDGES > len(self.dag_child):
+            return self._roll_up_sequential()
+        total = self.own.copy()
+        for height in range(1, self.max_depth):
+            lo, hi = self.level_bounds[height], self.level_bounds[height + 1]
+            if lo == hi:
+                continue
+            parents = self.level_parent[lo:hi]
+            starts = np.flatnonzero(np.r_[True, parents[1:] != parents[:-1]])
+            contributions = total[:, self.level_child[lo:hi]] * self.level_uses[lo:hi]
+            total[:, parents[starts]] += np.add.reduceat(contributions, starts, axis=1)
+        return total
+
+    def _roll_up_sequential(self) -> np.ndarray:
+        """Plain loop in SCC order, for deep and narrow BOMs where per-level NumPy calls dominate"""
+        offsets, children, uses = self.child_offsets.tolist(), self.dag_child.tolist(), self.dag_uses.tolist()
+        rows = self.own.tolist()
+        for row in rows:
+            for current in range(self.scc_count):
+                value = row[current]
+                for position in range(offsets[current], offsets[current + 1]):
+                    value += uses[position] * row[children[position]]
+                row[current] = value
+        return np.array(rows, dtype=np.float64).reshape(4, self.scc_count)
+
+    def same_structure(self, graph: SupplyGraph) -> bool:
+        """Whether graph has the same active components and BOM pairs as this index"""
+        node_type = np.frombuffer(graph.node_type, dtype=np.int8)
+        if not np.array_equal(np.flatnonzero(node_type == COMPONENT), self.components):
+            return False
+        if any(graph.keys[node] != self.graph.keys[node] for node in self.components.tolist()):
+            return False
+        parents, children = self._bom_pairs(graph, self.local)
+        return np.array_equal(parents, self.parents) and np.array_equal(children, self.children)
+
+    def with_prices(self, graph: SupplyGraph) -> 'CostIndex':
+        """
+        Copy of this index for a graph with the same structure but possibly
+        different prices; only changed assemblies and their ancestors are
+        recomputed.
+        """
+        updated = object.__new__(CostIndex)
+        updated.__dict__.update(self.__dict__)
+        updated.graph = graph
+        updated.own = updated._own_quantities(graph)
+        changed = np.flatnonzero((updated.own != self.own).any(axis=0))
+        updated.total = self.total.copy()
+        updated.build = {'mode': 'incremental', 'recomputed': updated._recompute(changed)}
+        return updated
+
+    def ancestors(self, sccs: np.ndarray) -> np.ndarray:
+        """sccs and every assembly containing them, in roll-up order"""
+        seen = np.zeros(self.scc_count, dtype=bool)
+        seen[sccs] = True
+        frontier = np.asarray(sccs, dtype=np.int64)
+        offsets = self.parent_offsets
+        while len(frontier):
+            parents = np.concatenate([self.dag_parent[offsets[s]:offsets[s + 1]] for s in frontier.tolist()])
+            parents = np.unique(parents[~seen[parents]])
+            seen[parents] = True
+            frontier = parents
+        return np.flatnonzero(seen)
+
+    def _recompute(self, changed: np.ndarray) -> int:
+        if not len(changed):
+            return 0
+        affected = self.ancestors(changed)
+        if len(affected) > FULL_RECOMPUTE_SHARE * self.scc_count:
+            self.total = self._roll_up_all()
+            return self.scc_count
+        offsets = self.child_offsets
+        for current in affected.tolist():
+            lo, hi = offsets[current], offsets[current + 1]
+            self.total[:, current] = self.own[:, current] + \
+                (self.total[:, self.dag_child[lo:hi]] * self.dag_uses[lo:hi]).sum(axis=1)
+        return len(affected)
+
+    def roll_up(self, node: int) -> Dict[str, Any]:
+        """Totals for a component graph node (shared by every member of its cycle)"""
+        local = self.local[node]
+        scc = self.scc[local]
+        price_min, price_max = self.graph.price_min[node], self.graph.price_max[node]
+        return {
+            'price': {'min': None if math.isnan(price_min) else price_min,
+                      'max': None if math.isnan(price_max) else price_max},
+            'rollup': {'min': round(float(self.total[MIN, scc]), 2), 'max': round(float(self.total[MAX, scc]), 2)},
+            'parts': int(self.total[PARTS, scc]),
+            'unpriced_parts': int(self.total[UNPRICED, scc]),
+            'depth': int(self.height[scc]) + 1,
+            'cycle_members': int(self.scc_size[scc]) if self.scc_size[scc] > 1 else None,
+        }
+
+    def sub_components(self, node: int, limit: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Direct sub-components of a component as (graph node, roll-up), most expensive first"""
+        local = self.local[node]
+        lo, hi = np.searchsorted(self.parents, [local, local + 1])
+        children = self.children[lo:hi]
+        order = np.argsort(-self.total[MAX, self.scc[children]], kind='stable')[:limit]
+        return [(int(self.components[child]), self.roll_up(int(self.components[child])))
+                for child in children[order]]
+
+class CostService:
+    """
+    BOM cost roll-ups. The index follows the shared supply graph; when a
+    rebuild only changed prices, the previous index is updated in place of
+    a full rebuild.
+    """
+
+    def __init__(self, graph_cache=None):
+        self.graph_cache = graph_cache or supply_graph_cache
+
+    def get_index(self, engine) -> CostIndex:
+        return self.graph_cache.derived(engine, 'costs', self._build)
+
+    def _build(self, graph: SupplyGraph, previous: Optional[CostIndex]) -> CostIndex:
+        started = time.perf_counter()
+        if previous is not None and previous.same_structure(graph):
+            index = previous.with_prices(graph)
+        else:
+            index = CostIndex(graph)
+        index.build['computed_ms'] = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Cost index {index.build['mode']} build: "
+                    f"{index.build['recomputed']} of {index.scc_count} assemblies "
+                    f"in {index.build['computed_ms']}ms (max depth {index.max_depth})")
+        return index
+
+    def roll_ups(self, engine, component_ids: List[int], children: int = 0) -> Dict[str, Any]:
+        """
+        Cost roll-ups for the given components, with up to `children`
+        direct sub-components each. Unknown or inactive ids are reported
+        with found=false.
+        """
+        index = self.get_index(engine)
+        graph = index.graph
+        assemblies = []
+        for component_id in component_ids:
+            node = graph.node('component', component_id)
+            entry: Dict[str, Any] = {'id': component_id, 'found': node is not None}
+            if node is not None:
+                entry.update(index.roll_up(node))
+                if children:
+                    entry['sub_components'] = [dict(id=graph.keys[child][1], **roll_up)
+                                               for child, roll_up in index.sub_components(node, children)]
+            assemblies.append(entry)
+
+        return {
+            'assemblies': assemblies,
+            'index': dict(index.build, assemblies=index.scc_count, max_depth=index.max_depth),
+            'data_version': graph.version,
+        }
@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Any
+import logging
+
+logger = logging.getLogger(__name__)
+
+class CacheMaintenance:
+    """
+    Background upkeep for the IP Screener cache.
+    Each run flushes buffered hit counts, sweeps expired entries, evicts
+    least recently read entries above the byte cap and re-queries the
+    most viewed entries shortly before they expire (refresh-ahead).
+    Only one worker per backend runs a pass at a time.
+    """
+
+    def __init__(self, service, interval_minutes: int = None, max_bytes: int = None,
+                 refresh_ahead_minutes: int = None, refresh_top: int = None, refresh_min_hits: int = None):
+        self.service = service
+        self.cache = service.cache
+        self.interval_minutes = interval_minutes if interval_minutes is not None else \
+            int(os.getenv('IPS_CACHE_SWEEP_MINUTES', '30'))
+        self.max_bytes = max_bytes if max_bytes is not None else \
+            int(os.getenv('IPS_CACHE_MAX_MB', '512')) * 1024 * 1024
+        self.refresh_ahead_minutes = refresh_ahead_minutes if refresh_ahead_minutes is not None else \
+            int(os.getenv('IPS_REFRESH_AHEAD_MINUTES', '60'))
+        self.refresh_top = refresh_top if refresh_top is not None else \
+            int(os.getenv('IPS_REFRESH_AHEAD_TOP', '20'))
+        self.refresh_min_hits = refresh_min_hits if refresh_min_hits is not None else \
+            int(os.getenv('IPS_REFRESH_AHEAD_MIN_HITS', '3'))
+
+        # Cumulative views seen by this process; ranks refreshes for backends without a shared counter
+        self.view_counts: Counter = Counter()
+        self.last_run: Dict[str, Any] = {}
+        self._run_lock = threading.Lock()
+        self._thread = None
+
+    def start(self) -> None:
+        """Run maintenance every interval on a daemon thread (no-op when the interval is 0)"""
+        if self.interval_minutes <= 0 or self._thread is not None:
+            return
+
+        def loop():
+            while True:
+                time.sleep(self.interval_minutes * 60)
+                try:
+                    self.run_once()
+                except Exception as e:
+                    logger.warning(f"Cache maintenance failed: {e}")
+
+        self._thread = threading.Thread(target=loop, name='ip-screener-cache-maintenance', daemon=True)
+        self._thread.start()
+
+    def run_once(self) -> Dict[str, Any]:
+        """Run one maintenance pass and return what it did"""
+        with self._run_lock:
+            stats = {'skipped': False, 'swept': 0, 'evicted': 0, 'refreshed': 0, 'refresh_failed': 0}
+            started = time.monotonic()
+
+            hits = self.cache.take_hits()
+            backend = self.cache.backend
+
+            with backend.maintenance_lock() as acquired:
+                if not acquired:
+                    # Keep the counts until this worker gets the lock
+                    self.cache.restore_hits(hits)
+                    stats['skipped'] = True
+                    self.last_run = stats
+                    return stats
+
+                self.view_counts.update(hits)
+                backend.touch(hits)
+                stats['swept'] = self.cache.sweep()
+                if self.max_bytes > 0:
+                    stats['evicted'] = backend.evict_lru(self.max_bytes)
+                if self.refresh_ahead_minutes > 0 and self.refresh_top > 0:
+                    stats['refreshed'], stats['refresh_failed'] = self._refresh_ahead()
+                stats['entries'], stats['bytes'] = backend.usage()
+
+            stats['duration_ms'] = int((time.monotonic() - started) * 1000)
+            self.last_run = stats
+            logger.info(f"Cache maintenance: {stats}")
+            return stats
+
+    def _refresh_ahead(self):
+        """Re-query popular entries that expire within the refresh window"""
+        candidates = self.cache.backend.refresh_candidates(
+            ttl_seconds=self.cache.ttl_hours * 3600,
+            window_seconds=self.refresh_ahead_minutes * 60,
+            limit=self.refresh_top,
+            hits=self.view_counts,
+            min_hits=self.refresh_min_hits
+        )
+
+        refreshed = failed = 0
+        for candidate in candidates:
+            result = self.service.analyze_component(
+                component_name=candidate['title'],
+                component_description=candidate['summary'],
+                reference=candidate['reference'],
+                force_refresh=True
+            )
+            if result.get('success') and not result.get('from_cache'):
+                refreshed += 1
+                # The new entry starts a fresh popularity window
+                self.view_counts.pop(candidate['key'], None)
+            else:
+                failed += 1
+        return refreshed, failed
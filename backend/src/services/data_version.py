@@ -0,0 +1,46 @@
+from typing import Dict, Iterable, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Tables maintained by the catalogue_versions triggers (migration 005)
+CATALOGUE_TABLES = (
+    'categories', 'suppliers', 'components', 'supply_chain_relationships',
+    'vehicle_manufacturers', 'vehicle_models', 'component_compatibility'
+)
+
+_warned_missing = False
+
+def table_versions(conn, tables: Iterable[str] = CATALOGUE_TABLES) -> Optional[Dict[str, int]]:
+    """
+    Change counter per table. Returns None when version tracking is not
+    installed, in which case callers should not cache.
+    """
+    try:
+        rows = conn.execute(text("""
+            SELECT table_name, version FROM catalogue_versions
+            WHERE table_name = ANY(:tables)
+            ORDER BY table_name
+        """), {'tables': list(tables)}).fetchall()
+    except ProgrammingError:
+        global _warned_missing
+        conn.rollback()
+        if not _warned_missing:
+            logger.warning("catalogue_versions missing; run backend/migrate.py to enable snapshot caching")
+            _warned_missing = True
+        return None
+
+    if not rows:
+        return None
+    return {row.table_name: row.version for row in rows}
+
+def version_token(versions: Optional[Dict[str, int]]) -> Optional[str]:
+    if versions is None:
+        return None
+    return ','.join(f"{table}:{versions[table]}" for table in sorted(versions))
+
+def data_version(conn, tables: Iterable[str] = CATALOGUE_TABLES) -> Optional[str]:
+    """Opaque token that changes whenever any of tables is written, or None without version tracking"""
+    return version_token(table_versions(conn, tables))
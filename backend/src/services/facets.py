@@ -0,0 +1,85 @@
+from typing import Dict, Any, List
+from sqlalchemy import text
+from src.services.statistics import PRICE_BANDS, UNPRICED_BAND, price_band_sql
+import logging
+
+logger = logging.getLogger(__name__)
+
+# facet -> grouping column of the matches CTE, in response order
+FACETS = {
+    'category': 'category_id',
+    'supplier': 'supplier_id',
+    'country': 'country',
+    'price_band': 'price_band',
+}
+
+BAND_ORDER = {label: position for position, label in enumerate([band[0] for band in PRICE_BANDS] + [UNPRICED_BAND])}
+
+def _all(conditions: List[str]) -> str:
+    return ' AND '.join(f"({condition})" for condition in conditions) if conditions else 'true'
+
+def facet_counts(conn, base_conditions: List[str], facet_conditions: Dict[str, List[str]],
+                 params: Dict[str, Any], limit: int = 50) -> Dict[str, Any]:
+    """
+    Total matches and per-facet value counts in one statement. The
+    search (base_conditions) always applies; each facet's counts apply
+    every other facet's filter but not its own, so the values a user can
+    still switch to keep their counts.
+
+    Every facet filter depends only on the supplier, category and price
+    band, so the components scan groups on those first, each group
+    carrying its filter flags; the facet grouping sets then run over a
+    few thousand groups rather than every component.
+    """
+    others = {facet: ' AND '.join(f"{other}_match" for other in FACETS if other != facet) for facet in FACETS}
+    counts = ' '.join(f"WHEN GROUPING({column}) = 0 THEN SUM(count) FILTER (WHERE {others[facet]})"
+                      for facet, column in FACETS.items())
+    query = f"""
+        WITH matches AS (
+            SELECT c.supplier_id, c.category_id, {price_band_sql()} AS price_band,
+                   {', '.join(f"bool_and({_all(facet_conditions.get(facet, []))}) AS {facet}_match" for facet in FACETS)},
+                   COUNT(*) AS count
+            FROM components c
+            JOIN suppliers s ON c.supplier_id = s.id
+            JOIN categories cat ON c.category_id = cat.id
+            WHERE c.is_active = true AND {_all(base_conditions)}
+            GROUP BY 1, 2, 3
+        ), facets AS (
+            SELECT {', '.join(f"GROUPING({column}) = 0 AS by_{facet}" for facet, column in FACETS.items())},
+                   m.category_id, m.supplier_id, s.country, m.price_band,
+                   CASE {counts} ELSE SUM(count) FILTER (WHERE {' AND '.join(f"{facet}_match" for facet in FACETS)}) END AS count
+            FROM matches m
+            JOIN suppliers s ON s.id = m.supplier_id
+            GROUP BY GROUPING SETS ({', '.join(FACETS.values())}, ())
+        )
+        SELECT f.*, cat.name AS category_name, s.name AS supplier_name
+        FROM facets f
+        LEFT JOIN categories cat ON f.by_category AND cat.id = f.category_id
+        LEFT JOIN suppliers s ON f.by_supplier AND s.id = f.supplier_id
+    """
+
+    total = 0
+    values: Dict[str, List[Dict[str, Any]]] = {facet: [] for facet in FACETS}
+    for row in conn.execute(text(query), params):
+        facet = next((facet for facet in FACETS if getattr(row, f"by_{facet}")), None)
+        if facet is None:
+            total = int(row.count or 0)
+        elif row.count:
+            if facet in ('category', 'supplier'):
+                entry = {'id': getattr(row, FACETS[facet]), 'name': getattr(row, f"{facet}_name")}
+            else:
+                entry = {'value': getattr(row, FACETS[facet])}
+            entry['count'] = int(row.count)
+            values[facet].append(entry)
+
+    facets = {}
+    for facet, entries in values.items():
+        # Price bands are a short fixed scale and always listed whole, in order
+        if facet == 'price_band':
+            entries.sort(key=lambda entry: BAND_ORDER.get(entry['value'], len(BAND_ORDER)))
+            shown = len(entries)
+        else:
+            entries.sort(key=lambda entry: (-entry['count'], str(entry.get('name', entry.get('value')))))
+            shown = limit
+        facets[facet] = {'values': entries[:shown], 'more': max(len(entries) - shown, 0)}
+    return {'total': total, 'facets': facets}
@@ -0,0 +1,273 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import numpy as np
+from src.services.graph_layout import force_layout, LAYOUT_SCALE
+from src.services.supply_graph import SupplyGraph, supply_graph_cache, node_names, SUPPLIER, CATEGORY, COMPONENT
+import logging
+
+logger = logging.getLogger(__name__)
+
+GROUPINGS = ('country', 'supplier', 'category')
+
+# Drilling into a cluster shows its members at the next level down
+DRILL_DOWN = {'country': 'supplier', 'supplier': 'component', 'category': 'component'}
+
+# Nodes beyond max_nodes are merged into overflow nodes of this type
+OTHER = 'other'
+
+class UnknownCluster(KeyError):
+    pass
+
+class ClusterIndex:
+    """
+    Cluster membership of every graph node at each level of the hierarchy
+    (country > supplier > component, and category > component) plus the
+    zoomed-out view of each grouping, aggregated once per graph. Component
+    edges are summed into super-node links; nodes that do not belong to a
+    grouping (vehicle models, or suppliers when grouping by category) are
+    left out of its views.
+    """
+
+    def __init__(self, graph: SupplyGraph):
+        self.graph = graph
+        node_count = len(graph)
+        node_type = np.frombuffer(graph.node_type, dtype=np.int8)
+        nodes = np.arange(node_count)
+        self.components = node_type == COMPONENT
+
+        # Cluster ids: graph node index for supplier/category/component, countries index for country
+        self.group_of: Dict[str, np.ndarray] = {}
+        for grouping, own_type, parent in (('supplier', SUPPLIER, graph.supplier_of),
+                                           ('category', CATEGORY, graph.category_of)):
+            group = np.full(node_count, -1, dtype=np.int64)
+            group[node_type == own_type] = nodes[node_type == own_type]
+            parents = np.frombuffer(parent, dtype=np.int32)
+            group[self.components] = parents[self.components]
+            self.group_of[grouping] = group
+        self.group_of['country'] = np.frombuffer(graph.country_of, dtype=np.int32).astype(np.int64)
+        self.group_of['component'] = np.where(self.components, nodes, -1)
+
+        self.edge_source = np.frombuffer(graph.edge_source, dtype=np.int32).astype(np.int64)
+        self.edge_target = np.frombuffer(graph.edge_target, dtype=np.int32).astype(np.int64)
+        strength = np.frombuffer(graph.edge_strength, dtype=np.float64)
+        self.edge_weight = np.where(np.isnan(strength), 1.0, strength)
+
+        self.top_level = {grouping: self.aggregate(grouping) for grouping in GROUPINGS}
+
+    def cluster_id(self, grouping: str, key) -> Optional[int]:
+        """Internal cluster id for an API key (database id, or country name)"""
+        if grouping == 'country':
+            return self.graph.countries.index(key) if key in self.graph.countries else None
+        node = self.graph.node(grouping, key)
+        return node if node is not None and self.group_of[grouping][node] == node else None
+
+    def cluster_key(self, grouping: str, cluster: int):
+        return self.graph.countries[cluster] if grouping == 'country' else self.graph.keys[cluster][1]
+
+    def aggregate(self, grouping: str, focus: Tuple[str, int] = None) -> Dict[str, np.ndarray]:
+        """
+        Super-nodes and summed links for a grouping. With focus=(grouping,
+        cluster), that cluster is replaced by its members one level down
+        and only clusters linked to them are kept. Nodes are encoded as
+        cluster * 2 + (1 if inside the focus cluster else 0).
+        """
+        groups = self.group_of[grouping]
+        codes = np.where(groups >= 0, groups * 2, -1)
+        if focus is not None:
+            inside = self.group_of[focus[0]] == focus[1]
+            inner = self.group_of[DRILL_DOWN[focus[0]]][inside]
+            codes[inside] = np.where(inner >= 0, inner * 2 + 1, -1)
+
+        source, target = codes[self.edge_source], codes[self.edge_target]
+        keep = (source >= 0) & (target >= 0) & (source != target)
+        if focus is not None:
+            keep &= ((source & 1) | (target & 1)).astype(bool)
+        width = max(int(codes.max()) + 1, 1) if len(codes) else 1
+        pairs, inverse = np.unique(source[keep] * width + target[keep], return_inverse=True)
+
+        member_codes = codes[self.components]
+        member_codes = member_codes[member_codes >= 0]
+        sizes = np.bincount(member_codes, minlength=width)
+        shown = np.flatnonzero(sizes) if focus is None else member_codes[(member_codes & 1).astype(bool)]
+        # Linked clusters without active components (e.g. a supplier of nothing) still show
+        node_codes = np.union1d(shown, np.concatenate((pairs // width, pairs % width)))
+
+        return {
+            'codes': node_codes,
+            'sizes': sizes[node_codes],
+            'link_source': pairs // width,
+            'link_target': pairs % width,
+            'link_weight': np.bincount(inverse, weights=self.edge_weight[keep], minlength=len(pairs)),
+            'link_count': np.bincount(inverse, minlength=len(pairs)),
+        }
+
+def _bound(view: Dict[str, np.ndarray], max_nodes: int) -> Dict[str, Any]:
+    """
+    Keep the largest nodes (by component count, then linked weight) and
+    merge the overflow into one OTHER node per side, so totals are kept.
+    In drill-in views members get the budget first, but at least a quarter
+    of it is left for the surrounding clusters when there are any.
+    """
+    codes, sizes = view['codes'], view['sizes']
+    position = np.searchsorted(codes, view['link_source']), np.searchsorted(codes, view['link_target'])
+    linked = np.bincount(position[0], weights=view['link_weight'], minlength=len(codes)) + \
+        np.bincount(position[1], weights=view['link_weight'], minlength=len(codes))
+    inside = (codes & 1).astype(bool)
+
+    ranked = {side: np.flatnonzero(inside == side) for side in (True, False)}
+    for side, nodes in ranked.items():
+        ranked[side] = nodes[np.lexsort((codes[nodes], -linked[nodes], -sizes[nodes]))]
+    budget = {side: len(nodes) for side, nodes in ranked.items()}
+    if len(codes) > max_nodes:
+        slots = max_nodes - sum(1 for nodes in ranked.values() if len(nodes))
+        budget[False] = min(budget[False], max(slots // 4, slots - budget[True]))
+        budget[True] = min(budget[True], slots - budget[False])
+        budget[False] = min(len(ranked[False]), slots - budget[True])
+
+    kept = np.concatenate([ranked[side][:budget[side]] for side in (True, False)])
+    slot = np.empty(len(codes), dtype=np.int64)
+    slot[kept] = np.arange(len(kept))
+    others = []
+    for side in (True, False):
+        overflow = ranked[side][budget[side]:]
+        if len(overflow):
+            slot[overflow] = len(kept) + len(others)
+            others.append({'inside': side, 'members': len(overflow), 'size': int(sizes[overflow].sum())})
+
+    source, target = slot[position[0]], slot[position[1]]
+    keep = source != target
+    width = len(kept) + len(others)
+    pairs, inverse = np.unique(source[keep] * width + target[keep], return_inverse=True)
+    return {
+        'codes': codes[kept],
+        'sizes': sizes[kept],
+        'others': others,
+        'link_source': pairs // width,
+        'link_target': pairs % width,
+        'link_weight': np.bincount(inverse, weights=view['link_weight'][keep], minlength=len(pairs)),
+        'link_count': np.bincount(inverse, weights=view['link_count'][keep], minlength=len(pairs)),
+    }
+
+class ClusterService:
+    """
+    Level-of-detail views of the supply graph. The cluster index is rebuilt
+    when the shared supply graph changes; bounded payloads for each
+    (grouping, drilled cluster, max_nodes) are cached in a small LRU that is
+    cleared with it.
+    """
+
+    def __init__(self, graph_cache=None, max_entries: int = None):
+        self.graph_cache = graph_cache or supply_graph_cache
+        self.max_entries = max_entries or int(os.getenv('GRAPH_CLUSTER_CACHE_ENTRIES', '128'))
+        self._views: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._views_index: Optional[ClusterIndex] = None
+        self._lock = threading.Lock()
+
+    def get_index(self, engine) -> ClusterIndex:
+        return self.graph_cache.derived(engine, 'clusters', self._build)
+
+    def _build(self, graph: SupplyGraph, previous: Optional[ClusterIndex]) -> ClusterIndex:
+        index = ClusterIndex(graph)
+        logger.info("Cluster index built: " + ', '.join(
+            f"{len(view['codes'])} {grouping} clusters" for grouping, view in index.top_level.items()))
+        return index
+
+    def get_view(self, engine, grouping: str, cluster=None, max_nodes: int = 100) -> Dict[str, Any]:
+        """
+        Bounded graph of grouping super-nodes, optionally with one cluster
+        expanded into its members. Raises UnknownCluster if cluster does
+        not exist at that grouping.
+        """
+        index = self.get_index(engine)
+        key = (grouping, cluster, max_nodes)
+        with self._lock:
+            # Views of an older index can never hit again
+            if self._views_index is not index:
+                self._views.clear()
+                self._views_index = index
+            payload = self._views.get(key)
+            if payload is not None:
+                self._views.move_to_end(key)
+                return payload
+
+        focus = None
+        if cluster is not None:
+            cluster_id = index.cluster_id(grouping, cluster)
+            if cluster_id is None:
+                raise UnknownCluster(f"{grouping} {cluster}")
+            focus = (grouping, cluster_id)
+        view = index.top_level[grouping] if focus is None else index.aggregate(grouping, focus)
+        payload = self._payload(engine, index, grouping, cluster, _bound(view, max_nodes), view)
+
+        with self._lock:
+            if self._views_index is index:
+                self._views[key] = payload
+                while len(self._views) > self.max_entries:
+                    self._views.popitem(last=False)
+        return payload
+
+    def _payload(self, engine, index: ClusterIndex, grouping: str, cluster, bounded: Dict[str, Any],
+                 view: Dict[str, np.ndarray]) -> Dict[str, Any]:
+        inner_grouping = DRILL_DOWN[grouping] if cluster is not None else grouping
+        described = []
+        for code, size in zip(bounded['codes'].tolist(), bounded['sizes'].tolist()):
+            node_grouping = inner_grouping if code & 1 else grouping
+            described.append((node_grouping, index.cluster_key(node_grouping, code >> 1), size, bool(code & 1)))
+
+        keys = {(g, k) for g, k, _, _ in described if g != 'country'}
+        with engine.connect() as conn:
+            names = node_names(conn, keys) if keys else {}
+
+        nodes = []
+        for node_grouping, key, size, inside in described:
+            nodes.append({
+                'id': f"{node_grouping}_{key}",
+                'name': key if node_grouping == 'country' else names.get((node_grouping, key)),
+                'type': node_grouping,
+                'group': node_grouping,
+                'cluster_key': key,
+                'size': size,
+                'drillable': node_grouping in DRILL_DOWN,
+                'focus': inside,
+            })
+        for other in bounded['others']:
+            other_grouping = inner_grouping if other['inside'] else grouping
+            nodes.append({
+                'id': f"{OTHER}_{other_grouping}",
+                'name': f"{other['members']} more",
+                'type': OTHER,
+                'group': OTHER,
+                'size': other['size'],
+                'members': other['members'],
+                'drillable': False,
+                'focus': other['inside'],
+            })
+
+        links = [{
+            'source': nodes[source]['id'],
+            'target': nodes[target]['id'],
+            'value': round(weight, 3),
+            'count': int(count),
+        } for source, target, weight, count in zip(bounded['link_source'].tolist(), bounded['link_target'].tolist(),
+                                                   bounded['link_weight'].tolist(), bounded['link_count'].tolist())]
+
+        if nodes:
+            positions = force_layout(len(nodes), bounded['link_source'], bounded['link_target'],
+                                     np.log1p(bounded['link_weight'])) * LAYOUT_SCALE
+            for node, (x, y) in zip(nodes, positions.tolist()):
+                node['x'], node['y'] = round(x, 1), round(y, 1)
+
+        return {
+            'nodes': nodes,
+            'links': links,
+            'level': {
+                'by': grouping,
+                'cluster': cluster,
+                'members': inner_grouping if cluster is not None else None,
+                'total_nodes': int(len(view['codes'])),
+                'truncated': bool(bounded['others']),
+            },
+            'data_version': index.graph.version,
+        }
@@ -0,0 +1,359 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import text
+from src.services.data_version import data_version
+from src.services.supply_graph import node_names
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Output coordinates use this many units per natural edge length
+LAYOUT_SCALE = 30.0
+
+# Stop coarsening once a level has this few nodes or shrinks by less than 10%
+COARSEST_NODES = 64
+
+# Finest repulsion grid cells span about this many node radii (sqrt of mass)
+NEAR_FIELD_RADII = 2.0
+
+# Depth limit of the repulsion grid pyramid (finest level is 2^depth cells wide)
+MAX_GRID_DEPTH = 9
+
+def _coarsen(node_count: int, sources: np.ndarray, targets: np.ndarray,
+             weights: np.ndarray) -> Tuple[np.ndarray, int]:
+    """
+    Heavy-edge matching: pairs each node with its heaviest unmatched
+    neighbour, then folds leftover degree-one nodes into their neighbour so
+    stars collapse in one level. Returns the fine -> coarse mapping.
+    """
+    mapping = np.full(node_count, -1, dtype=np.int64)
+    coarse = 0
+    for edge in np.argsort(-weights, kind='stable'):
+        a, b = int(sources[edge]), int(targets[edge])
+        if a != b and mapping[a] < 0 and mapping[b] < 0:
+            mapping[a] = mapping[b] = coarse
+            coarse += 1
+
+    degree = np.bincount(sources, minlength=node_count) + np.bincount(targets, minlength=node_count)
+    for a, b in zip(sources.tolist(), targets.tolist()):
+        if mapping[a] < 0 and degree[a] == 1 and mapping[b] >= 0:
+            mapping[a] = mapping[b]
+        elif mapping[b] < 0 and degree[b] == 1 and mapping[a] >= 0:
+            mapping[b] = mapping[a]
+
+    unmatched = np.flatnonzero(mapping < 0)
+    mapping[unmatched] = np.arange(coarse, coarse + len(unmatched))
+    return mapping, coarse + len(unmatched)
+
+def _collapse_edges(mapping: np.ndarray, coarse_count: int, sources: np.ndarray, targets: np.ndarray,
+                    weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Edges between coarse nodes; parallel edges are merged by summing weights"""
+    s, t = mapping[sources], mapping[targets]
+    keep = s != t
+    low, high = np.minimum(s[keep], t[keep]), np.maximum(s[keep], t[keep])
+    pair, inverse = np.unique(low * coarse_count + high, return_inverse=True)
+    merged = np.bincount(inverse, weights=weights[keep], minlength=len(pair))
+    return pair // coarse_count, pair % coarse_count, merged
+
+def _neighbour_pairs(cells: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Ordered pairs (i, j), i != j, of nodes in the same or adjacent grid cells"""
+    width = int(cells[:, 1].max()) + 3
+    cell_ids = (cells[:, 0] + 1) * width + cells[:, 1] + 1
+    order = np.argsort(cell_ids, kind='stable')
+    unique_ids, starts, counts = np.unique(cell_ids[order], return_index=True, return_counts=True)
+
+    firsts, seconds = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbour = cell_ids + dx * width + dy
+            slot = np.searchsorted(unique_ids, neighbour)
+            slot[slot == len(unique_ids)] = 0
+            found = unique_ids[slot] == neighbour
+            nodes = np.flatnonzero(found)
+            slot = slot[found]
+            partner_counts = counts[slot]
+            total = int(partner_counts.sum())
+            if not total:
+                continue
+            offsets = np.arange(total) - np.repeat(np.cumsum(partner_counts) - partner_counts, partner_counts)
+            firsts.append(np.repeat(nodes, partner_counts))
+            seconds.append(order[np.repeat(starts[slot], partner_counts) + offsets])
+
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    keep = first != second
+    return first[keep], second[keep]
+
+def _repulsion(positions: np.ndarray, mass: np.ndarray) -> np.ndarray:
+    """
+    Mass-weighted 1/d repulsion on every node from every other node,
+    approximated on a pyramid of square grids: nodes in adjacent cells of
+    the finest grid interact exactly, and at each coarser level a node sees
+    the cells that are children of its parent's neighbours but not its own
+    neighbours through their mass centroid. Every other node is counted
+    exactly once, in about O(n log n).
+    """
+    count = len(positions)
+    low = positions.min(axis=0)
+    side = float((positions.max(axis=0) - low).max()) * 1.001 + 1e-6
+    cell = NEAR_FIELD_RADII * np.sqrt(np.median(mass))
+    depth = int(np.clip(np.ceil(np.log2(max(side / cell, 2))), 1, MAX_GRID_DEPTH))
+    cells = np.minimum(((positions - low) * ((1 << depth) / side)).astype(np.int64), (1 << depth) - 1)
+
+    force = np.zeros_like(positions)
+    window = np.arange(6)
+    for level in range(2, depth + 1):
+        size = 1 << level
+        own = cells >> (depth - level)
+        keys = own[:, 0] * size + own[:, 1]
+        cell_mass = np.bincount(keys, weights=mass, minlength=size * size)
+        occupied = np.maximum(cell_mass, 1e-12)
+        centre_x = np.bincount(keys, weights=mass * positions[:, 0], minlength=size * size) / occupied
+        centre_y = np.bincount(keys, weights=mass * positions[:, 1], minlength=size * size) / occupied
+
+        # The 6x6 children of the parent's 3x3 neighbourhood, minus the node's own 3x3
+        first = (own >> 1) * 2 - 2
+        xs = (first[:, 0, None] + window)[:, :, None]
+        ys = (first[:, 1, None] + window)[:, None, :]
+        valid = (xs >= 0) & (xs < size) & (ys >= 0) & (ys < size) & \
+                ((np.abs(xs - own[:, 0, None, None]) > 1) | (np.abs(ys - own[:, 1, None, None]) > 1))
+        nodes, a, b = np.nonzero(valid)
+        index = xs[nodes, a, 0] * size + ys[nodes, 0, b]
+        occupied_cells = cell_mass[index] > 0
+        nodes, index = nodes[occupied_cells], index[occupied_cells]
+        dx = positions[nodes, 0] - centre_x[index]
+        dy = positions[nodes, 1] - centre_y[index]
+        weight = cell_mass[index] / np.maximum(dx * dx + dy * dy, 1e-4)
+        force[:, 0] += np.bincount(nodes, weights=dx * weight, minlength=count)
+        force[:, 1] += np.bincount(nodes, weights=dy * weight, minlength=count)
+
+    first, second = _neighbour_pairs(cells)
+    if len(first):
+        delta = positions[first] - positions[second]
+        push = delta * (mass[second] / np.maximum(np.einsum('ij,ij->i', delta, delta), 1e-4))[:, None]
+        for axis in range(2):
+            force[:, axis] += np.bincount(first, weights=push[:, axis], minlength=count)
+    return force
+
+def _refine(positions: np.ndarray, mass: np.ndarray, sources: np.ndarray, targets: np.ndarray,
+            weights: np.ndarray, iterations: int, temperature: float) -> np.ndarray:
+    """
+    Fruchterman-Reingold with unit natural length. Repulsion is mass-weighted
+    so coarse nodes claim room for the nodes they stand for; a pull towards
+    the origin packs disconnected pieces together.
+    """
+    count = len(positions)
+    gravity = 1.0
+    for step in range(iterations):
+        displacement = _repulsion(positions, mass) - gravity * positions
+
+        if len(sources):
+            delta = positions[sources] - positions[targets]
+            pull = delta * (np.sqrt(np.einsum('ij,ij->i', delta, delta)) * weights)[:, None]
+            for axis in range(2):
+                force = np.bincount(targets, weights=pull[:, axis], minlength=count) - \
+                        np.bincount(sources, weights=pull[:, axis], minlength=count)
+                displacement[:, axis] += force / mass
+
+        # Cap each move at the current temperature, cooling linearly
+        limit = temperature * (1 - step / iterations) + 1e-3
+        length = np.sqrt(np.einsum('ij,ij->i', displacement, displacement))
+        positions += displacement * (np.minimum(length, limit) / np.maximum(length, 1e-9))[:, None]
+    return positions
+
+def force_layout(node_count: int, sources, targets, weights=None, iterations: int = 60,
+                 seed: int = 0) -> np.ndarray:
+    """
+    Multilevel force-directed layout. The graph is coarsened by heavy-edge
+    matching, the coarsest level is laid out from a seeded random start,
+    and each finer level starts from its parent's position and is refined
+    with a third of the iterations. Returns an (n, 2) array; same input, same layout.
+    """
+    rng = np.random.default_rng(seed)
+    if node_count == 0:
+        return np.zeros((0, 2))
+
+    sources = np.asarray(sources, dtype=np.int64)
+    targets = np.asarray(targets, dtype=np.int64)
+    weights = np.ones(len(sources)) if weights is None else np.asarray(weights, dtype=np.float64)
+    keep = sources != targets
+    sources, targets, weights = sources[keep], targets[keep], weights[keep]
+
+    levels = [(node_count, sources, targets, weights, np.ones(node_count), None)]
+    while levels[-1][0] > COARSEST_NODES:
+        count, s, t, w, mass, _ = levels[-1]
+        mapping, coarse_count = _coarsen(count, s, t, w)
+        if coarse_count > 0.9 * count:
+            break
+        coarse_mass = np.bincount(mapping, weights=mass, minlength=coarse_count)
+        levels[-1] = levels[-1][:5] + (mapping,)
+        levels.append((coarse_count, *_collapse_edges(mapping, coarse_count, s, t, w), coarse_mass, None))
+
+    count, s, t, w, mass, _ = levels[-1]
+    spread = np.sqrt(node_count)
+    positions = rng.uniform(-spread, spread, size=(count, 2))
+    positions = _refine(positions, mass, s, t, w, iterations, spread / 2)
+
+    parent_mass = mass
+    for count, s, t, w, mass, mapping in reversed(levels[:-1]):
+        # Children start scattered over the disc their parent stood for
+        scatter = 0.5 * np.sqrt(parent_mass[mapping])
+        positions = positions[mapping] + rng.normal(size=(count, 2)) * scatter[:, None]
+        positions = _refine(positions, mass, s, t, w, max(iterations // 3, 10), spread / 10)
+        parent_mass = mass
+
+    return positions - positions.mean(axis=0)
+
+class GraphLayoutService:
+    """
+    Force-graph payloads with precomputed node coordinates. Each payload is
+    cached per (data version, filter set) in a small LRU, so a repeat view
+    costs one catalogue_versions read; any catalogue write changes the
+    version and the next request lays the graph out again.
+    """
+
+    def __init__(self, max_entries: int = None, iterations: int = None):
+        self.max_entries = max_entries or int(os.getenv('GRAPH_LAYOUT_CACHE_ENTRIES', '32'))
+        self.iterations = iterations or int(os.getenv('GRAPH_LAYOUT_ITERATIONS', '60'))
+        self._entries: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        # (version, filters) -> lock held while that payload is built
+        self._build_locks: Dict[tuple, threading.Lock] = {}
+
+    def get_graph(self, engine, category: str = '', supplier: str = '', max_nodes: int = 100) -> Dict[str, Any]:
+        filters = (category.lower(), supplier.lower(), max_nodes)
+        with engine.connect() as conn:
+            version = data_version(conn)
+            if version is None:
+                return self._build(conn, category, supplier, max_nodes, version)
+
+        key = (version,) + filters
+        payload = self._lookup(key)
+        if payload is not None:
+            return payload
+
+        # Layouts are expensive: build each (version, filters) payload once and let concurrent
+        # requests for it wait, without holding a connection, while other keys build in parallel
+        with self._lock:
+            lock = self._build_locks.setdefault(key, threading.Lock())
+        with lock:
+            payload = self._lookup(key)
+            if payload is not None:
+                return payload
+            try:
+                with engine.connect() as conn:
+                    payload = self._build(conn, category, supplier, max_nodes, version)
+                self._store(key, payload)
+            finally:
+                with self._lock:
+                    self._build_locks.pop(key, None)
+        return payload
+
+    def _store(self, key: tuple, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            # Entries for older versions can never hit again
+            for stale in [k for k in self._entries if k[0] != key[0]]:
+                del self._entries[stale]
+            self._entries[key] = payload
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+            return payload
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _build(self, conn, category: str, supplier: str, max_nodes: int, version: Optional[str]) -> Dict[str, Any]:
+        query = """
+            SELECT c.id, c.part_name, c.part_number, s.name AS supplier_name,
+                   cat.name AS category_name, c.price_min, c.price_max
+            FROM components c
+            JOIN suppliers s ON c.supplier_id = s.id
+            JOIN categories cat ON c.category_id = cat.id
+            WHERE c.is_active = true
+        """
+        params: Dict[str, Any] = {'limit': max_nodes}
+        if category:
+            query += " AND cat.name ILIKE :category"
+            params['category'] = f"%{category}%"
+        if supplier:
+            query += " AND s.name ILIKE :supplier"
+            params['supplier'] = f"%{supplier}%"
+        query += " ORDER BY c.part_name LIMIT :limit"
+        components = conn.execute(text(query), params).fetchall()
+
+        relationships = []
+        if components:
+            relationships = conn.execute(text("""
+                SELECT source_type, source_id, target_type, target_id,
+                       relationship_type, relationship_strength
+                FROM supply_chain_relationships
+                WHERE (source_type = 'component' AND source_id = ANY(:ids))
+                   OR (target_type = 'component' AND target_id = ANY(:ids))
+            """), {'ids': [c.id for c in components]}).fetchall()
+
+        nodes: List[Dict[str, Any]] = []
+        node_map: Dict[str, int] = {}
+        for comp in components:
+            node_id = f"component_{comp.id}"
+            node_map[node_id] = len(nodes)
+            nodes.append({
+                'id': node_id,
+                'name': comp.part_name,
+                'type': 'component',
+                'group': 'component',
+                'supplier': comp.supplier_name,
+                'category': comp.category_name,
+                'part_number': comp.part_number,
+                'price_range': f"€{comp.price_min}-{comp.price_max}" if comp.price_min else None
+            })
+
+        # Suppliers and categories that feed the selected components
+        sources = {(rel.source_type, rel.source_id) for rel in relationships
+                   if rel.source_type in ('supplier', 'category')}
+        names = node_names(conn, sources) if sources else {}
+        for node_type, entity_id in sorted(sources):
+            if (node_type, entity_id) in names:
+                node_id = f"{node_type}_{entity_id}"
+                node_map[node_id] = len(nodes)
+                nodes.append({'id': node_id, 'name': names[(node_type, entity_id)],
+                              'type': node_type, 'group': node_type})
+
+        links, edge_sources, edge_targets, edge_weights = [], [], [], []
+        for rel in relationships:
+            source_id = f"{rel.source_type}_{rel.source_id}"
+            target_id = f"{rel.target_type}_{rel.target_id}"
+            if source_id in node_map and target_id in node_map:
+                value = float(rel.relationship_strength) if rel.relationship_strength is not None else 1.0
+                links.append({'source': source_id, 'target': target_id, 'value': value,
+                              'type': rel.relationship_type})
+                edge_sources.append(node_map[source_id])
+                edge_targets.append(node_map[target_id])
+                edge_weights.append(value)
+
+        started = time.perf_counter()
+        positions = force_layout(len(nodes), edge_sources, edge_targets, edge_weights,
+                                 iterations=self.iterations) * LAYOUT_SCALE
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for node, (x, y) in zip(nodes, positions.tolist()):
+            node['x'], node['y'] = round(x, 1), round(y, 1)
+
+        logger.info(f"Graph layout computed for {len(nodes)} nodes, {len(links)} links in {elapsed_ms:.0f} ms")
+        return {
+            'nodes': nodes,
+            'links': links,
+            'layout': {
+                'algorithm': 'multilevel_force_directed',
+                'computed_ms': round(elapsed_ms, 1),
+                'data_version': version,
+            },
+        }
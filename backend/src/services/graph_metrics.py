@@ -0,0 +1,295 @@
+import csv
+import io
+import os
+import threading
+import time
+from typing import Dict, Any, Optional
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from src.services.data_version import data_version
+from src.services.supply_graph import (
+    SupplyGraph, supply_graph_cache, SUPPLIER, CATEGORY, COMPONENT, CATALOGUE_SUPPLIER
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key reserved for the metrics job
+GRAPH_METRICS_LOCK_KEY = 0x1F5C0045
+
+# Relationship types through which a supplier sources a component
+SOURCING_TYPES = (CATALOGUE_SUPPLIER, 'supplies', 'second_source')
+# Component links naming a drop-in replacement; the replacement's suppliers count as sources too
+ALTERNATIVE_TYPES = ('alternative',)
+
+METRIC_COLUMNS = (
+    'node_type', 'node_id', 'degree_in', 'degree_out', 'degree', 'betweenness',
+    'component_count', 'supplier_count', 'country_count', 'single_source', 'single_country',
+    'sole_source_components', 'hhi', 'top_supplier_id', 'top_supplier_share'
+)
+
+def _csr(node_count: int, sources: np.ndarray, targets: np.ndarray):
+    """Offsets and neighbour array of the adjacency lists sources -> targets"""
+    order = np.argsort(sources, kind='stable')
+    offsets = np.zeros(node_count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=node_count), out=offsets[1:])
+    return offsets, targets[order]
+
+def _expand(frontier: np.ndarray, offsets: np.ndarray, neighbours: np.ndarray):
+    """All (node, neighbour) pairs leaving the frontier"""
+    starts = offsets[frontier]
+    counts = offsets[frontier + 1] - starts
+    total = int(counts.sum())
+    ends = np.cumsum(counts)
+    index = np.arange(total) - np.repeat(ends - counts, counts) + np.repeat(starts, counts)
+    return np.repeat(frontier, counts), neighbours[index]
+
+def sampled_betweenness(node_count: int, sources: np.ndarray, targets: np.ndarray,
+                        pivots: int = 64, seed: int = 0) -> np.ndarray:
+    """
+    Betweenness centrality on the undirected graph, estimated from
+    shortest-path dependencies of a seeded sample of source nodes
+    (Brandes with pivot sampling). Each BFS runs level by level on whole
+    frontiers. Normalised to [0, 1] like networkx.
+    """
+    scores = np.zeros(node_count)
+    if node_count < 3 or not len(sources):
+        return scores
+    # Parallel and reciprocal edges would multiply path counts; keep one undirected edge per pair
+    low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+    pairs = np.unique(low[low != high] * node_count + high[low != high])
+    low, high = pairs // node_count, pairs % node_count
+    offsets, neighbours = _csr(node_count, np.concatenate((low, high)), np.concatenate((high, low)))
+    rng = np.random.default_rng(seed)
+    sample = rng.choice(node_count, size=min(pivots, node_count), replace=False)
+
+    for pivot in sample:
+        distance = np.full(node_count, -1, dtype=np.int64)
+        sigma = np.zeros(node_count)
+        distance[pivot], sigma[pivot] = 0, 1.0
+        frontier = np.array([pivot])
+        levels = []
+        depth = 0
+        while len(frontier):
+            parent, child = _expand(frontier, offsets, neighbours)
+            unseen = distance[child] < 0
+            distance[child[unseen]] = depth + 1
+            on_path = distance[child] == depth + 1
+            parent, child = parent[on_path], child[on_path]
+            sigma += np.bincount(child, weights=sigma[parent], minlength=node_count)
+            levels.append((parent, child))
+            frontier = np.unique(child)
+            depth += 1
+
+        delta = np.zeros(node_count)
+        for parent, child in reversed(levels):
+            delta += np.bincount(parent, weights=sigma[parent] / sigma[child] * (1 + delta[child]),
+                                 minlength=node_count)
+        delta[pivot] = 0
+        scores += delta
+
+    # Scale the sample up to all sources; undirected pairs are counted from both ends
+    scores *= node_count / len(sample) / ((node_count - 1) * (node_count - 2))
+    return scores
+
+class GraphMetrics:
+    """
+    Network metrics for one SupplyGraph, computed with whole-array
+    operations: degrees, sampled betweenness, the suppliers and supplier
+    countries each component can be sourced from (directly or through an
+    alternative part), and supplier concentration (HHI over catalogue
+    component counts) per category.
+    """
+
+    def __init__(self, graph: SupplyGraph, pivots: int = 64):
+        self.graph = graph
+        node_count = len(graph)
+        node_type = np.frombuffer(graph.node_type, dtype=np.int8)
+        sources = np.frombuffer(graph.edge_source, dtype=np.int32).astype(np.int64)
+        targets = np.frombuffer(graph.edge_target, dtype=np.int32).astype(np.int64)
+        edge_type = np.frombuffer(graph.edge_type, dtype=np.int16)
+
+        self.degree_out = np.bincount(sources, minlength=node_count)
+        self.degree_in = np.bincount(targets, minlength=node_count)
+        self.betweenness = sampled_betweenness(node_count, sources, targets, pivots)
+
+        def of_types(types):
+            wanted = [graph.relationship_types.index(t) for t in types if t in graph.relationship_types]
+            return np.isin(edge_type, wanted)
+
+        # (component, supplier) sourcing pairs, then the same through alternative parts
+        direct = of_types(SOURCING_TYPES) & (node_type[sources] == SUPPLIER) & (node_type[targets] == COMPONENT)
+        component, supplier = targets[direct], sources[direct]
+        alternative = of_types(ALTERNATIVE_TYPES) & (node_type[sources] == COMPONENT) & \
+            (node_type[targets] == COMPONENT)
+        offsets, suppliers_by_component = _csr(node_count, component, supplier)
+        for this, other in ((sources[alternative], targets[alternative]),
+                            (targets[alternative], sources[alternative])):
+            _, replacement_supplier = _expand(other, offsets, suppliers_by_component)
+            component = np.concatenate((component, np.repeat(this, offsets[other + 1] - offsets[other])))
+            supplier = np.concatenate((supplier, replacement_supplier))
+
+        pairs = np.unique(component * node_count + supplier)
+        pair_component, pair_supplier = pairs // node_count, pairs % node_count
+        self.supplier_count = np.bincount(pair_component, minlength=node_count)
+        sole = self.supplier_count[pair_component] == 1
+        self.sole_source_components = np.bincount(pair_supplier[sole], minlength=node_count)
+
+        country_of = np.frombuffer(graph.country_of, dtype=np.int32).astype(np.int64)
+        known = country_of[pair_supplier] >= 0
+        country_count = max(len(graph.countries), 1)
+        country_pairs = np.unique(pair_component[known] * country_count + country_of[pair_supplier[known]])
+        self.country_count = np.bincount(country_pairs // country_count, minlength=node_count)
+
+        # Catalogue shares per (category, supplier)
+        components = np.flatnonzero(node_type == COMPONENT)
+        category_of = np.frombuffer(graph.category_of, dtype=np.int32).astype(np.int64)[components]
+        supplier_of = np.frombuffer(graph.supplier_of, dtype=np.int32).astype(np.int64)[components]
+        placed = (category_of >= 0) & (supplier_of >= 0)
+        self.component_count = np.bincount(category_of[placed], minlength=node_count) + \
+            np.bincount(supplier_of[placed], minlength=node_count)
+        share_pairs, share_counts = np.unique(category_of[placed] * node_count + supplier_of[placed],
+                                              return_counts=True)
+        share_category, share_supplier = share_pairs // node_count, share_pairs % node_count
+        totals = np.bincount(category_of[placed], minlength=node_count)
+        shares = share_counts / totals[share_category]
+        self.hhi = np.bincount(share_category, weights=shares ** 2, minlength=node_count)
+        self.category_suppliers = np.bincount(share_category, minlength=node_count)
+        # Largest share per category; ties go to the lower node index
+        order = np.lexsort((share_supplier, -shares, share_category))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = share_category[order][1:] != share_category[order][:-1]
+        self.top_supplier = np.full(node_count, -1, dtype=np.int64)
+        self.top_share = np.zeros(node_count)
+        self.top_supplier[share_category[order][first]] = share_supplier[order][first]
+        self.top_share[share_category[order][first]] = shares[order][first]
+
+    def rows(self):
+        """Row tuples in METRIC_COLUMNS order for suppliers, categories and components"""
+        graph = self.graph
+        for node, (type_name, node_id) in enumerate(graph.keys):
+            node_type = graph.node_type[node]
+            if node_type not in (SUPPLIER, CATEGORY, COMPONENT):
+                continue
+            row = [type_name, node_id, int(self.degree_in[node]), int(self.degree_out[node]),
+                   int(self.degree_in[node] + self.degree_out[node]), float(self.betweenness[node])]
+            if node_type == SUPPLIER:
+                row += [int(self.component_count[node]), None, None, None, None,
+                        int(self.sole_source_components[node]), None, None, None]
+            elif node_type == CATEGORY:
+                top = int(self.top_supplier[node])
+                row += [int(self.component_count[node]), int(self.category_suppliers[node]), None, None, None,
+                        None, float(self.hhi[node]), graph.keys[top][1] if top >= 0 else None,
+                        float(self.top_share[node]) if top >= 0 else None]
+            else:
+                suppliers, countries = int(self.supplier_count[node]), int(self.country_count[node])
+                row += [None, suppliers, countries, suppliers <= 1, countries <= 1, None, None, None, None]
+            yield row
+
+class GraphMetricsService:
+    """
+    Keeps the graph_metrics table in step with the catalogue. A daemon
+    thread checks the data version every few minutes and, when it differs
+    from the last run, recomputes every metric and replaces the table in
+    one transaction, so readers see either the old or the new set. A
+    Postgres advisory lock lets only one worker per database run the job.
+    """
+
+    def __init__(self, graph_cache=None, interval_minutes: int = None, pivots: int = None):
+        self.graph_cache = graph_cache or supply_graph_cache
+        self.interval_minutes = interval_minutes if interval_minutes is not None else \
+            int(os.getenv('GRAPH_METRICS_CHECK_MINUTES', '5'))
+        self.pivots = pivots or int(os.getenv('GRAPH_METRICS_PIVOTS', '64'))
+        self.last_run: Dict[str, Any] = {}
+        self._run_lock = threading.Lock()
+        self._thread = None
+
+    def start(self, app) -> None:
+        """Check for catalogue changes every interval on a daemon thread (no-op when the interval is 0)"""
+        if self.interval_minutes <= 0 or self._thread is not None:
+            return
+
+        def loop():
+            with app.app_context():
+                engine = app.extensions['sqlalchemy'].engine
+            while True:
+                try:
+                    self.refresh(engine)
+                except Exception as e:
+                    logger.warning(f"Graph metrics refresh failed: {e}")
+                time.sleep(self.interval_minutes * 60)
+
+        self._thread = threading.Thread(target=loop, name='graph-metrics', daemon=True)
+        self._thread.start()
+
+    def status(self, conn) -> Dict[str, Any]:
+        """Data version and time of the stored metrics, and whether the catalogue has moved on since"""
+        run = conn.execute(text("""
+            SELECT data_version, rows, duration_ms, computed_at FROM graph_metrics_runs ORDER BY id DESC LIMIT 1
+        """)).first()
+        current = data_version(conn)
+        return {
+            'data_version': run.data_version if run else None,
+            'computed_at': run.computed_at.isoformat() if run else None,
+            'rows': run.rows if run else 0,
+            'duration_ms': run.duration_ms if run else None,
+            'stale': run is None or current is None or run.data_version != current,
+        }
+
+    def refresh(self, engine, force: bool = False) -> Dict[str, Any]:
+        """Recompute metrics if the catalogue changed since the last run (or always with force)"""
+        with self._run_lock, engine.connect() as conn:
+            try:
+                if not force and not self.status(conn)['stale']:
+                    return {'refreshed': False, 'reason': 'up to date'}
+            except ProgrammingError:
+                conn.rollback()
+                logger.warning("graph_metrics missing; run backend/migrate.py to enable graph metrics")
+                return {'refreshed': False, 'reason': 'graph_metrics table missing'}
+
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"),
+                                    {'key': GRAPH_METRICS_LOCK_KEY}).scalar()
+            conn.commit()
+            if not acquired:
+                return {'refreshed': False, 'reason': 'running in another worker'}
+            try:
+                started = time.monotonic()
+                graph = self.graph_cache.get(engine)
+                metrics = GraphMetrics(graph, self.pivots)
+                computed = time.monotonic()
+                rows = self._write(conn, metrics, graph.version, started)
+                stats = {
+                    'refreshed': True,
+                    'data_version': graph.version,
+                    'rows': rows,
+                    'compute_ms': int((computed - started) * 1000),
+                    'write_ms': int((time.monotonic() - computed) * 1000),
+                }
+                self.last_run = stats
+                logger.info(f"Graph metrics refreshed: {stats}")
+                return stats
+            finally:
+                conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': GRAPH_METRICS_LOCK_KEY})
+                conn.commit()
+
+    def _write(self, conn, metrics: GraphMetrics, version: Optional[str], started: float) -> int:
+        """Replace the table contents with COPY inside one transaction"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        rows = 0
+        for row in metrics.rows():
+            writer.writerow(['' if value is None else value for value in row])
+            rows += 1
+        buffer.seek(0)
+
+        conn.execute(text("DELETE FROM graph_metrics"))
+        conn.connection.cursor().copy_expert(
+            f"COPY graph_metrics ({', '.join(METRIC_COLUMNS)}) FROM STDIN WITH (FORMAT csv)", buffer)
+        conn.execute(text("""
+            INSERT INTO graph_metrics_runs (data_version, rows, duration_ms) VALUES (:version, :rows, :ms)
+        """), {'version': version, 'rows': rows, 'ms': int((time.monotonic() - started) * 1000)})
+        conn.commit()
+        conn.execute(text("ANALYZE graph_metrics"))
+        conn.commit()
+        return rows
@@ -0,0 +1,207 @@
+from array import array
+from typing import Dict, Any, Iterable, List, Optional, Sequence, Tuple
+from src.services.supply_graph import (
+    SupplyGraph, supply_graph_cache, strongly_connected,
+    NODE_TYPES, COMPONENT, VEHICLE_MODEL, CATALOGUE_SUPPLIER, FITS
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# How a failure propagates along each relationship type: 'forward' means a
+# failed source affects the target, 'reverse' that a failed target affects
+# the source. Types not listed (compatible, alternative, works_with, ...)
+# describe substitutes or peers and do not propagate.
+DEPENDENCY_DIRECTIONS = {
+    'supplies': 'forward',
+    'second_source': 'forward',
+    CATALOGUE_SUPPLIER: 'forward',
+    'part_of': 'forward',
+    'controls': 'forward',
+    'connects': 'forward',
+    FITS: 'forward',
+    'requires': 'reverse',
+    'controlled_by': 'reverse',
+}
+
+def _merge_intervals(intervals: List[Tuple[int, int]]) -> array:
+    """Sort and coalesce inclusive intervals; returns them flattened as [a0, b0, a1, b1, ...]"""
+    intervals.sort()
+    merged: List[int] = []
+    for low, high in intervals:
+        if merged and low <= merged[-1] + 1:
+            if high > merged[-1]:
+                merged[-1] = high
+        else:
+            merged.extend((low, high))
+    return array('i', merged)
+
+def _pairs(label: Sequence[int]):
+    return zip(label[0::2], label[1::2])
+
+class ImpactIndex:
+    """
+    Downstream reachability over the dependency graph.
+    Cycles are condensed into strongly connected components. A DFS spanning
+    forest of the resulting DAG numbers components in post-order, so every
+    tree subtree is one contiguous range; each component's label is the
+    merged list of post-order intervals it reaches (tree-cover interval
+    labelling). A failure query merges the labels of the failed nodes, and
+    per-type counts come from prefix sums without enumerating the sets.
+    """
+
+    def __init__(self, graph: SupplyGraph, directions: Dict[str, str] = None):
+        self.graph = graph
+        directions = directions or DEPENDENCY_DIRECTIONS
+        node_count = len(graph)
+
+        successors: List[List[int]] = [[] for _ in range(node_count)]
+        for edge in graph.edges_of_types(directions):
+            source, target = graph.edge_source[edge], graph.edge_target[edge]
+            if directions[graph.relationship_types[graph.edge_type[edge]]] == 'reverse':
+                source, target = target, source
+            if source != target:
+                successors[source].append(target)
+
+        self.component, component_count = strongly_connected(successors)
+        dag: List[set] = [set() for _ in range(component_count)]
+        for node in range(node_count):
+            own = self.component[node]
+            for target in successors[node]:
+                if self.component[target] != own:
+                    dag[own].add(self.component[target])
+        del successors
+
+        # Post-order DFS over the condensed DAG; low is the first post number in each subtree
+        post = array('i', [-1]) * component_count
+        low = array('i', [0]) * component_count
+        order = array('i')
+        visited = bytearray(component_count)
+        has_parent = bytearray(component_count)
+        for targets in dag:
+            for target in targets:
+                has_parent[target] = 1
+        roots = [c for c in range(component_count) if not has_parent[c]]
+        for root in roots:
+            visited[root] = 1
+            low[root] = len(order)
+            work = [(root, iter(dag[root]))]
+            while work:
+                current, targets = work[-1]
+                for target in targets:
+                    if not visited[target]:
+                        visited[target] = 1
+                        low[target] = len(order)
+                        work.append((target, iter(dag[target])))
+                        break
+                else:
+                    work.pop()
+                    post[current] = len(order)
+                    order.append(current)
+
+        # Successors always finish first in a DAG, so post-order is a valid reverse topological order
+        self.labels: List[array] = [None] * component_count
+        for position, current in enumerate(order):
+            first = low[current]
+            intervals = [(first, position)]
+            for target in dag[current]:
+                for a, b in _pairs(self.labels[target]):
+                    if a < first or b > position:
+                        intervals.append((a, b))
+            self.labels[current] = _merge_intervals(intervals)
+
+        # Nodes grouped by the post-order position of their component, with per-type prefix counts
+        buckets: List[List[int]] = [[] for _ in range(component_count)]
+        for node in range(node_count):
+            buckets[post[self.component[node]]].append(node)
+        self.position_offsets = array('i', [0])
+        self.position_nodes = array('i')
+        self.prefix = {node_type: array('i', [0]) for node_type in range(len(NODE_TYPES))}
+        for bucket in buckets:
+            self.position_nodes.extend(bucket)
+            self.position_offsets.append(len(self.position_nodes))
+            for node_type, prefix in self.prefix.items():
+                prefix.append(prefix[-1] + sum(1 for n in bucket if graph.node_type[n] == node_type))
+
+        self.component_count = component_count
+        self.label_intervals = sum(len(label) // 2 for label in self.labels)
+
+    def reach(self, nodes: Iterable[int]) -> array:
+        """Merged post-order intervals reachable from nodes (including themselves)"""
+        intervals = []
+        for node in nodes:
+            intervals.extend(_pairs(self.labels[self.component[node]]))
+        return _merge_intervals(intervals)
+
+    def count(self, label: Sequence[int], node_type: int) -> int:
+        prefix = self.prefix[node_type]
+        return sum(prefix[b + 1] - prefix[a] for a, b in _pairs(label))
+
+    def members(self, label: Sequence[int], node_type: int, exclude=frozenset(), limit: int = None):
+        """Nodes of node_type within label, in post-order, skipping exclude"""
+        found = 0
+        for a, b in _pairs(label):
+            for node in self.position_nodes[self.position_offsets[a]:self.position_offsets[b + 1]]:
+                if self.graph.node_type[node] == node_type and node not in exclude:
+                    if limit is not None and found >= limit:
+                        return
+                    found += 1
+                    yield node
+
+class ImpactService:
+    """
+    Supplier and component failure analysis. The reachability index is
+    rebuilt when the shared supply graph changes and is otherwise reused
+    across requests.
+    """
+
+    AFFECTED_TYPES = {'components': COMPONENT, 'vehicle_models': VEHICLE_MODEL}
+
+    def __init__(self, graph_cache=None):
+        self.graph_cache = graph_cache or supply_graph_cache
+
+    def get_index(self, engine) -> ImpactIndex:
+        return self.graph_cache.derived(engine, 'impact', self._build)
+
+    def _build(self, graph: SupplyGraph, previous: Optional[ImpactIndex]) -> ImpactIndex:
+        index = ImpactIndex(graph)
+        logger.info(f"Impact index built: {index.component_count} components, "
+                    f"{index.label_intervals} label intervals")
+        return index
+
+    def analyse(self, engine, failed: List[Tuple[str, int]], limit: int = 1000) -> Dict[str, Any]:
+        """
+        Affected components and vehicle models when every node in failed
+        goes down at once, plus per-node counts. Failed nodes themselves are
+        not counted as affected.
+        """
+        index = self.get_index(engine)
+        graph = index.graph
+
+        known, per_node = [], []
+        for node_type, node_id in failed:
+            node = graph.node(node_type, node_id)
+            entry = {'type': node_type, 'id': node_id, 'found': node is not None}
+            if node is not None:
+                known.append(node)
+                label = index.reach([node])
+                entry['affected'] = {
+                    name: index.count(label, type_id) - (graph.node_type[node] == type_id)
+                    for name, type_id in self.AFFECTED_TYPES.items()
+                }
+            per_node.append(entry)
+
+        excluded = frozenset(known)
+        label = index.reach(known)
+        affected = {}
+        for name, type_id in self.AFFECTED_TYPES.items():
+            total = index.count(label, type_id) - sum(1 for n in excluded if graph.node_type[n] == type_id)
+            ids = [graph.keys[n][1] for n in index.members(label, type_id, excluded, limit)]
+            affected[name] = {'count': total, 'ids': ids, 'truncated': total > len(ids)}
+
+        return {
+            'failed': per_node,
+            'affected': affected,
+            'data_version': graph.version,
+            'graph_built_at': graph.built_at,
+        }
@@ -0,0 +1,672 @@
+import os
+import gzip
+import json
+import shutil
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import create_engine, text
+import logging
+
+try:
+    import fcntl
+except ImportError:  # Windows: maintenance runs without the host-wide lock
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key reserved for cache maintenance
+MAINTENANCE_LOCK_KEY = 0x1F5C0029
+
+# Prefix for in-progress writes; never read as entries
+TEMP_PREFIX = '.tmp-'
+
+# Marker file (file backend) and catalogue_versions row (database backend) bumped by clear()
+GENERATION_MARKER = '.generation'
+GENERATION_ROW = 'ip_screener_cache'
+
+class MemoryLRUCache:
+    """
+    In-process LRU tier bounded by entry count and approximate bytes.
+    Entries keep their cache timestamp so TTL and throttle checks need
+    no file access or JSON decoding.
+    """
+
+    def __init__(self, max_entries: int = 512, max_bytes: int = 32 * 1024 * 1024, ttl_seconds: float = 86400):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.total_bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[float, Dict[str, Any], int]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return (timestamp, result) for a live entry, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            timestamp, result, size = entry
+            if time.time() - timestamp > self.ttl_seconds:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return timestamp, result
+
+    def set(self, key: str, timestamp: float, result: Dict[str, Any], size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (timestamp, result, size)
+            self.total_bytes += size
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.total_bytes -= size
+
+    def _evict(self) -> None:
+        """Drop expired entries first, then least recently used ones, until within bounds"""
+        if len(self._entries) <= self.max_entries and self.total_bytes <= self.max_bytes:
+            return
+        cutoff = time.time() - self.ttl_seconds
+        for key in [k for k, (ts, _, _) in self._entries.items() if ts < cutoff]:
+            self._remove(key)
+        while self._entries and (len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))
+
+class FileCacheBackend:
+    """
+    JSON files under a local directory, shared by the workers on one host.
+    Entries live in hash-prefix shards ({cache_dir}/ab/abcd...json[.gz]) and
+    are written to a temp file then renamed, so readers in other workers
+    never see a partially written entry.
+    """
+
+    name = 'file'
+
+    def __init__(self, cache_dir: str = "/tmp/ip_screener_cache", compress: bool = None, shard_chars: int = 2):
+        self.cache_dir = cache_dir
+        self.compress = compress if compress is not None else \
+            os.getenv('IPS_CACHE_COMPRESS', 'false').lower() == 'true'
+        self.shard_chars = shard_chars
+
+        # Create cache directory
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def read(self, key: str) -> Optional[Tuple[float, Dict[str, Any], int]]:
+        """Return (timestamp, result, payload size) or None"""
+        cache_file = self._existing_path(key)
+
+        if cache_file is None:
+            return None
+
+        try:
+            payload = self._load_bytes(cache_file)
+            cached_data = json.loads(payload)
+            timestamp = datetime.fromisoformat(cached_data['timestamp']).timestamp()
+            return timestamp, cached_data['result'], len(payload)
+
+        except FileNotFoundError:
+            # Replaced or swept between the lookup and the open
+            return None
+        except (OSError, EOFError, json.JSONDecodeError, KeyError, ValueError):
+            # Writes are atomic, so this is real corruption rather than a write in progress
+            self.delete(key)
+            return None
+
+    def write(self, key: str, timestamp: float, result: Dict[str, Any], payload: str,
+              query: Dict[str, str] = None) -> None:
+        cache_file = self._path(key, self.compress)
+        shard_dir = os.path.dirname(cache_file)
+        os.makedirs(shard_dir, exist_ok=True)
+
+        data = payload.encode('utf-8')
+        if self.compress:
+            data = gzip.compress(data, compresslevel=5)
+
+        fd, tmp_path = tempfile.mkstemp(prefix=TEMP_PREFIX, dir=shard_dir)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        # Drop the other encoding so a stale copy can't shadow this one
+        stale = self._path(key, not self.compress)
+        if os.path.exists(stale):
+            self._remove(stale)
+
+    def delete(self, key: str) -> None:
+        for path in self._candidate_paths(key):
+            self._remove(path)
+
+    def clear(self) -> None:
+        if os.path.exists(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(os.path.join(self.cache_dir, GENERATION_MARKER), 'w'):
+            pass
+
+    def generation(self) -> int:
+        """Changes whenever clear() runs in any worker on this host"""
+        try:
+            return os.stat(os.path.join(self.cache_dir, GENERATION_MARKER)).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def sweep(self, ttl_seconds: float) -> int:
+        """Delete files older than the TTL and orphaned temp files; returns the number removed"""
+        cutoff = time.time() - ttl_seconds
+        removed = 0
+        for entry in self._entries(include_temp=True):
+            try:
+                if entry.stat().st_mtime < cutoff or \
+                        (entry.name.startswith(TEMP_PREFIX) and entry.stat().st_mtime < time.time() - 3600):
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def touch(self, hits: Dict[str, int]) -> None:
+        """Record reads as the file access time (mtime still marks when the entry was written)"""
+        now = time.time()
+        for key in hits:
+            cache_file = self._existing_path(key)
+            if cache_file is None:
+                continue
+            try:
+                os.utime(cache_file, (now, os.stat(cache_file).st_mtime))
+            except OSError:
+                continue
+
+    def usage(self) -> Tuple[int, int]:
+        """Return (entry count, total bytes)"""
+        sizes = []
+        for entry in self._entries():
+            try:
+                sizes.append(entry.stat().st_size)
+            except OSError:
+                continue
+        return len(sizes), sum(sizes)
+
+    def evict_lru(self, max_bytes: int) -> int:
+        """Delete least recently read files until the total size fits max_bytes"""
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((max(stat.st_atime, stat.st_mtime), stat.st_size, entry.path))
+
+        entries.sort(reverse=True)
+        kept_bytes = 0
+        removed = 0
+        for _, size, path in entries:
+            kept_bytes += size
+            if kept_bytes > max_bytes:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    continue
+        return removed
+
+    def refresh_candidates(self, ttl_seconds: float, window_seconds: float, limit: int,
+                           hits: Dict[str, int], min_hits: int) -> List[Dict[str, Any]]:
+        """
+        Entries expiring within the window, most viewed first. Files carry no
+        hit counter, so ranking uses the view counts seen by this process.
+        """
+        now = time.time()
+        candidates = []
+        for entry in self._entries():
+            key = entry.name.split('.', 1)[0]
+            if hits.get(key, 0) < min_hits:
+                continue
+            try:
+                expires_at = entry.stat().st_mtime + ttl_seconds
+                if not now < expires_at <= now + window_seconds:
+                    continue
+                query = json.loads(self._load_bytes(entry.path)).get('query')
+            except (OSError, EOFError, json.JSONDecodeError):
+                continue
+            if query:
+                candidates.append({'key': key, 'hits': hits[key], **query})
+
+        candidates.sort(key=lambda c: c['hits'], reverse=True)
+        return candidates[:limit]
+
+    @contextmanager
+    def maintenance_lock(self):
+        """Non-blocking host-wide lock; yields False when another worker is already maintaining"""
+        if fcntl is None:
+            yield True
+            return
+        fd = os.open(os.path.join(self.cache_dir, '.maintenance.lock'), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+    def _path(self, key: str, compressed: bool) -> str:
+        suffix = '.json.gz' if compressed else '.json'
+        return os.path.join(self.cache_dir, key[:self.shard_chars], f"{key}{suffix}")
+
+    def _candidate_paths(self, key: str) -> List[str]:
+        """Preferred encoding first, then the other one, then the pre-sharding flat layout"""
+        return [
+            self._path(key, self.compress),
+            self._path(key, not self.compress),
+            os.path.join(self.cache_dir, f"{key}.json")
+        ]
+
+    def _existing_path(self, key: str) -> Optional[str]:
+        for path in self._candidate_paths(key):
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _load_bytes(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            data = f.read()
+        if path.endswith('.gz'):
+            data = gzip.decompress(data)
+        return data
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def _entries(self, include_temp: bool = False) -> List[os.DirEntry]:
+        """Cache files across all shards (plus any left in the flat pre-sharding layout)"""
+        entries = []
+        try:
+            top_level = list(os.scandir(self.cache_dir))
+        except FileNotFoundError:
+            return entries
+
+        for item in top_level:
+            if item.is_dir(follow_symlinks=False):
+                try:
+                    entries.extend(e for e in os.scandir(item.path) if self._is_entry(e.name, include_temp))
+                except FileNotFoundError:
+                    continue
+            elif self._is_entry(item.name, include_temp):
+                entries.append(item)
+        return entries
+
+    @staticmethod
+    def _is_entry(name: str, include_temp: bool) -> bool:
+        if name.startswith(TEMP_PREFIX):
+            return include_temp
+        return name.endswith('.json') or name.endswith('.json.gz')
+
+class DatabaseCacheBackend:
+    """
+    Rows in the ip_screener_cache table, shared by every worker and
+    container pointed at the same database. Expiry is resolved through
+    the index on expires_at, so lookups and sweeps never scan the table.
+    The table is created by migration 007 (migrate.py).
+    """
+
+    name = 'database'
+
+    def __init__(self, database_url: str, ttl_seconds: float):
+        self.engine = create_engine(database_url, pool_pre_ping=True)
+        self.ttl_seconds = ttl_seconds
+
+    def read(self, key: str) -> Optional[Tuple[float, Dict[str, Any], int]]:
+        """Return (timestamp, result, payload size) or None"""
+        with self.engine.connect() as conn:
+            row = conn.execute(text("""
+                SELECT created_at, response_data
+                FROM ip_screener_cache
+                WHERE query_hash = :key AND expires_at > :now
+            """), {'key': key, 'now': datetime.now()}).fetchone()
+
+        if not row:
+            return None
+
+        try:
+            return row.created_at.timestamp(), json.loads(row.response_data), len(row.response_data)
+        except (json.JSONDecodeError, TypeError):
+            self.delete(key)
+            return None
+
+    def write(self, key: str, timestamp: float, result: Dict[str, Any], payload: str,
+              query: Dict[str, str] = None) -> None:
+        created_at = datetime.fromtimestamp(timestamp)
+        query = query or {}
+        response_data = json.dumps(result)
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                INSERT INTO ip_screener_cache
+                    (query_hash, part_name, description, reference, response_data, is_simulation,
+                     size_bytes, created_at, expires_at, last_accessed_at)
+                VALUES (:key, :part_name, :description, :reference, :response_data, false,
+                        :size_bytes, :created_at, :expires_at, :created_at)
+                ON CONFLICT (query_hash)
+                DO UPDATE SET
+                    part_name = EXCLUDED.part_name,
+                    description = EXCLUDED.description,
+                    reference = EXCLUDED.reference,
+                    response_data = EXCLUDED.response_data,
+                    is_simulation = EXCLUDED.is_simulation,
+                    size_bytes = EXCLUDED.size_bytes,
+                    created_at = EXCLUDED.created_at,
+                    expires_at = EXCLUDED.expires_at,
+                    hit_count = 0
+            """), {
+                'key': key,
+                'part_name': (query.get('title') or result.get('component_name') or '')[:200],
+                'description': query.get('summary'),
+                'reference': query.get('reference'),
+                'response_data': response_data,
+                'size_bytes': len(response_data),
+                'created_at': created_at,
+                'expires_at': created_at + timedelta(seconds=self.ttl_seconds)
+            })
+
+    def delete(self, key: str) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM ip_screener_cache WHERE query_hash = :key"), {'key': key})
+
+    def clear(self) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM ip_screener_cache"))
+            conn.execute(text("""
+                INSERT INTO catalogue_versions (table_name, version) VALUES (:name, 1)
+                ON CONFLICT (table_name)
+                DO UPDATE SET version = catalogue_versions.version + 1, changed_at = CURRENT_TIMESTAMP
+            """), {'name': GENERATION_ROW})
+
+    def generation(self) -> int:
+        """Changes whenever clear() runs anywhere against this database"""
+        with self.engine.connect() as conn:
+            version = conn.execute(text("SELECT version FROM catalogue_versions WHERE table_name = :name"),
+                                   {'name': GENERATION_ROW}).scalar()
+        return version or 0
+
+    def sweep(self, ttl_seconds: float) -> int:
+        """Delete expired rows; returns the number removed"""
+        with self.engine.begin() as conn:
+            result = conn.execute(text("DELETE FROM ip_screener_cache WHERE expires_at <= :now"),
+                                  {'now': datetime.now()})
+            return result.rowcount
+
+    def touch(self, hits: Dict[str, int]) -> None:
+        """Add buffered hit counts and bump last access in one statement"""
+        if not hits:
+            return
+        with self.engine.begin() as conn:
+            conn.execute(text("""
+                UPDATE ip_screener_cache AS c
+                SET hit_count = COALESCE(c.hit_count, 0) + h.hits,
+                    last_accessed_at = :now
+                FROM (SELECT unnest(CAST(:keys AS VARCHAR[])) AS query_hash,
+                             unnest(CAST(:counts AS INTEGER[])) AS hits) AS h
+                WHERE c.query_hash = h.query_hash
+            """), {'keys': list(hits.keys()), 'counts': list(hits.values()), 'now': datetime.now()})
+
+    def usage(self) -> Tuple[int, int]:
+        """Return (entry count, total bytes)"""
+        with self.engine.connect() as conn:
+            row = conn.execute(text("""
+                SELECT COUNT(*) AS entries,
+                       COALESCE(SUM(COALESCE(size_bytes, LENGTH(response_data))), 0) AS total_bytes
+                FROM ip_screener_cache
+            """)).fetchone()
+        return row.entries, int(row.total_bytes)
+
+    def evict_lru(self, max_bytes: int) -> int:
+        """Delete least recently read rows beyond a running total of max_bytes"""
+        with self.engine.begin() as conn:
+            result = conn.execute(text("""
+                DELETE FROM ip_screener_cache
+                WHERE query_hash IN (
+                    SELECT query_hash FROM (
+                        SELECT query_hash,
+                               SUM(COALESCE(size_bytes, LENGTH(response_data))) OVER (
+                                   ORDER BY COALESCE(last_accessed_at, created_at) DESC, query_hash
+                               ) AS running_bytes
+                        FROM ip_screener_cache
+                    ) ranked
+                    WHERE running_bytes > :max_bytes
+                )
+            """), {'max_bytes': max_bytes})
+            return result.rowcount
+
+    def refresh_candidates(self, ttl_seconds: float, window_seconds: float, limit: int,
+                           hits: Dict[str, int], min_hits: int) -> List[Dict[str, Any]]:
+        """
+        Entries expiring within the window, ranked by their shared hit
+        counter. Every write restarts the counter, so a refreshed entry is
+        only refreshed again if it keeps being read; a rewrite leaves
+        last_accessed_at alone, so only reads move it up the LRU order.
+        """
+        now = datetime.now()
+        with self.engine.connect() as conn:
+            rows = conn.execute(text("""
+                SELECT query_hash, part_name, description, reference, hit_count
+                FROM ip_screener_cache
+                WHERE expires_at > :now AND expires_at <= :horizon
+                  AND hit_count >= :min_hits
+                  AND description IS NOT NULL
+                ORDER BY hit_count DESC
+                LIMIT :limit
+            """), {
+                'now': now,
+                'horizon': now + timedelta(seconds=window_seconds),
+                'min_hits': min_hits,
+                'limit': limit
+            }).fetchall()
+
+        return [{
+            'key': row.query_hash,
+            'hits': row.hit_count,
+            'title': row.part_name,
+            'summary': row.description,
+            'reference': row.reference or 'RE4DY_VIS'
+        } for row in rows]
+
+    @contextmanager
+    def maintenance_lock(self):
+        """Session advisory lock so one instance across the fleet runs maintenance at a time"""
+        with self.engine.connect() as conn:
+            acquired = conn.execute(text("SELECT pg_try_advisory_lock(:key)"),
+                                    {'key': MAINTENANCE_LOCK_KEY}).scalar()
+            try:
+                yield acquired
+            finally:
+                if acquired:
+                    conn.execute(text("SELECT pg_advisory_unlock(:key)"), {'key': MAINTENANCE_LOCK_KEY})
+                conn.commit()
+
+def create_cache_backend(cache_dir: str, ttl_seconds: float):
+    """
+    Pick the shared backend from IPS_CACHE_BACKEND ('database' or 'file').
+    Defaults to the database whenever DATABASE_URL is configured.
+    """
+    database_url = os.getenv('DATABASE_URL')
+    backend = os.getenv('IPS_CACHE_BACKEND', 'database' if database_url else 'file').lower()
+
+    if backend == 'database':
+        if not database_url:
+            raise ValueError("IPS_CACHE_BACKEND=database requires DATABASE_URL")
+        return DatabaseCacheBackend(database_url, ttl_seconds)
+    return FileCacheBackend(cache_dir)
+
+class IPScreenerCache:
+    """
+    Two-tier cache for IP Screener results: an in-memory LRU in front of
+    a shared backend (database table or local JSON files), all keyed by
+    the SHA-256 query hash.
+
+    The memory tier is per worker. clear() bumps a generation held by the
+    backend, and each worker compares it at most every
+    IPS_MEMORY_CACHE_CHECK_SECONDS before serving from memory, so a clear
+    reaches every worker within that interval.
+    """
+
+    def __init__(self, cache_dir: str = "/tmp/ip_screener_cache", ttl_hours: int = 24, throttle_minutes: int = 5,
+                 memory_entries: int = None, memory_bytes: int = None, backend=None):
+        self.cache_dir = cache_dir
+        self.ttl_hours = ttl_hours
+        self.throttle_minutes = throttle_minutes
+        self.backend = backend or create_cache_backend(cache_dir, ttl_hours * 3600)
+        self.memory = MemoryLRUCache(
+            max_entries=memory_entries or int(os.getenv('IPS_MEMORY_CACHE_ENTRIES', '512')),
+            max_bytes=memory_bytes or int(os.getenv('IPS_MEMORY_CACHE_MB', '32')) * 1024 * 1024,
+            ttl_seconds=ttl_hours * 3600
+        )
+
+        # Reads are counted in memory and flushed to the backend by CacheMaintenance
+        self._hits: Counter = Counter()
+        self._hits_lock = threading.Lock()
+
+        self.generation_check_seconds = float(os.getenv('IPS_MEMORY_CACHE_CHECK_SECONDS', '5'))
+        self._generation: Optional[int] = None
+        self._generation_checked_at = 0.0
+        self._generation_lock = threading.Lock()
+
+    def get(self, query_hash: str) -> Optional[Dict[str, Any]]:
+        """Get cached result if available and not expired"""
+        entry = self._lookup(query_hash)
+        if entry is None:
+            return None
+        with self._hits_lock:
+            self._hits[query_hash] += 1
+        # Callers annotate the result (e.g. from_cache), so hand out a copy
+        return dict(entry[1])
+
+    def set(self, query_hash: str, result: Dict[str, Any], query: Dict[str, str] = None) -> None:
+        """Cache result with timestamp; query holds the title/summary/reference needed to refresh it"""
+        timestamp = time.time()
+
+        cached_data = {
+            'timestamp': datetime.fromtimestamp(timestamp).isoformat(),
+            'query': query,
+            'result': result
+        }
+
+        try:
+            payload = json.dumps(cached_data)
+            self.memory.set(query_hash, timestamp, dict(result), len(payload))
+            self.backend.write(query_hash, timestamp, result, payload, query=query)
+        except Exception as e:
+            logger.warning(f"Failed to cache result: {e}")
+
+    def take_hits(self) -> Dict[str, int]:
+        """Return and reset the read counts buffered since the last call"""
+        with self._hits_lock:
+            hits, self._hits = dict(self._hits), Counter()
+        return hits
+
+    def restore_hits(self, hits: Dict[str, int]) -> None:
+        """Put back counts that could not be flushed"""
+        with self._hits_lock:
+            self._hits.update(hits)
+
+    def is_throttled(self, query_hash: str) -> bool:
+        """Check if query is throttled (too recent)"""
+        entry = self._lookup(query_hash)
+        if entry is None:
+            return False
+        return time.time() - entry[0] < self.throttle_minutes * 60
+
+    def clear(self) -> None:
+        """Drop every entry from both tiers; other workers drop their memory tier on their next generation check"""
+        self.memory.clear()
+        self.backend.clear()
+
+    def sweep(self) -> int:
+        """Remove expired entries from the shared backend"""
+        try:
+            removed = self.backend.sweep(self.ttl_hours * 3600)
+        except Exception as e:
+            logger.warning(f"Cache sweep failed: {e}")
+            return 0
+        if removed:
+            logger.info(f"Swept {removed} expired IP Screener cache entries")
+        return removed
+
+    def _sync_generation(self) -> None:
+        """Drop the memory tier when another worker has cleared the shared backend"""
+        now = time.time()
+        if now - self._generation_checked_at < self.generation_check_seconds:
+            return
+        with self._generation_lock:
+            if now - self._generation_checked_at < self.generation_check_seconds:
+                return
+            self._generation_checked_at = now
+            try:
+                generation = self.backend.generation()
+            except Exception as e:
+                logger.warning(f"Cache generation check failed: {e}")
+                return
+            if self._generation is not None and generation != self._generation:
+                self.memory.clear()
+            self._generation = generation
+
+    def _lookup(self, query_hash: str) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """Return (timestamp, result) from memory, promoting backend hits into memory"""
+        self._sync_generation()
+        entry = self.memory.get(query_hash)
+        if entry is not None:
+            return entry
+
+        try:
+            stored = self.backend.read(query_hash)
+        except Exception as e:
+            logger.warning(f"Cache read failed: {e}")
+            return None
+        if stored is None:
+            return None
+
+        timestamp, result, size = stored
+        if time.time() - timestamp > self.ttl_hours * 3600:
+            return None
+
+        self.memory.set(query_hash, timestamp, result, size)
+        return timestamp, result
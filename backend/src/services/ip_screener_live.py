@@ -2,14 +2,20 @@ import os
 import hashlib
 import json
 import requests
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Tuple
+from datetime import datetime
+from typing import Dict, Any, Callable, Optional, Tuple
 from dotenv import load_dotenv
+from src.services.ip_screener_cache import IPScreenerCache
+from src.services.cache_maintenance import CacheMaintenance
 import logging
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process coalescing only
+    fcntl = None
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables
@@ -240,102 +246,154 @@ class IPScreenerAPI:
         
         return response_data
 
-class IPScreenerCache:
-    """Simple file-based cache for IP Screener results"""
-    
-    def __init__(self, cache_dir: str = "/tmp/ip_screener_cache", ttl_hours: int = 24, throttle_minutes: int = 5):
-        self.cache_dir = cache_dir
-        self.ttl_hours = ttl_hours
-        self.throttle_minutes = throttle_minutes
-        
-        # Create cache directory
-        os.makedirs(cache_dir, exist_ok=True)
-    
-    def get(self, query_hash: str) -> Optional[Dict[str, Any]]:
-        """Get cached result if available and not expired"""
-        cache_file = os.path.join(self.cache_dir, f"{query_hash}.json")
-        
-        if not os.path.exists(cache_file):
-            return None
-        
-        try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-            
-            # Check if expired
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            if datetime.now() - cached_time > timedelta(hours=self.ttl_hours):
-                os.remove(cache_file)
-                return None
-            
-            return cached_data['result']
-            
-        except (json.JSONDecodeError, KeyError, ValueError):
-            # Remove corrupted cache file
-            try:
-                os.remove(cache_file)
-            except:
-                pass
-            return None
-    
-    def set(self, query_hash: str, result: Dict[str, Any]) -> None:
-        """Cache result with timestamp"""
-        cache_file = os.path.join(self.cache_dir, f"{query_hash}.json")
-        
-        cached_data = {
-            'timestamp': datetime.now().isoformat(),
-            'result': result
-        }
-        
+class _InFlightCall:
+    """A single upstream call that concurrent callers wait on"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls for the same key into one execution.
+    Threads in this process wait on the leader's result; when a lock
+    directory is configured, leaders in other gunicorn workers are
+    serialised through an advisory file lock as well.
+    """
+
+    def __init__(self, lock_dir: Optional[str] = None, lock_timeout_seconds: int = 60):
+        self.lock_dir = lock_dir if fcntl else None
+        self.lock_timeout_seconds = lock_timeout_seconds
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _InFlightCall] = {}
+
+        if self.lock_dir:
+            os.makedirs(self.lock_dir, exist_ok=True)
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run fn once for all concurrent callers with the same key.
+        Returns (result, shared) where shared is True for callers that
+        received another caller's result instead of running fn.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                leader = False
+            else:
+                call = _InFlightCall()
+                self._calls[key] = call
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(cached_data, f)
+            with self._process_lock(key):
+                call.result = fn()
         except Exception as e:
-            logger.warning(f"Failed to cache result: {e}")
-    
-    def is_throttled(self, query_hash: str) -> bool:
-        """Check if query is throttled (too recent)"""
-        cache_file = os.path.join(self.cache_dir, f"{query_hash}.json")
-        
-        if not os.path.exists(cache_file):
-            return False
-        
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+            if call.waiters:
+                logger.info(f"Coalesced {call.waiters} concurrent request(s) for {key[:12]}...")
+
+        return call.result, False
+
+    def _process_lock(self, key: str):
+        """Advisory lock shared by all workers on this host (no-op when disabled)"""
+        if not self.lock_dir:
+            return _NullLock()
+        # Same hash-prefix sharding as the file cache keeps directories small
+        shard_dir = os.path.join(self.lock_dir, key[:2])
+        os.makedirs(shard_dir, exist_ok=True)
+        return _FileLock(os.path.join(shard_dir, f"{key}.lock"), self.lock_timeout_seconds)
+
+class _NullLock:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class _FileLock:
+    """flock-based lock; gives up after the timeout rather than blocking a worker forever"""
+
+    def __init__(self, path: str, timeout_seconds: int):
+        self.path = path
+        self.timeout_seconds = timeout_seconds
+        self._fd = None
+
+    def __enter__(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout_seconds
+        while True:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return self
+            except BlockingIOError:
+                if time.monotonic() >= deadline:
+                    logger.warning(f"Timed out waiting for {self.path}, proceeding without lock")
+                    return self
+                time.sleep(0.05)
+
+    def __exit__(self, *exc):
         try:
-            with open(cache_file, 'r') as f:
-                cached_data = json.load(f)
-            
-            cached_time = datetime.fromisoformat(cached_data['timestamp'])
-            return datetime.now() - cached_time < timedelta(minutes=self.throttle_minutes)
-            
-        except:
-            return False
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+        return False
 
 class IPScreenerService:
     """
     Main service class for IP Screener integration.
     Handles API calls, caching, and error recovery.
     """
-    
+
     def __init__(self):
         self.api = IPScreenerAPI()
         self.cache = IPScreenerCache()
-        
+
+        # Identical concurrent analyses share one upstream call
+        lock_dir = os.getenv('IPS_LOCK_DIR', '/tmp/ip_screener_locks')
+        if os.getenv('IPS_CROSS_PROCESS_LOCKS', 'true').lower() != 'true':
+            lock_dir = None
+        self.inflight = SingleFlight(
+            lock_dir=lock_dir,
+            lock_timeout_seconds=int(os.getenv('IPS_LOCK_TIMEOUT_SECONDS', '60'))
+        )
+
+        # Sweeping, size cap and refresh-ahead run in the background
+        self.maintenance = CacheMaintenance(self)
+        self.maintenance.start()
+
         logger.info("IP Screener service initialized successfully")
     
     def analyze_component(self, component_name: str, component_description: str, 
-                         reference: str = "RE4DY_VIS") -> Dict[str, Any]:
+                         reference: str = "RE4DY_VIS", force_refresh: bool = False) -> Dict[str, Any]:
         """
         Analyze component using IP Screener API with caching and error handling.
+        force_refresh bypasses the cache unless the entry is still inside the throttle window.
         """
         # Generate cache key
         query_hash = self.api._compute_query_hash(component_name, component_description, reference)
         
         # Check cache first
-        cached_result = self.cache.get(query_hash)
-        if cached_result:
-            logger.info(f"Returning cached result for: {component_name}")
-            cached_result['from_cache'] = True
-            return cached_result
+        if not force_refresh or self.cache.is_throttled(query_hash):
+            cached_result = self.cache.get(query_hash)
+            if cached_result:
+                logger.info(f"Returning cached result for: {component_name}")
+                cached_result['from_cache'] = True
+                return cached_result
         
         # Check throttling
         if self.cache.is_throttled(query_hash):
@@ -351,34 +409,17 @@ class IPScreenerService:
             }
         
         try:
-            # Submit query to API
-            session_token, initial_response = self.api.submit_query(
-                title=component_name,
-                summary=component_description,
-                reference=reference
+            # Concurrent misses for the same query share one upstream call
+            result, shared = self.inflight.do(
+                query_hash,
+                lambda: self._query_upstream(query_hash, component_name, component_description, reference,
+                                             force_refresh)
             )
-            
-            # Handle immediate results (no session token)
-            if session_token is None:
-                result = self._process_api_response(initial_response, component_name)
-                result['from_cache'] = False
-                
-                # Cache successful results
-                if result.get('success'):
-                    self.cache.set(query_hash, result)
-                
-                return result
-            
-            # Handle session-based results (poll for completion)
-            # For now, return the initial response
-            result = self._process_api_response(initial_response, component_name)
-            result['from_cache'] = False
-            
-            # Cache successful results
-            if result.get('success'):
-                self.cache.set(query_hash, result)
-            
-            return result
+            if shared:
+                logger.info(f"Joined in-flight analysis for: {component_name}")
+
+            # Each caller gets its own copy so per-request flags don't leak between them
+            return dict(result)
             
         except IPScreenerAPIError as e:
             logger.error(f"IP Screener API error for {component_name}: {e}")
@@ -417,6 +458,37 @@ class IPScreenerService:
                 }
             }
     
+    def _query_upstream(self, query_hash: str, component_name: str, component_description: str,
+                        reference: str, force_refresh: bool = False) -> Dict[str, Any]:
+        """Submit the query and cache it; runs once per in-flight query hash"""
+        # Another worker may have finished this query while we waited on its lock
+        cached_result = None if force_refresh else self.cache.get(query_hash)
+        if cached_result:
+            cached_result['from_cache'] = True
+            return cached_result
+
+        # Submit query to API
+        session_token, initial_response = self.api.submit_query(
+            title=component_name,
+            summary=component_description,
+            reference=reference
+        )
+
+        # Session-based results are not polled yet, so both paths use the initial response
+        result = self._process_api_response(initial_response, component_name)
+        result['from_cache'] = False
+        result['analyzed_at'] = datetime.now().isoformat()
+
+        # Cache successful results along with the query needed to refresh them
+        if result.get('success'):
+            self.cache.set(query_hash, result, query={
+                'title': component_name,
+                'summary': component_description,
+                'reference': reference
+            })
+
+        return result
+    
     def _process_api_response(self, response_data: Dict[str, Any], component_name: str) -> Dict[str, Any]:
         """Process API response and convert to standard format"""
         try:
@@ -0,0 +1,321 @@
+import math
+import time
+import heapq
+import threading
+from array import array
+from typing import Dict, Any, List, Set, Tuple
+from src.services.supply_graph import SupplyGraph, supply_graph_cache
+from src.services.impact import DEPENDENCY_DIRECTIONS
+import logging
+
+logger = logging.getLogger(__name__)
+
+WEIGHTS = ('strength', 'hops')
+DIRECTIONS = ('downstream', 'any')
+# Strength assumed for edges without one, and the floor that keeps -log finite
+DEFAULT_STRENGTH = 1.0
+MIN_STRENGTH = 0.01
+# Added per edge so that among equally strong paths the shorter one wins
+HOP_COST = 1e-6
+
+class BudgetExceeded(Exception):
+    pass
+
+class _Budget:
+    """Caps node expansions and wall time across every search of one request"""
+
+    def __init__(self, max_nodes: int, timeout_ms: float):
+        self.max_nodes = max_nodes
+        self.deadline = time.perf_counter() + timeout_ms / 1000
+        self.expanded = 0
+
+    def spend(self) -> None:
+        self.expanded += 1
+        if self.expanded > self.max_nodes:
+            raise BudgetExceeded('node budget exhausted')
+        # Hub nodes can have tens of thousands of neighbours, so the clock is read often
+        if self.expanded & 63 == 0 and time.perf_counter() > self.deadline:
+            raise BudgetExceeded('time budget exhausted')
+
+class _Adjacency:
+    """
+    Forward and backward CSR adjacency (neighbour node and edge id per slot)
+    for one direction mode. Parallel edges, such as an explicit 'supplies'
+    row next to the implicit catalogue supplier link, collapse to the
+    cheapest one.
+    """
+
+    def __init__(self, graph: SupplyGraph, direction: str, costs: array):
+        sources, targets, edges = array('i'), array('i'), array('i')
+        if direction == 'downstream':
+            for edge in graph.edges_of_types(DEPENDENCY_DIRECTIONS):
+                source, target = graph.edge_source[edge], graph.edge_target[edge]
+                if DEPENDENCY_DIRECTIONS[graph.relationship_types[graph.edge_type[edge]]] == 'reverse':
+                    source, target = target, source
+                sources.append(source)
+                targets.append(target)
+                edges.append(edge)
+        else:
+            for edge in range(graph.edge_count):
+                source, target = graph.edge_source[edge], graph.edge_target[edge]
+                sources.extend((source, target))
+                targets.extend((target, source))
+                edges.extend((edge, edge))
+
+        self.undirected = direction == 'any'
+        self.forward = self._csr(len(graph), sources, targets, edges, costs)
+        self.backward = self.forward if self.undirected else self._csr(len(graph), targets, sources, edges, costs)
+
+    @staticmethod
+    def _csr(node_count, sources, targets, edges, costs):
+        offsets = array('i', [0]) * (node_count + 1)
+        for source in sources:
+            offsets[source + 1] += 1
+        for node in range(node_count):
+            offsets[node + 1] += offsets[node]
+        neighbours = array('i', [0]) * len(sources)
+        edge_ids = array('i', [0]) * len(sources)
+        cursor = array('i', offsets)
+        for source, target, edge in zip(sources, targets, edges):
+            slot = cursor[source]
+            neighbours[slot] = target
+            edge_ids[slot] = edge
+            cursor[source] = slot + 1
+
+        compact_offsets = array('i', [0])
+        compact_neighbours, compact_edges = array('i'), array('i')
+        for node in range(node_count):
+            cheapest = {}
+            for slot in range(offsets[node], offsets[node + 1]):
+                neighbour, edge = neighbours[slot], edge_ids[slot]
+                if neighbour not in cheapest or costs[edge] < costs[cheapest[neighbour]]:
+                    cheapest[neighbour] = edge
+            compact_neighbours.extend(cheapest.keys())
+            compact_edges.extend(cheapest.values())
+            compact_offsets.append(len(compact_neighbours))
+        return compact_offsets, compact_neighbours, compact_edges
+
+    def blocks(self, blocked_pairs: Set[Tuple[int, int]], u: int, v: int) -> bool:
+        """Whether the hop u -> v (in travel direction) is blocked"""
+        return (u, v) in blocked_pairs or (self.undirected and (v, u) in blocked_pairs)
+
+def _neighbours(csr, node):
+    offsets, neighbours, edge_ids = csr
+    start, end = offsets[node], offsets[node + 1]
+    return zip(neighbours[start:end], edge_ids[start:end])
+
+def _join(meet, parent_forward, parent_backward):
+    nodes, edges = [meet], []
+    node = meet
+    while parent_forward[node] is not None:
+        node, edge = parent_forward[node]
+        nodes.append(node)
+        edges.append(edge)
+    nodes.reverse()
+    edges.reverse()
+    node = meet
+    while parent_backward[node] is not None:
+        node, edge = parent_backward[node]
+        nodes.append(node)
+        edges.append(edge)
+    return nodes, edges
+
+def _bidirectional_bfs(adjacency, source, target, blocked_nodes, blocked_pairs, budget, limit=math.inf):
+    """Fewest-hop path shorter than limit, growing the smaller frontier one level at a time"""
+    if source == target:
+        return [source], []
+    parents = ({source: None}, {target: None})
+    frontiers = ([source], [target])
+    csrs = (adjacency.forward, adjacency.backward)
+    depth = 0
+
+    while frontiers[0] and frontiers[1]:
+        depth += 1
+        if depth >= limit:
+            return None
+        side = 0 if len(frontiers[0]) <= len(frontiers[1]) else 1
+        own, other = parents[side], parents[1 - side]
+        next_frontier = []
+        for node in frontiers[side]:
+            budget.spend()
+            for neighbour, edge in _neighbours(csrs[side], node):
+                if neighbour in own or neighbour in blocked_nodes:
+                    continue
+                hop = (node, neighbour) if side == 0 else (neighbour, node)
+                if blocked_pairs and adjacency.blocks(blocked_pairs, *hop):
+                    continue
+                own[neighbour] = (node, edge)
+                # No earlier meeting means both searches are complete to their depth, so the first is shortest
+                if neighbour in other:
+                    return _join(neighbour, parents[0], parents[1])
+                next_frontier.append(neighbour)
+        frontiers = (next_frontier, frontiers[1]) if side == 0 else (frontiers[0], next_frontier)
+    return None
+
+def _bidirectional_dijkstra(adjacency, costs, source, target, blocked_nodes, blocked_pairs, budget, limit=math.inf):
+    """Cheapest path costing less than limit; stops once the two frontiers' minimum distances sum past the best meeting"""
+    if source == target:
+        return [source], []
+    distances = ({source: 0.0}, {target: 0.0})
+    parents = ({source: None}, {target: None})
+    settled = (set(), set())
+    heaps = ([(0.0, source)], [(0.0, target)])
+    csrs = (adjacency.forward, adjacency.backward)
+    best, meet = limit, None
+
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best:
+            break
+        side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+        distance, node = heapq.heappop(heaps[side])
+        if node in settled[side]:
+            continue
+        settled[side].add(node)
+        budget.spend()
+        own, other = distances[side], distances[1 - side]
+        for neighbour, edge in _neighbours(csrs[side], node):
+            if neighbour in blocked_nodes:
+                continue
+            hop = (node, neighbour) if side == 0 else (neighbour, node)
+            if blocked_pairs and adjacency.blocks(blocked_pairs, *hop):
+                continue
+            candidate = distance + costs[edge]
+            if candidate >= own.get(neighbour, math.inf):
+                continue
+            own[neighbour] = candidate
+            parents[side][neighbour] = (node, edge)
+            if neighbour in other and candidate + other[neighbour] < best:
+                best, meet = candidate + other[neighbour], neighbour
+            # A node that cannot beat the best meeting even via the cheapest open node opposite is not queued
+            if heaps[1 - side] and candidate + heaps[1 - side][0][0] >= best:
+                continue
+            heapq.heappush(heaps[side], (candidate, neighbour))
+    if meet is None:
+        return None
+    return _join(meet, parents[0], parents[1])
+
+class PathFinder:
+    """
+    Shortest and k-shortest loopless paths between two nodes of one
+    SupplyGraph. 'downstream' follows failure-propagation direction
+    (supplier -> part -> assembly -> vehicle); 'any' ignores direction and
+    includes peer relationships. Paths are ranked by hop count, or by
+    strength, where a path's cost is -sum(log(strength)) so the strongest
+    chain of relationships comes first.
+    """
+
+    def __init__(self, graph: SupplyGraph):
+        self.graph = graph
+        self._adjacency: Dict[str, _Adjacency] = {}
+        self._lock = threading.Lock()
+        self.costs = array('d', (
+            -math.log(min(1.0, max(MIN_STRENGTH, DEFAULT_STRENGTH if math.isnan(s) else s))) + HOP_COST
+            for s in graph.edge_strength
+        ))
+
+    def adjacency(self, direction: str) -> _Adjacency:
+        adjacency = self._adjacency.get(direction)
+        if adjacency is None:
+            with self._lock:
+                adjacency = self._adjacency.get(direction)
+                if adjacency is None:
+                    adjacency = self._adjacency[direction] = _Adjacency(self.graph, direction, self.costs)
+        return adjacency
+
+    def _shortest(self, adjacency, weight, source, target, blocked_nodes, blocked_pairs, budget, limit=math.inf):
+        if weight == 'hops':
+            return _bidirectional_bfs(adjacency, source, target, blocked_nodes, blocked_pairs, budget, limit)
+        return _bidirectional_dijkstra(adjacency, self.costs, source, target, blocked_nodes, blocked_pairs,
+                                       budget, limit)
+
+    def _cost(self, weight, edges) -> float:
+        return float(len(edges)) if weight == 'hops' else sum(self.costs[e] for e in edges)
+
+    def find(self, source: int, target: int, k: int = 1, weight: str = 'strength',
+             direction: str = 'downstream', max_nodes: int = 200000, timeout_ms: float = 2000) -> Dict[str, Any]:
+        """Up to k loopless paths in ascending cost (Yen's algorithm)"""
+        adjacency = self.adjacency(direction)
+        budget = _Budget(max_nodes, timeout_ms)
+        started = time.perf_counter()
+        paths: List[Tuple[List[int], List[int]]] = []
+        status = 'ok'
+
+        try:
+            first = self._shortest(adjacency, weight, source, target, set(), set(), budget)
+            if first is not None:
+                paths.append(first)
+            candidates: List[Tuple[float, int, List[int], List[int]]] = []
+            seen = {tuple(first[0])} if first else set()
+            counter = 0
+
+            while paths and len(paths) < k:
+                previous_nodes, previous_edges = paths[-1]
+                for i in range(len(previous_nodes) - 1):
+                    spur = previous_nodes[i]
+                    root_nodes, root_edges = previous_nodes[:i + 1], previous_edges[:i]
+                    # Block the next hop of every accepted path sharing this root, and the root itself
+                    blocked_pairs = {
+                        (nodes[i], nodes[i + 1]) for nodes, _ in paths
+                        if len(nodes) > i + 1 and nodes[:i + 1] == root_nodes
+                    }
+                    blocked_nodes = set(root_nodes[:-1])
+                    # Once enough candidates are queued, a spur path only matters if it beats the worst needed one
+                    needed = k - len(paths)
+                    limit = heapq.nsmallest(needed, candidates)[-1][0] if len(candidates) >= needed else math.inf
+                    spur_path = self._shortest(adjacency, weight, spur, target, blocked_nodes, blocked_pairs,
+                                               budget, limit - self._cost(weight, root_edges))
+                    if spur_path is None:
+                        continue
+                    nodes = root_nodes[:-1] + spur_path[0]
+                    if tuple(nodes) in seen:
+                        continue
+                    seen.add(tuple(nodes))
+                    edges = root_edges + spur_path[1]
+                    counter += 1
+                    heapq.heappush(candidates, (self._cost(weight, edges), counter, nodes, edges))
+                if not candidates:
+                    break
+                _, _, nodes, edges = heapq.heappop(candidates)
+                paths.append((nodes, edges))
+        except BudgetExceeded as e:
+            status = 'budget_exceeded'
+            logger.info(f"Path search stopped after {budget.expanded} expansions: {e}")
+
+        if not paths and status == 'ok':
+            status = 'no_path'
+        return {
+            'status': status,
+            'paths': [self._describe(nodes, edges, weight) for nodes, edges in paths],
+            'expanded': budget.expanded,
+            'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+        }
+
+    def _describe(self, nodes: List[int], edges: List[int], weight: str) -> Dict[str, Any]:
+        graph = self.graph
+        steps, strength = [], 1.0
+        for position, edge in enumerate(edges):
+            value = graph.edge_strength[edge]
+            value = None if math.isnan(value) else value
+            strength *= value if value is not None else DEFAULT_STRENGTH
+            steps.append({
+                'relationship_type': graph.relationship_types[graph.edge_type[edge]],
+                'strength': value,
+                # True when the hop runs against the stored source -> target direction
+                'reversed': graph.edge_source[edge] != nodes[position],
+            })
+        return {
+            'hops': len(edges),
+            'cost': round(self._cost(weight, edges), 6),
+            'strength': round(strength, 6),
+            'nodes': [{'type': graph.keys[n][0], 'id': graph.keys[n][1]} for n in nodes],
+            'edges': steps,
+        }
+
+class PathService:
+    """Path finders over the shared supply graph, rebuilt when the graph changes"""
+
+    def __init__(self, graph_cache=None):
+        self.graph_cache = graph_cache or supply_graph_cache
+
+    def get_finder(self, engine) -> PathFinder:
+        return self.graph_cache.derived(engine, 'paths', lambda graph, previous: PathFinder(graph))
@@ -0,0 +1,160 @@
+import os
+import re
+import sys
+import hmac
+import uuid
+import cProfile
+import tempfile
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FORMATS = ('folded', 'pstats')
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{frame.f_globals.get('__name__', '?')}.{code.co_qualname}"
+
+class _SamplingSession:
+    """Samples one thread's stack on a timer and aggregates folded stacks"""
+
+    extension = 'folded'
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self.thread_id = threading.get_ident()
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, name='request-profiler', daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            if labels:
+                self.stacks[';'.join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: str) -> None:
+        with open(path, 'w') as f:
+            for stack, samples in self.stacks.most_common():
+                f.write(f"{stack} {samples}\n")
+
+class _CProfileSession:
+    """Deterministic cProfile of the current thread, written as a pstats dump"""
+
+    extension = 'pstats'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    def start(self) -> None:
+        self.profile.enable()
+
+    def stop(self) -> None:
+        self.profile.disable()
+
+    def write(self, path: str) -> None:
+        self.profile.dump_stats(path)
+
+class RequestProfiler:
+    """
+    Opt-in profiling of single requests.
+    Disabled unless a token is configured (PROFILE_TOKEN). 'folded' samples
+    the request thread and writes folded stacks for flamegraph.pl or
+    speedscope; 'pstats' runs cProfile and writes a dump for pstats or
+    snakeviz. One request per process is profiled at a time and only the
+    newest `keep` profiles are retained in output_dir.
+    """
+
+    def __init__(self, token: str = None, output_dir: str = None,
+                 sample_interval_ms: float = None, keep: int = None):
+        self.token = token if token is not None else os.getenv('PROFILE_TOKEN', '')
+        self.output_dir = output_dir or os.getenv(
+            'PROFILE_DIR', os.path.join(tempfile.gettempdir(), 're4dy-profiles'))
+        self.sample_interval_ms = sample_interval_ms if sample_interval_ms is not None else \
+            float(os.getenv('PROFILE_SAMPLE_MS', '1'))
+        self.keep = keep if keep is not None else int(os.getenv('PROFILE_KEEP', '50'))
+        # cProfile cannot run twice at once, and concurrent samples would skew each other
+        self._active = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorised(self, supplied: Optional[str]) -> bool:
+        return self.enabled and bool(supplied) and hmac.compare_digest(supplied, self.token)
+
+    def start(self, profile_format: str = 'folded'):
+        """Begin profiling the current thread; returns a session, or None while another request is profiled"""
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(f"profile format must be one of {', '.join(PROFILE_FORMATS)}")
+        if not self._active.acquire(blocking=False):
+            return None
+
+        try:
+            if profile_format == 'pstats':
+                session = _CProfileSession()
+            else:
+                session = _SamplingSession(self.sample_interval_ms / 1000)
+            session.start()
+            return session
+        except Exception:
+            self._active.release()
+            raise
+
+    def stop(self, session, label: str) -> Optional[str]:
+        """End a session, store its profile and return the profile name"""
+        try:
+            session.stop()
+            os.makedirs(self.output_dir, exist_ok=True)
+            safe_label = re.sub(r'[^A-Za-z0-9_.-]+', '_', label or 'request')
+            name = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{safe_label}-{uuid.uuid4().hex[:8]}.{session.extension}"
+            session.write(os.path.join(self.output_dir, name))
+            self._prune()
+            return name
+        except Exception as e:
+            logger.warning(f"Could not store request profile: {e}")
+            return None
+        finally:
+            self._active.release()
+
+    def list_profiles(self) -> List[Dict[str, Any]]:
+        """Stored profiles, newest first"""
+        if not os.path.isdir(self.output_dir):
+            return []
+        profiles = []
+        for entry in os.scandir(self.output_dir):
+            if entry.is_file() and entry.name.rsplit('.', 1)[-1] in PROFILE_FORMATS:
+                stat = entry.stat()
+                profiles.append({
+                    'name': entry.name,
+                    'format': entry.name.rsplit('.', 1)[-1],
+                    'bytes': stat.st_size,
+                    'created_at': datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    '_mtime': stat.st_mtime,
+                })
+        profiles.sort(key=lambda p: p['_mtime'], reverse=True)
+        for profile in profiles:
+            del profile['_mtime']
+        return profiles
+
+    def _prune(self) -> None:
+        for profile in self.list_profiles()[self.keep:]:
+            try:
+                os.remove(os.path.join(self.output_dir, profile['name']))
+            except OSError:
+                pass
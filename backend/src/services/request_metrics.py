@@ -0,0 +1,116 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+from flask import request, has_request_context
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+class RequestMetrics:
+    """
+    Per-request phase accounting.
+    Database time, statement count and rows come from SQLAlchemy cursor events,
+    serialization time from the JSON provider; whatever remains of the
+    request time is Python-side transformation.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_seconds = 0.0
+        self.queries = 0
+        self.rows = 0
+        self.serialize_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def phases(self) -> Dict[str, float]:
+        """Seconds spent in db, transform and serialize, plus the total so far"""
+        total = self.elapsed()
+        return {
+            'db': self.db_seconds,
+            'transform': max(0.0, total - self.db_seconds - self.serialize_seconds),
+            'serialize': self.serialize_seconds,
+            'total': total,
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        entries = []
+        for name, seconds in self.phases().items():
+            entry = f"{name};dur={seconds * 1000:.2f}"
+            if name == 'db':
+                entry += f';desc="{self.queries} queries"'
+            entries.append(entry)
+        return ', '.join(entries)
+
+    def access_record(self, request, response) -> Dict[str, Any]:
+        """Fields of the structured access log line for a finished request"""
+        phases = self.phases()
+        return {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='milliseconds'),
+            'method': request.method,
+            'route': request.url_rule.rule if request.url_rule else None,
+            'path': request.path,
+            'status': response.status_code,
+            'duration_ms': round(phases['total'] * 1000, 2),
+            'db_ms': round(phases['db'] * 1000, 2),
+            'serialize_ms': round(phases['serialize'] * 1000, 2),
+            'queries': self.queries,
+            'rows': self.rows,
+            'response_bytes': response.content_length,
+        }
+
+# Kept on the WSGI environ rather than g: some routes push their own app context
+ENVIRON_KEY = 're4dy.request_metrics'
+
+def current_metrics() -> Optional[RequestMetrics]:
+    """Metrics of the request being handled, or None outside a request"""
+    if not has_request_context():
+        return None
+    return request.environ.get(ENVIRON_KEY)
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that charges encoding time to the serialize phase"""
+
+    def dumps(self, obj, **kwargs):
+        started = time.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            metrics = current_metrics()
+            if metrics is not None:
+                metrics.serialize_seconds += time.perf_counter() - started
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if current_metrics() is not None:
+        conn.info.setdefault('request_query_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    metrics = current_metrics()
+    started = conn.info.get('request_query_started')
+    if metrics is None or not started:
+        return
+    metrics.db_seconds += time.perf_counter() - started.pop()
+    metrics.queries += 1
+    # Rows returned by SELECTs, rows affected by writes; -1 when the driver cannot tell
+    if cursor.rowcount and cursor.rowcount > 0:
+        metrics.rows += cursor.rowcount
+
+def _start_request_metrics():
+    request.environ[ENVIRON_KEY] = RequestMetrics()
+
+_engine_events_installed = False
+
+def init_app(app) -> None:
+    """Collect RequestMetrics for every request served by app"""
+    global _engine_events_installed
+    if not _engine_events_installed:
+        # Listen on the Engine class so every engine the app creates is covered
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+        _engine_events_installed = True
+
+    app.json_provider_class = TimedJSONProvider
+    app.json = TimedJSONProvider(app)
+    app.before_request(_start_request_metrics)
@@ -0,0 +1,218 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import text
+from src.services.supply_graph import (SupplyGraph, supply_graph_cache, node_names, FITS,
+                                       SUPPLIER, CATEGORY, COMPONENT, VEHICLE_MODEL)
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Sankey columns, left to right
+LAYERS = ('supplier', 'category', 'component', 'vehicle_model')
+
+# Nodes beyond a layer's share of max_nodes are merged into one node of this type per layer
+OTHER = 'other'
+
+# Every layer keeps at least its largest node and the overflow node
+MIN_NODES = 2 * len(LAYERS)
+
+# filter name -> query resolving a name substring to ids
+FILTER_QUERIES = {
+    'supplier': "SELECT id FROM suppliers WHERE name ILIKE :pattern",
+    'category': "SELECT id FROM categories WHERE name ILIKE :pattern",
+}
+
+class FlowIndex:
+    """
+    Per-layer view of the supply graph for layered Sankey flows. Each
+    active component carries one unit of flow: supplier -> category ->
+    component, then split evenly over the vehicle models it fits
+    (component_compatibility), so every node's inflow equals its outflow.
+    Nodes are renumbered densely within their layer so aggregating a
+    filter is a handful of bincounts.
+    """
+
+    def __init__(self, graph: SupplyGraph):
+        self.graph = graph
+        node_type = np.frombuffer(graph.node_type, dtype=np.int8)
+        self.layer_nodes: List[np.ndarray] = []
+        dense = np.full(len(graph), -1, dtype=np.int64)
+        for layer_type in (SUPPLIER, CATEGORY, COMPONENT, VEHICLE_MODEL):
+            nodes = np.flatnonzero(node_type == layer_type)
+            dense[nodes] = np.arange(len(nodes))
+            self.layer_nodes.append(nodes)
+
+        # Components without a known supplier or category have no place in the flow
+        components = self.layer_nodes[2]
+        supplier_of = np.frombuffer(graph.supplier_of, dtype=np.int32)[components]
+        category_of = np.frombuffer(graph.category_of, dtype=np.int32)[components]
+        self.placed = (supplier_of >= 0) & (category_of >= 0)
+        self.component_supplier = np.where(self.placed, dense[supplier_of], -1)
+        self.component_category = np.where(self.placed, dense[category_of], -1)
+
+        edge_type = np.frombuffer(graph.edge_type, dtype=np.int16)
+        fits = edge_type == graph.relationship_types.index(FITS) if FITS in graph.relationship_types \
+            else np.zeros(len(edge_type), dtype=bool)
+        self.fit_component = dense[np.frombuffer(graph.edge_source, dtype=np.int32)[fits]]
+        self.fit_model = dense[np.frombuffer(graph.edge_target, dtype=np.int32)[fits]]
+        fit_count = np.bincount(self.fit_component, minlength=len(components))
+        self.fit_share = 1.0 / fit_count[self.fit_component] if len(self.fit_component) else np.zeros(0)
+
+        # Ties within a layer go to the node reaching more of the next layer (components all carry 1)
+        self.tie_break = [np.zeros(len(nodes)) for nodes in self.layer_nodes]
+        self.tie_break[2] = fit_count.astype(np.float64)
+
+    def layer_key(self, layer: int, dense_id: int) -> Tuple[str, int]:
+        return self.graph.keys[self.layer_nodes[layer][dense_id]]
+
+    def dense_ids(self, node_type: str, ids: List[int]) -> np.ndarray:
+        layer = LAYERS.index(node_type)
+        nodes = [self.graph.node(node_type, node_id) for node_id in ids]
+        return np.searchsorted(self.layer_nodes[layer], [n for n in nodes if n is not None])
+
+    def flows(self, component_mask: np.ndarray) -> Dict[str, Any]:
+        """Per-layer node totals and per-stage links for the selected components"""
+        component_mask = component_mask & self.placed
+        selected = np.flatnonzero(component_mask)
+        fits = component_mask[self.fit_component]
+        counts = [len(nodes) for nodes in self.layer_nodes]
+        totals = [
+            np.bincount(self.component_supplier[selected], minlength=counts[0]).astype(np.float64),
+            np.bincount(self.component_category[selected], minlength=counts[1]).astype(np.float64),
+            np.bincount(selected, minlength=counts[2]).astype(np.float64),
+            np.bincount(self.fit_model[fits], weights=self.fit_share[fits], minlength=counts[3]),
+        ]
+        ones = np.ones(len(selected))
+        stages = [
+            (self.component_supplier[selected], self.component_category[selected], ones),
+            (self.component_category[selected], selected, ones),
+            (self.fit_component[fits], self.fit_model[fits], self.fit_share[fits]),
+        ]
+        return {'totals': totals, 'stages': stages}
+
+def _budgets(sizes: List[int], max_nodes: int) -> List[int]:
+    """
+    Split max_nodes over the layers: small layers are shown whole and
+    leave their unused share to the larger ones.
+    """
+    budgets = list(sizes)
+    if sum(sizes) <= max_nodes:
+        return budgets
+    remaining, left = max_nodes, len(sizes)
+    for layer in sorted(range(len(sizes)), key=lambda l: sizes[l]):
+        budgets[layer] = min(sizes[layer], max(remaining // left, 2 if sizes[layer] else 0))
+        remaining -= budgets[layer]
+        left -= 1
+    return budgets
+
+class SankeyFlowService:
+    """
+    Bounded multi-level Sankey payloads (supplier -> category -> component
+    -> vehicle model). The flow index is rebuilt when the shared supply
+    graph changes; payloads per (filters, max_nodes) are cached in a small
+    LRU cleared with it.
+    """
+
+    def __init__(self, graph_cache=None, max_entries: int = None):
+        self.graph_cache = graph_cache or supply_graph_cache
+        self.max_entries = max_entries or int(os.getenv('SANKEY_CACHE_ENTRIES', '64'))
+        self._payloads: 'OrderedDict[tuple, Dict[str, Any]]' = OrderedDict()
+        self._payloads_index: Optional[FlowIndex] = None
+        self._lock = threading.Lock()
+
+    def get_index(self, engine) -> FlowIndex:
+        return self.graph_cache.derived(engine, 'sankey', self._build)
+
+    def _build(self, graph: SupplyGraph, previous: Optional[FlowIndex]) -> FlowIndex:
+        index = FlowIndex(graph)
+        logger.info(f"Sankey flow index built ({int(index.placed.sum())} components, "
+                    f"{len(index.fit_model)} fitments)")
+        return index
+
+    def get_flows(self, engine, category: str = '', supplier: str = '', max_nodes: int = 50) -> Dict[str, Any]:
+        """
+        Layered flows for components matching the category and supplier
+        name filters (substring, case-insensitive), at most max_nodes nodes.
+        """
+        index = self.get_index(engine)
+        key = (category.lower(), supplier.lower(), max_nodes)
+        with self._lock:
+            # Payloads of an older index can never hit again
+            if self._payloads_index is not index:
+                self._payloads.clear()
+                self._payloads_index = index
+            payload = self._payloads.get(key)
+            if payload is not None:
+                self._payloads.move_to_end(key)
+                return payload
+
+        with engine.connect() as conn:
+            mask = np.ones(len(index.layer_nodes[2]), dtype=bool)
+            for node_type, value in (('category', category), ('supplier', supplier)):
+                if value:
+                    ids = [row.id for row in conn.execute(text(FILTER_QUERIES[node_type]),
+                                                          {'pattern': f"%{value}%"})]
+                    column = index.component_category if node_type == 'category' else index.component_supplier
+                    mask &= np.isin(column, index.dense_ids(node_type, ids))
+            payload = self._payload(conn, index, index.flows(mask), max(max_nodes, MIN_NODES))
+
+        with self._lock:
+            if self._payloads_index is index:
+                self._payloads[key] = payload
+                while len(self._payloads) > self.max_entries:
+                    self._payloads.popitem(last=False)
+        return payload
+
+    def _payload(self, conn, index: FlowIndex, flows: Dict[str, Any], max_nodes: int) -> Dict[str, Any]:
+        totals = flows['totals']
+        present = [np.flatnonzero(layer_totals > 0) for layer_totals in totals]
+        budgets = _budgets([len(nodes) for nodes in present], max_nodes)
+
+        # slots[layer][dense id] -> position in nodes, or -1 if the node carries no flow
+        nodes: List[Dict[str, Any]] = []
+        slots, kept_keys, layer_info = [], [], []
+        for layer, (layer_totals, nodes_present) in enumerate(zip(totals, present)):
+            ranked = nodes_present[np.lexsort((nodes_present, -index.tie_break[layer][nodes_present],
+                                               -layer_totals[nodes_present]))]
+            keep = budgets[layer] if len(ranked) <= budgets[layer] else budgets[layer] - 1
+            slot = np.full(len(layer_totals), -1, dtype=np.int64)
+            slot[ranked[:keep]] = len(nodes) + np.arange(keep)
+            for dense_id in ranked[:keep].tolist():
+                key = index.layer_key(layer, dense_id)
+                kept_keys.append(key)
+                nodes.append({'id': f"{key[0]}_{key[1]}", 'type': key[0], 'layer': layer,
+                              'value': round(float(layer_totals[dense_id]), 3)})
+            overflow = ranked[keep:]
+            if len(overflow):
+                slot[overflow] = len(nodes)
+                nodes.append({'id': f"{OTHER}_{LAYERS[layer]}", 'name': f"{len(overflow)} more",
+                              'type': OTHER, 'layer': layer, 'members': len(overflow),
+                              'value': round(float(layer_totals[overflow].sum()), 3)})
+            slots.append(slot)
+            layer_info.append({'type': LAYERS[layer], 'nodes': len(ranked),
+                               'shown': keep, 'total': round(float(layer_totals.sum()), 3)})
+
+        names = node_names(conn, kept_keys) if kept_keys else {}
+        for node, key in zip([node for node in nodes if node['type'] != OTHER], kept_keys):
+            node['name'] = names.get(key)
+
+        links = []
+        for layer, (sources, targets, weights) in enumerate(flows['stages']):
+            source, target = slots[layer][sources], slots[layer + 1][targets]
+            width = max(len(nodes), 1)
+            pairs, inverse = np.unique(source * width + target, return_inverse=True)
+            values = np.bincount(inverse, weights=weights, minlength=len(pairs))
+            for pair, value in zip(pairs.tolist(), values.tolist()):
+                links.append({'source': nodes[pair // width]['id'], 'target': nodes[pair % width]['id'],
+                              'value': round(value, 3)})
+
+        return {
+            'nodes': nodes,
+            'links': links,
+            'layers': layer_info,
+            'truncated': any(info['shown'] < info['nodes'] for info in layer_info),
+            'data_version': index.graph.version,
+        }
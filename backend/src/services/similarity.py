@@ -0,0 +1,320 @@
+import math
+import os
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from sqlalchemy import text
+from src.services.data_version import data_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Text fields and their weight in a component's vector; digits (serials, part numbers) are ignored
+FIELD_WEIGHTS = (('part_name', 2.0), ('subcategory', 2.0), ('description', 1.0), ('specifications', 0.5))
+WORD = re.compile(r'[a-z]+')
+STOP_WORDS = frozenset(('a', 'an', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'with'))
+
+# Character trigrams of part name words count this much relative to the word itself
+TRIGRAM_WEIGHT = 0.25
+
+# Documents vectorised per block when filling the matrix
+FILL_CHUNK = 5000
+
+# Change fingerprint of the indexed fields, compared on every components version change
+SYNC_QUERY = """
+    SELECT id, md5(concat_ws('|', part_name, subcategory, description, specifications,
+                             supplier_id::text, category_id::text)) AS fingerprint
+    FROM components WHERE is_active = true
+"""
+TEXT_QUERY = """
+    SELECT id, part_name, subcategory, description, specifications, supplier_id, category_id
+    FROM components WHERE is_active = true
+"""
+
+class Vocabulary:
+    """
+    Interned features: id per feature string and its hashed matrix column
+    and sign. Within one term_frequencies call each distinct (field, words)
+    value is tokenised once; that cache is dropped with the call.
+    """
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.ids: Dict[str, int] = {}
+        self.columns: List[int] = []
+        self.signs: List[float] = []
+
+    def _intern(self, feature: str) -> int:
+        feature_id = self.ids.get(feature)
+        if feature_id is None:
+            feature_id = self.ids[feature] = len(self.columns)
+            hashed = zlib.crc32(feature.encode('utf-8'))
+            self.columns.append(hashed % self.dimensions)
+            self.signs.append(1.0 if (hashed // self.dimensions) & 1 else -1.0)
+        return feature_id
+
+    def copy(self) -> 'Vocabulary':
+        vocabulary = Vocabulary(self.dimensions)
+        vocabulary.ids = dict(self.ids)
+        vocabulary.columns = list(self.columns)
+        vocabulary.signs = list(self.signs)
+        return vocabulary
+
+    def field(self, field: str, value: Optional[str], weight: float,
+              cache: Dict[tuple, Tuple[np.ndarray, np.ndarray]]) -> Tuple[np.ndarray, np.ndarray]:
+        """Feature ids and weights of words, word bigrams and (part names) character trigrams"""
+        words = tuple(w for w in WORD.findall((value or '').lower()) if w not in STOP_WORDS and len(w) > 1)
+        key = (field, words)
+        cached = cache.get(key)
+        if cached is None:
+            counts: Dict[str, float] = defaultdict(float)
+            for word in words:
+                counts[word] += weight
+            for first, second in zip(words, words[1:]):
+                counts[f"{first} {second}"] += weight
+            if field == 'part_name':
+                for word in words:
+                    padded = f"<{word}>"
+                    for start in range(len(padded) - 2):
+                        counts[f"#{padded[start:start + 3]}"] += weight * TRIGRAM_WEIGHT
+            if field == 'subcategory' and words:
+                counts['=' + ' '.join(words)] += weight
+            cached = cache[key] = (np.array([self._intern(f) for f in counts], dtype=np.int64),
+                                          np.array(list(counts.values()), dtype=np.float64))
+        return cached
+
+    def term_frequencies(self, rows: List[tuple]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(document position, feature id, summed weight) for every distinct feature of each row"""
+        feature_ids, weights, lengths = [], [], []
+        cache: Dict[tuple, Tuple[np.ndarray, np.ndarray]] = {}
+        for row in rows:
+            length = 0
+            for field, weight in FIELD_WEIGHTS:
+                ids, values = self.field(field, getattr(row, field), weight, cache)
+                feature_ids.append(ids)
+                weights.append(values)
+                length += len(ids)
+            lengths.append(length)
+        if not rows:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0)
+        documents = np.repeat(np.arange(len(rows)), lengths)
+        width = len(self.columns)
+        keys, inverse = np.unique(documents * width + np.concatenate(feature_ids), return_inverse=True)
+        return keys // width, keys % width, np.bincount(inverse, weights=np.concatenate(weights))
+
+class SimilarityIndex:
+    """
+    Hashed TF-IDF vectors of component text in one dense float32 matrix,
+    L2-normalised so a matrix product gives cosine similarities. Features
+    are words, word bigrams and part-name character trigrams; each is
+    hashed to one of `dimensions` columns with a hash-derived sign, so
+    the matrix width does not grow with the vocabulary. Rows are ordered
+    by category so same-category queries read one contiguous block. IDF
+    weights are fixed when the index is built; rows added or changed later
+    reuse them until enough of the catalogue has changed to warrant a
+    rebuild.
+    """
+
+    def __init__(self, rows: List[tuple], fingerprints: Dict[int, str], dimensions: int, version: Optional[str]):
+        self.dimensions = dimensions
+        self.version = version
+        self.fingerprints = dict(fingerprints)
+        self.vocabulary = Vocabulary(dimensions)
+        rows = sorted(rows, key=lambda row: (row.category_id or -1, row.id))
+
+        documents, features, frequencies = self.vocabulary.term_frequencies(rows)
+        document_frequency = np.bincount(features, minlength=len(self.vocabulary.columns))
+        self.documents_at_build = len(rows)
+        self.idf = np.log((1 + len(rows)) / (1 + document_frequency)) + 1
+        self.unseen_idf = math.log(1 + len(rows)) + 1
+        self.changed_since_build = 0
+
+        self.size = len(rows)
+        self.matrix = np.zeros((max(self.size, 1), dimensions), dtype=np.float32)
+        self.ids = np.array([row.id for row in rows], dtype=np.int64)
+        self.supplier_ids = np.array([row.supplier_id or -1 for row in rows], dtype=np.int64)
+        self.category_ids = np.array([row.category_id or -1 for row in rows], dtype=np.int64)
+        self.active = np.ones(self.size, dtype=bool)
+        self.row_of = {int(component_id): row for row, component_id in enumerate(self.ids.tolist())}
+        self._fill(np.arange(self.size), documents, features, frequencies)
+
+        # Rows are grouped by category, so each category is one contiguous block of the built rows
+        self.built_size = self.size
+        categories, starts, counts = np.unique(self.category_ids, return_index=True, return_counts=True)
+        self.category_ranges = {int(c): (int(start), int(start + count))
+                                for c, start, count in zip(categories, starts, counts)}
+
+    def _fill(self, rows: np.ndarray, documents: np.ndarray, features: np.ndarray, frequencies: np.ndarray) -> None:
+        """Write normalised vectors into the given matrix rows, FILL_CHUNK rows at a time"""
+        vocabulary = self.vocabulary
+        idf = np.full(len(vocabulary.columns), self.unseen_idf)
+        idf[:len(self.idf)] = self.idf
+        columns = np.array(vocabulary.columns, dtype=np.int64)[features]
+        values = np.log1p(frequencies) * idf[features] * np.array(vocabulary.signs)[features]
+        bounds = np.searchsorted(documents, np.arange(0, len(rows) + FILL_CHUNK, FILL_CHUNK))
+        for chunk, start in enumerate(range(0, len(rows), FILL_CHUNK)):
+            lo, hi = bounds[chunk], bounds[chunk + 1]
+            count = min(FILL_CHUNK, len(rows) - start)
+            block = np.bincount((documents[lo:hi] - start) * self.dimensions + columns[lo:hi],
+                                weights=values[lo:hi], minlength=count * self.dimensions)
+            block = block.reshape(count, self.dimensions).astype(np.float32)
+            norms = np.linalg.norm(block, axis=1, keepdims=True)
+            self.matrix[rows[start:start + count]] = block / np.where(norms > 0, norms, 1.0)
+
+    def updated(self, rows: List[tuple], removed: List[int], fingerprints: Dict[int, str],
+                version: Optional[str]) -> 'SimilarityIndex':
+        """
+        Copy of the index with rows (new or changed components) vectorised
+        and removed ids dropped; the original keeps serving queries.
+        Components that changed category move to a new row at the end so
+        the category ranges of the built rows stay valid.
+        """
+        index = object.__new__(SimilarityIndex)
+        index.__dict__.update(self.__dict__)
+        index.version = version
+        index.fingerprints = dict(fingerprints)
+        index.row_of = dict(self.row_of)
+        index.active = self.active.copy()
+        index.changed_since_build = self.changed_since_build + len(rows) + len(removed)
+        # New features are interned into a copy; the original's vocabulary stays as it was built
+        index.vocabulary = self.vocabulary.copy()
+
+        moved = [row.id for row in rows if row.id in self.row_of and
+                 self.category_ids[self.row_of[row.id]] != (row.category_id or -1)]
+        for component_id in list(removed) + moved:
+            row = index.row_of.pop(component_id, None)
+            if row is not None:
+                index.active[row] = False
+
+        new = [row for row in rows if row.id not in index.row_of]
+        size = self.size + len(new)
+        capacity = len(self.matrix) if size <= len(self.matrix) else max(size, int(len(self.matrix) * 1.5))
+        index.matrix = np.zeros((capacity, self.dimensions), dtype=np.float32)
+        index.matrix[:self.size] = self.matrix[:self.size]
+        index.ids = np.resize(self.ids, capacity)
+        index.supplier_ids = np.resize(self.supplier_ids, capacity)
+        index.category_ids = np.resize(self.category_ids, capacity)
+        index.active = np.resize(index.active, capacity)
+        index.active[self.size:] = False
+        for position, row in enumerate(new):
+            index.row_of[row.id] = self.size + position
+        index.size = size
+
+        targets = np.array([index.row_of[row.id] for row in rows], dtype=np.int64)
+        index.ids[targets] = [row.id for row in rows]
+        index.supplier_ids[targets] = [row.supplier_id or -1 for row in rows]
+        index.category_ids[targets] = [row.category_id or -1 for row in rows]
+        index.active[targets] = True
+        index._fill(targets, *index.vocabulary.term_frequencies(rows))
+        return index
+
+    def nearest(self, component_ids: List[int], k: int, other_suppliers: bool = True,
+                same_category: bool = False) -> Dict[int, Optional[List[Tuple[int, float]]]]:
+        """
+        Top-k (component id, cosine) per query component. Queries are
+        scored in one matrix product per group: all rows, or with
+        same_category only the category's contiguous block plus rows added
+        since the build. Ids not in the index map to None.
+        """
+        rows = [self.row_of.get(component_id) for component_id in component_ids]
+        results: Dict[int, Optional[List[Tuple[int, float]]]] = {
+            component_id: None for component_id, row in zip(component_ids, rows) if row is None}
+        groups: Dict[Optional[int], List[int]] = defaultdict(list)
+        for row in rows:
+            if row is not None:
+                groups[int(self.category_ids[row]) if same_category else None].append(row)
+
+        added = np.arange(self.built_size, self.size)
+        for category, query_rows in groups.items():
+            queries = self.matrix[query_rows].T
+            if category is None:
+                candidates = np.arange(self.size)
+                scores = self.matrix[:self.size] @ queries
+            else:
+                start, stop = self.category_ranges.get(category, (0, 0))
+                extra = added[self.category_ids[added] == category]
+                candidates = np.concatenate((np.arange(start, stop), extra))
+                scores = np.vstack((self.matrix[start:stop] @ queries, self.matrix[extra] @ queries))
+            excluded = ~self.active[candidates]
+            for column, row in enumerate(query_rows):
+                row_scores = np.where(excluded | (candidates == row), -np.inf, scores[:, column])
+                if other_suppliers:
+                    row_scores[self.supplier_ids[candidates] == self.supplier_ids[row]] = -np.inf
+                count = min(k, len(candidates))
+                top = np.argpartition(-row_scores, count - 1)[:count] if count else candidates[:0]
+                top = top[np.argsort(-row_scores[top], kind='stable')]
+                results[int(self.ids[row])] = [(int(self.ids[candidates[t]]), round(float(row_scores[t]), 4))
+                                               for t in top.tolist() if row_scores[t] > 0]
+        return results
+
+class SimilarityService:
+    """
+    Keeps a SimilarityIndex in step with the components table. When the
+    components version changes, only rows whose indexed fields changed
+    (by fingerprint) are re-vectorised; the index is rebuilt from scratch
+    once more than rebuild_share of it has changed since the last build.
+    """
+
+    def __init__(self, dimensions: int = None, rebuild_share: float = None):
+        self.dimensions = dimensions or int(os.getenv('SIMILARITY_DIMENSIONS', '256'))
+        self.rebuild_share = rebuild_share if rebuild_share is not None else \
+            float(os.getenv('SIMILARITY_REBUILD_SHARE', '0.1'))
+        self._index: Optional[SimilarityIndex] = None
+        self._lock = threading.Lock()
+        self.last_sync: Dict[str, Any] = {}
+
+    def get_index(self, engine) -> SimilarityIndex:
+        with engine.connect() as conn:
+            version = data_version(conn, ('components',))
+            index = self._index
+            if index is not None and version is not None and index.version == version:
+                return index
+
+            # Serialise syncs so a burst of requests after a catalogue change diffs the fingerprints once
+            with self._lock:
+                index = self._index
+                if index is not None and version is not None and index.version == version:
+                    return index
+                started = time.perf_counter()
+                fingerprints = {row.id: row.fingerprint for row in conn.execute(text(SYNC_QUERY))}
+                changed, removed = list(fingerprints), []
+                if index is not None:
+                    changed = [i for i, fp in fingerprints.items() if index.fingerprints.get(i) != fp]
+                    removed = [i for i in index.fingerprints if i not in fingerprints]
+
+                drift = (index.changed_since_build + len(changed) + len(removed)) if index is not None else 0
+                if index is None or drift > self.rebuild_share * max(index.documents_at_build, 1):
+                    rows = conn.execute(text(TEXT_QUERY + " ORDER BY id")).fetchall()
+                    self._index = SimilarityIndex(rows, fingerprints, self.dimensions, version)
+                    mode, vectorised = 'full', len(rows)
+                else:
+                    rows = conn.execute(text(TEXT_QUERY + " AND id = ANY(:ids) ORDER BY id"),
+                                        {'ids': changed}).fetchall() if changed else []
+                    self._index = index.updated(rows, removed, fingerprints, version)
+                    mode, vectorised = 'incremental', len(rows)
+
+                self.last_sync = {
+                    'mode': mode,
+                    'vectorised': vectorised,
+                    'removed': len(removed),
+                    'computed_ms': round((time.perf_counter() - started) * 1000, 1),
+                }
+                logger.info(f"Similarity index {mode} sync: {vectorised} vectorised, {len(removed)} removed "
+                            f"in {self.last_sync['computed_ms']}ms")
+                return self._index
+
+    def alternatives(self, engine, component_ids: List[int], k: int = 10, other_suppliers: bool = True,
+                     same_category: bool = True) -> Dict[str, Any]:
+        index = self.get_index(engine)
+        started = time.perf_counter()
+        results = index.nearest(component_ids, k, other_suppliers, same_category)
+        return {
+            'results': results,
+            'query_ms': round((time.perf_counter() - started) * 1000, 2),
+            'index': dict(self.last_sync, components=int(index.active[:index.size].sum()),
+                          dimensions=index.dimensions, data_version=index.version),
+        }
@@ -0,0 +1,153 @@
+import threading
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple
+from sqlalchemy import text
+from src.services.data_version import data_version
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (label, lower bound inclusive, upper bound exclusive) on price_min, in catalogue currency
+PRICE_BANDS: List[Tuple[str, Optional[float], Optional[float]]] = [
+    ('<50', None, 50),
+    ('50-200', 50, 200),
+    ('200-500', 200, 500),
+    ('500-1000', 500, 1000),
+    ('1000-2500', 1000, 2500),
+    ('2500+', 2500, None),
+]
+UNPRICED_BAND = 'unpriced'
+
+def price_band_sql(column: str = 'c.price_min') -> str:
+    """CASE expression mapping column to its PRICE_BANDS label"""
+    cases = []
+    for label, low, high in PRICE_BANDS:
+        conditions = []
+        if low is not None:
+            conditions.append(f"{column} >= {low}")
+        if high is not None:
+            conditions.append(f"{column} < {high}")
+        cases.append(f"WHEN {' AND '.join(conditions)} THEN '{label}'")
+    return f"CASE WHEN {column} IS NULL THEN '{UNPRICED_BAND}' {' '.join(cases)} END"
+
+class StatisticsService:
+    """
+    Dashboard aggregates computed in a single statement and cached per
+    process until the catalogue data version changes. Each request costs
+    one primary-key read of catalogue_versions while the data is unchanged.
+    """
+
+    def __init__(self, top_countries: int = 10):
+        self.top_countries = top_countries
+        self._snapshot: Optional[Dict[str, Any]] = None
+        self._version: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def get_snapshot(self, engine) -> Dict[str, Any]:
+        with engine.connect() as conn:
+            version = data_version(conn)
+            if version is not None and version == self._version:
+                return self._snapshot
+
+            # One worker thread recomputes; the rest wait and reuse its snapshot
+            with self._lock:
+                if version is not None and version == self._version:
+                    return self._snapshot
+                snapshot = self._compute(conn)
+                snapshot['data_version'] = version
+                self._snapshot, self._version = snapshot, version
+                return snapshot
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._snapshot = self._version = None
+
+    def _compute(self, conn) -> Dict[str, Any]:
+        rows = conn.execute(text(f"""
+            WITH component_stats AS (
+                SELECT
+                    GROUPING(cat.name, s.country, band.price_band) AS grouping_id,
+                    cat.name AS category, s.country, band.price_band,
+                    COUNT(c.id) AS count,
+                    AVG((c.price_min + c.price_max) / 2) AS avg_price
+                FROM categories cat
+                LEFT JOIN components c ON c.category_id = cat.id AND c.is_active = true
+                LEFT JOIN suppliers s ON s.id = c.supplier_id
+                CROSS JOIN LATERAL (
+                    SELECT CASE WHEN c.id IS NULL THEN NULL ELSE {price_band_sql()} END AS price_band
+                ) band
+                GROUP BY GROUPING SETS ((cat.name), (s.country), (band.price_band), ())
+            ),
+            supplier_stats AS (
+                SELECT GROUPING(country) AS grouping_id, country, COUNT(*) AS count
+                FROM suppliers
+                GROUP BY GROUPING SETS ((country), ())
+            ),
+            relationship_stats AS (
+                SELECT GROUPING(relationship_type) AS grouping_id, relationship_type, COUNT(*) AS count
+                FROM supply_chain_relationships
+                GROUP BY GROUPING SETS ((relationship_type), ())
+            )
+            SELECT CASE grouping_id WHEN 3 THEN 'category' WHEN 5 THEN 'country'
+                                    WHEN 6 THEN 'price_band' ELSE 'components' END AS dimension,
+                   COALESCE(category, country, price_band) AS key, count, avg_price
+            FROM component_stats
+            UNION ALL
+            SELECT CASE grouping_id WHEN 0 THEN 'supplier_country' ELSE 'suppliers' END,
+                   country, count, NULL
+            FROM supplier_stats
+            UNION ALL
+            SELECT CASE grouping_id WHEN 0 THEN 'relationship_type' ELSE 'relationships' END,
+                   relationship_type, count, NULL
+            FROM relationship_stats
+        """)).fetchall()
+
+        categories, component_countries, price_bands, supplier_countries, relationship_types = [], {}, {}, {}, []
+        totals = {'total_components': 0, 'total_suppliers': 0, 'total_categories': 0, 'total_relationships': 0}
+
+        for row in rows:
+            if row.dimension == 'category':
+                categories.append({
+                    'name': row.key,
+                    'count': row.count,
+                    'avg_price': round(float(row.avg_price), 2) if row.avg_price is not None else None
+                })
+            elif row.dimension == 'country':
+                # Rows of empty categories carry no supplier; only real components count here
+                if row.count:
+                    component_countries[row.key] = row.count
+            elif row.dimension == 'price_band':
+                if row.key is not None:
+                    price_bands[row.key] = row.count
+            elif row.dimension == 'components':
+                totals['total_components'] = row.count
+            elif row.dimension == 'supplier_country':
+                supplier_countries[row.key] = row.count
+            elif row.dimension == 'suppliers':
+                totals['total_suppliers'] = row.count
+            elif row.dimension == 'relationship_type':
+                relationship_types.append({'type': row.key, 'count': row.count})
+            elif row.dimension == 'relationships':
+                totals['total_relationships'] = row.count
+
+        totals['total_categories'] = len(categories)
+        categories.sort(key=lambda c: c['count'], reverse=True)
+        relationship_types.sort(key=lambda r: r['count'], reverse=True)
+
+        countries = [
+            {'country': country, 'count': component_countries.get(country, 0), 'suppliers': suppliers}
+            for country, suppliers in supplier_countries.items()
+        ]
+        countries.sort(key=lambda c: c['count'], reverse=True)
+
+        return {
+            'totals': totals,
+            'categories': categories,
+            'countries': countries[:self.top_countries],
+            'price_bands': [
+                {'band': label, 'count': price_bands.get(label, 0)}
+                for label in [band[0] for band in PRICE_BANDS] + [UNPRICED_BAND]
+            ],
+            'relationship_types': relationship_types,
+            'computed_at': datetime.now().isoformat()
+        }
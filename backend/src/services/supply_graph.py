@@ -0,0 +1,303 @@
+import math
+import threading
+from array import array
+from datetime import datetime
+from typing import Callable, Dict, Any, Iterable, List, Optional, Tuple
+from sqlalchemy import text
+from src.services.data_version import table_versions, version_token
+import logging
+
+logger = logging.getLogger(__name__)
+
+NODE_TYPES = ('supplier', 'category', 'component', 'vehicle_model')
+SUPPLIER, CATEGORY, COMPONENT, VEHICLE_MODEL = range(len(NODE_TYPES))
+
+# Edges implied by catalogue columns rather than stored in supply_chain_relationships
+CATALOGUE_SUPPLIER = 'catalogue_supplier'  # suppliers.id -> components.supplier_id
+FITS = 'fits'                              # component_compatibility: component -> vehicle model
+
+# source name -> (tables it reads, query); each source is re-read only when one of its tables changes.
+# Nodes are read in id order so node numbering only moves when rows are added or removed.
+GRAPH_SOURCES = {
+    'suppliers': (('suppliers',), "SELECT id, country FROM suppliers ORDER BY id"),
+    'categories': (('categories',), "SELECT id FROM categories ORDER BY id"),
+    'components': (('components',), """
+        SELECT id, supplier_id, category_id, price_min, price_max
+        FROM components WHERE is_active = true ORDER BY id
+    """),
+    'vehicle_models': (('vehicle_models',), "SELECT id, manufacturer_id FROM vehicle_models ORDER BY id"),
+    'relationships': (('supply_chain_relationships',), """
+        SELECT source_type, source_id, target_type, target_id, relationship_type, relationship_strength
+        FROM supply_chain_relationships
+    """),
+    'compatibility': (('component_compatibility',), """
+        SELECT component_id, vehicle_model_id FROM component_compatibility
+    """),
+}
+
+# node type -> query returning (id, name) for the ids in :ids
+NODE_NAME_QUERIES = {
+    'supplier': "SELECT id, name FROM suppliers WHERE id = ANY(:ids)",
+    'category': "SELECT id, name FROM categories WHERE id = ANY(:ids)",
+    'component': "SELECT id, part_name AS name FROM components WHERE id = ANY(:ids)",
+    'vehicle_model': """
+        SELECT vm.id, vmf.name || ' ' || vm.model_name AS name
+        FROM vehicle_models vm JOIN vehicle_manufacturers vmf ON vmf.id = vm.manufacturer_id
+        WHERE vm.id = ANY(:ids)
+    """,
+}
+
+def node_names(conn, keys: Iterable[Tuple[str, int]]) -> Dict[Tuple[str, int], str]:
+    """Display names for (type, id) node keys, one query per node type present"""
+    ids_by_type: Dict[str, set] = {}
+    for node_type, node_id in keys:
+        ids_by_type.setdefault(node_type, set()).add(node_id)
+    names = {}
+    for node_type, ids in ids_by_type.items():
+        for row in conn.execute(text(NODE_NAME_QUERIES[node_type]), {'ids': list(ids)}):
+            names[(node_type, row.id)] = row.name
+    return names
+
+def strongly_connected(successors: List[List[int]]) -> Tuple[array, int]:
+    """Iterative Tarjan; components are numbered in reverse topological order"""
+    count = len(successors)
+    index = array('i', [-1]) * count
+    low = array('i', [0]) * count
+    component = array('i', [-1]) * count
+    on_stack = bytearray(count)
+    stack: List[int] = []
+    counter = components = 0
+
+    for root in range(count):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, position = work[-1]
+            if position == 0 and index[node] == -1:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = 1
+
+            edges = successors[node]
+            if position < len(edges):
+                work[-1] = (node, position + 1)
+                target = edges[position]
+                if index[target] == -1:
+                    work.append((target, 0))
+                elif on_stack[target] and index[target] < low[node]:
+                    low[node] = index[target]
+                continue
+
+            work.pop()
+            if low[node] == index[node]:
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = 0
+                    component[member] = components
+                    if member == node:
+                        break
+                components += 1
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+
+    return component, components
+
+class SupplyGraph:
+    """
+    Read-only snapshot of the catalogue as a typed, directed multigraph.
+    Nodes are interned to dense indices; edges are parallel arrays so a
+    100k-component catalogue stays in a few tens of megabytes. Edges whose
+    ends are missing or inactive are dropped.
+    """
+
+    def __init__(self, rows: Dict[str, List[tuple]], version: Optional[str] = None):
+        self.version = version
+        self.built_at = datetime.now().isoformat()
+        self.keys: List[Tuple[str, int]] = []
+        self.index: Dict[Tuple[str, int], int] = {}
+        self.node_type = array('b')
+        # Per node; -1 where not applicable
+        self.supplier_of = array('i')
+        self.category_of = array('i')
+        # Supplier country for supplier and component nodes, as an index into countries
+        self.countries: List[str] = []
+        self.country_of = array('i')
+        country_ids: Dict[str, int] = {}
+        # Component unit price range; NaN for other nodes and unpriced components
+        self.price_min = array('d')
+        self.price_max = array('d')
+
+        self.relationship_types: List[str] = []
+        self._type_ids: Dict[str, int] = {}
+        self.edge_source = array('i')
+        self.edge_target = array('i')
+        self.edge_type = array('h')
+        self.edge_strength = array('d')  # NaN when unknown
+
+        for supplier_id, country in rows['suppliers']:
+            node = self._add_node(SUPPLIER, supplier_id)
+            if country:
+                if country not in country_ids:
+                    country_ids[country] = len(self.countries)
+                    self.countries.append(country)
+                self.country_of[node] = country_ids[country]
+        for (category_id,) in rows['categories']:
+            self._add_node(CATEGORY, category_id)
+        for component_id, supplier_id, category_id, price_min, price_max in rows['components']:
+            node = self._add_node(COMPONENT, component_id)
+            self.price_min[node] = float(price_min) if price_min is not None else math.nan
+            self.price_max[node] = float(price_max) if price_max is not None else math.nan
+            self.supplier_of[node] = self.index.get(('supplier', supplier_id), -1)
+            self.category_of[node] = self.index.get(('category', category_id), -1)
+            if self.supplier_of[node] >= 0:
+                self.country_of[node] = self.country_of[self.supplier_of[node]]
+        for model_id, _ in rows['vehicle_models']:
+            self._add_node(VEHICLE_MODEL, model_id)
+
+        seen = set()
+        for source_type, source_id, target_type, target_id, relationship_type, strength in rows['relationships']:
+            self._add_edge(seen, (source_type, source_id), (target_type, target_id),
+                           relationship_type or 'related', strength)
+        for node in range(len(self.keys)):
+            if self.node_type[node] == COMPONENT and self.supplier_of[node] >= 0:
+                self._add_edge_index(seen, self.supplier_of[node], node, CATALOGUE_SUPPLIER, None)
+        for component_id, model_id in rows['compatibility']:
+            self._add_edge(seen, ('component', component_id), ('vehicle_model', model_id), FITS, None)
+
+    def _add_node(self, node_type: int, node_id: int) -> int:
+        key = (NODE_TYPES[node_type], node_id)
+        node = len(self.keys)
+        self.keys.append(key)
+        self.index[key] = node
+        self.node_type.append(node_type)
+        self.supplier_of.append(-1)
+        self.category_of.append(-1)
+        self.country_of.append(-1)
+        self.price_min.append(math.nan)
+        self.price_max.append(math.nan)
+        return node
+
+    def _add_edge(self, seen, source_key, target_key, relationship_type, strength) -> None:
+        source, target = self.index.get(source_key), self.index.get(target_key)
+        if source is not None and target is not None:
+            self._add_edge_index(seen, source, target, relationship_type, strength)
+
+    def _add_edge_index(self, seen, source, target, relationship_type, strength) -> None:
+        type_id = self._type_ids.get(relationship_type)
+        if type_id is None:
+            type_id = self._type_ids[relationship_type] = len(self.relationship_types)
+            self.relationship_types.append(relationship_type)
+        edge_key = (source, target, type_id)
+        if edge_key in seen:
+            return
+        seen.add(edge_key)
+        self.edge_source.append(source)
+        self.edge_target.append(target)
+        self.edge_type.append(type_id)
+        self.edge_strength.append(float(strength) if strength is not None else math.nan)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.edge_source)
+
+    def node(self, node_type: str, node_id: int) -> Optional[int]:
+        return self.index.get((node_type, node_id))
+
+    def count(self, node_type: int) -> int:
+        return self.node_type.count(node_type)
+
+    def edges_of_types(self, relationship_types: Iterable[str]) -> List[int]:
+        """Indices of edges whose relationship type is in relationship_types"""
+        wanted = {self._type_ids[t] for t in relationship_types if t in self._type_ids}
+        return [edge for edge, type_id in enumerate(self.edge_type) if type_id in wanted]
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'nodes': {name: self.count(node_type) for node_type, name in enumerate(NODE_TYPES)},
+            'edges': self.edge_count,
+            'data_version': self.version,
+            'built_at': self.built_at,
+        }
+
+class SupplyGraphCache:
+    """
+    Process-wide SupplyGraph, rebuilt when the catalogue data version
+    changes. Only the sources whose tables changed are re-read from the
+    database; the others are reused from the previous build. Analytics
+    services keep the indexes they derive from the graph here too (see
+    derived), so each is rebuilt once per graph.
+    """
+
+    def __init__(self):
+        self._graph: Optional[SupplyGraph] = None
+        self._rows: Dict[str, List[tuple]] = {}
+        self._source_versions: Dict[str, Tuple] = {}
+        self._lock = threading.Lock()
+        # name -> (graph, index built from it); one build lock per name
+        self._derived: Dict[str, Tuple[SupplyGraph, Any]] = {}
+        self._derived_locks: Dict[str, threading.Lock] = {}
+
+    def get(self, engine) -> SupplyGraph:
+        with engine.connect() as conn:
+            versions = table_versions(conn)
+            token = version_token(versions)
+            if token is not None and self._graph is not None and token == self._graph.version:
+                return self._graph
+
+            # One worker thread rebuilds; the rest wait and reuse its graph
+            with self._lock:
+                if token is not None and self._graph is not None and token == self._graph.version:
+                    return self._graph
+
+                reloaded = []
+                for source, (tables, query) in GRAPH_SOURCES.items():
+                    source_version = tuple(versions.get(t) for t in tables) if versions else None
+                    if source_version is None or source not in self._rows or \
+                            self._source_versions.get(source) != source_version:
+                        self._rows[source] = [tuple(row) for row in conn.execute(text(query))]
+                        self._source_versions[source] = source_version
+                        reloaded.append(source)
+
+                self._graph = SupplyGraph(self._rows, token)
+                logger.info(f"Supply graph rebuilt ({len(self._graph)} nodes, {self._graph.edge_count} edges; "
+                            f"reloaded {', '.join(reloaded) or 'nothing'})")
+                return self._graph
+
+    def derived(self, engine, name: str, factory: Callable[[SupplyGraph, Optional[Any]], Any]) -> Any:
+        """
+        The index called name for the current graph. When the graph has
+        changed, factory(graph, previous) builds a new one, where previous
+        is the index built from the last graph (None the first time) for
+        factories that update incrementally. Concurrent callers wait for
+        that single build and share its result.
+        """
+        graph = self.get(engine)
+        entry = self._derived.get(name)
+        if entry is not None and entry[0] is graph:
+            return entry[1]
+
+        with self._lock:
+            lock = self._derived_locks.setdefault(name, threading.Lock())
+        with lock:
+            entry = self._derived.get(name)
+            if entry is None or entry[0] is not graph:
+                entry = (graph, factory(graph, entry[1] if entry is not None else None))
+                self._derived[name] = entry
+            return entry[1]
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._graph = None
+            self._rows.clear()
+            self._source_versions.clear()
+            self._derived.clear()
+
+# Shared by the graph analytics services so the catalogue is loaded once per process
+supply_graph_cache = SupplyGraphCache()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Deterministic synthetic catalogue generator for RE4DY Supply Chain data
+Produces suppliers, components, supplier and component relationships,
+vehicle models and compatibility rows at any scale with production-like
+shapes: power-law supplier fan-out, tiered assembly chains with skewed
+parent in-degree, dual sourcing and a long tail of vehicle fitments.
+The same parameters and seed always yield the same rows, which are
+streamed through the bulk-load path.
+"""
+
+import time
+import random
+import logging
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from sqlalchemy import text
+from bulk_load import (
+    bulk_load_components, bulk_load_relationships, bulk_load_supply_edges,
+    bulk_load_vehicle_models, bulk_load_compatibility
+)
+
+# Set up logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEED = 42
+
+CATEGORIES = [
+    ('Braking System', ['Brake Calipers', 'Brake Pads', 'Brake Discs', 'ABS Systems']),
+    ('Engine', ['Fuel Injection', 'Pistons', 'Turbochargers', 'Ignition', 'Timing']),
+    ('Transmission', ['Automatic Transmission', 'Manual Transmission', 'Transfer Cases', 'Clutches']),
+    ('Suspension', ['Shock Absorbers', 'Steering', 'Air Suspension', 'Wheel Bearings']),
+    ('Electrical', ['Engine Control', 'Displays', 'Wiring', 'Charging', 'Starting']),
+    ('Body & Exterior', ['Body Panels', 'Lighting', 'Mirrors', 'Bumpers']),
+    ('Interior', ['Seating', 'Dashboard', 'Console', 'HVAC']),
+    ('Exhaust System', ['Emission Control', 'Manifolds', 'Silencers']),
+    ('Cooling System', ['Radiators', 'Water Pumps', 'Thermostats', 'Cooling Fans']),
+    ('Fuel System', ['Fuel Pumps', 'Fuel Rails', 'Fuel Filters']),
+]
+COUNTRIES = ['Germany', 'Japan', 'United States', 'China', 'France', 'South Korea', 'Italy',
+             'United Kingdom', 'Mexico', 'Canada', 'Spain', 'Czech Republic', 'India', 'Ireland']
+SUPPLIER_STEMS = ['Apex', 'Nordic', 'Vector', 'Helix', 'Atlas', 'Orion', 'Titan', 'Kestrel',
+                  'Meridian', 'Summit', 'Falcon', 'Pioneer', 'Zenith', 'Crest', 'Vertex']
+SUPPLIER_FORMS = ['Automotive', 'Components', 'Systems', 'Technologies', 'Industries', 'Precision']
+ADJECTIVES = ['Lightweight', 'Heavy-Duty', 'High-Performance', 'Compact', 'Electric',
+              'Forged', 'Ventilated', 'Adaptive', 'Sealed', 'Reinforced']
+# Assembly tiers from raw part (0) upwards; each tier feeds the next via part_of edges
+TIER_NAMES = ['Part', 'Sub-assembly', 'Assembly', 'Module', 'System', 'Platform', 'Architecture', 'Programme']
+CROSS_LINK_TYPES = ['compatible', 'alternative', 'requires', 'works_with']
+MANUFACTURERS = [
+    ('Volkswagen', 'Germany'), ('Toyota', 'Japan'), ('Stellantis', 'Netherlands'), ('Hyundai', 'South Korea'),
+    ('General Motors', 'United States'), ('Ford', 'United States'), ('BMW', 'Germany'),
+    ('Mercedes-Benz', 'Germany'), ('Renault', 'France'), ('Honda', 'Japan'), ('Nissan', 'Japan'),
+    ('Geely', 'China'), ('BYD', 'China'), ('Tata Motors', 'India'), ('Volvo Cars', 'Sweden'),
+]
+VEHICLE_TYPES = ['Sedan', 'SUV', 'Hatchback', 'Estate', 'Pickup', 'Van', 'Coupe']
+
+def _zipf_cumulative(count, alpha):
+    """Cumulative weights for picking rank i with probability proportional to 1 / (i + 1) ** alpha"""
+    return list(accumulate(1 / (rank + 1) ** alpha for rank in range(count)))
+
+def _pick(rng, cumulative):
+    return bisect_left(cumulative, rng.random() * cumulative[-1])
+
+class SyntheticCatalogue:
+    """
+    Seeded catalogue description. Per-component attributes (supplier, tier,
+    category) are drawn once in __init__; each *_rows() method replays its
+    own seeded stream, so any stream can be regenerated independently.
+    """
+
+    def __init__(self, components, seed=DEFAULT_SEED, suppliers=None, depth=6, supplier_alpha=1.1,
+                 cross_links=1.0, dual_source_rate=0.15, vehicle_models=None, parent_skew=2.5):
+        if depth < 1 or depth > len(TIER_NAMES):
+            raise ValueError(f"depth must be between 1 and {len(TIER_NAMES)}")
+
+        self.components = components
+        self.seed = seed
+        self.suppliers = suppliers or max(20, components // 250)
+        self.depth = depth
+        self.cross_links = cross_links
+        self.dual_source_rate = dual_source_rate
+        self.vehicle_models = vehicle_models or max(30, components // 400)
+        self.parent_skew = parent_skew
+
+        rng = random.Random(seed)
+        self._supplier_weights = _zipf_cumulative(self.suppliers, supplier_alpha)
+        self._supplier_country = [rng.choice(COUNTRIES) for _ in range(self.suppliers)]
+        self._supplier_name = [
+            f"{SUPPLIER_STEMS[i % len(SUPPLIER_STEMS)]} {SUPPLIER_FORMS[(i // len(SUPPLIER_STEMS)) % len(SUPPLIER_FORMS)]} {i:05d}"
+            for i in range(self.suppliers)
+        ]
+
+        # Each tier is roughly 45% the size of the one below it
+        tier_weights = list(accumulate(0.45 ** tier for tier in range(depth)))
+        self._tier = array('b', (bisect_left(tier_weights, rng.random() * tier_weights[-1])
+                                 for _ in range(components)))
+        self._supplier = array('i', (_pick(rng, self._supplier_weights) for _ in range(components)))
+        self._category = array('b', (rng.randrange(len(CATEGORIES)) for _ in range(components)))
+
+        self._tier_members = [array('i') for _ in range(depth)]
+        for index, tier in enumerate(self._tier):
+            self._tier_members[tier].append(index)
+
+    @staticmethod
+    def part_number(index):
+        return f"SYN-{index:07d}"
+
+    def _stream(self, offset):
+        return random.Random(self.seed * 7919 + offset)
+
+    def component_rows(self):
+        """Rows in bulk_load.COMPONENT_COLUMNS order"""
+        rng = self._stream(1)
+        for index in range(self.components):
+            tier = self._tier[index]
+            category, subcategories = CATEGORIES[self._category[index]]
+            subcategory = rng.choice(subcategories)
+            supplier = self._supplier[index]
+            # Higher tiers are larger assemblies and cost more
+            price_min = round(rng.lognormvariate(3.5 + 0.9 * tier, 0.8), 2)
+            yield (
+                f"{rng.choice(ADJECTIVES)} {subcategory} {TIER_NAMES[tier]} {index}",
+                self.part_number(index),
+                subcategory,
+                f"Tier {tier} {TIER_NAMES[tier].lower()} for {category.lower()} ({subcategory.lower()})",
+                f"Synthetic specification {index}; tier {tier}",
+                price_min,
+                round(price_min * rng.uniform(1.1, 1.8), 2),
+                'EUR',
+                self._supplier_name[supplier],
+                self._supplier_country[supplier],
+                f"https://supplier-{supplier:05d}.example.com",
+                category,
+                None,
+            )
+
+    def relationship_rows(self):
+        """
+        Component edges in bulk_load.RELATIONSHIP_COLUMNS order: every
+        component below the top tier is part_of one parent in the next tier
+        (parents chosen with a skew that gives power-law in-degree), plus
+        about cross_links lateral edges per component within its tier.
+        """
+        rng = self._stream(2)
+        top = self.depth - 1
+        for index in range(self.components):
+            tier = self._tier[index]
+            if tier < top and self._tier_members[tier + 1]:
+                parents = self._tier_members[tier + 1]
+                parent = parents[int(len(parents) * rng.random() ** self.parent_skew)]
+                yield (self.part_number(index), self.part_number(parent), 'part_of',
+                       round(rng.uniform(0.6, 1.0), 2))
+
+            peers = self._tier_members[tier]
+            links = int(rng.expovariate(1 / self.cross_links)) if self.cross_links > 0 else 0
+            for _ in range(links):
+                peer = peers[rng.randrange(len(peers))]
+                if peer != index:
+                    yield (self.part_number(index), self.part_number(peer), rng.choice(CROSS_LINK_TYPES),
+                           round(rng.uniform(0.3, 0.9), 2))
+
+    def supply_rows(self):
+        """Supplier edges in bulk_load.SUPPLY_COLUMNS order: primary supplier plus occasional second source"""
+        rng = self._stream(3)
+        for index in range(self.components):
+            volume = int(rng.lognormvariate(8, 1.5))
+            unit_price = rng.lognormvariate(3.5 + 0.9 * self._tier[index], 0.8)
+            supplier = self._supplier[index]
+            yield (self._supplier_name[supplier], self.part_number(index), 'supplies',
+                   round(rng.uniform(0.7, 1.0), 2), volume, round(volume * unit_price, 2))
+
+            if rng.random() < self.dual_source_rate:
+                second = _pick(rng, self._supplier_weights)
+                if second != supplier:
+                    share = int(volume * rng.uniform(0.1, 0.4))
+                    yield (self._supplier_name[second], self.part_number(index), 'second_source',
+                           round(rng.uniform(0.3, 0.7), 2), share, round(share * unit_price, 2))
+
+    def vehicle_model_rows(self):
+        """Rows in bulk_load.VEHICLE_MODEL_COLUMNS order"""
+        rng = self._stream(4)
+        maker_weights = _zipf_cumulative(len(MANUFACTURERS), 0.8)
+        for model in range(self.vehicle_models):
+            maker, country = MANUFACTURERS[_pick(rng, maker_weights)]
+            start = rng.randint(2005, 2024)
+            yield (maker, country, f"Model {model:04d}", start, start + rng.randint(4, 9),
+                   rng.choice(VEHICLE_TYPES), f"G{rng.randint(1, 4)}")
+
+    def compatibility_rows(self):
+        """
+        Rows in bulk_load.COMPATIBILITY_COLUMNS order for the top two tiers.
+        Fitments per component follow a Pareto tail; popular models attract
+        most fitments.
+        """
+        rng = self._stream(5)
+        models = list(self.vehicle_model_rows())
+        model_weights = _zipf_cumulative(len(models), 0.9)
+        for index in range(self.components):
+            if self._tier[index] < max(0, self.depth - 2):
+                continue
+            fitments = min(len(models), int(rng.paretovariate(1.5)))
+            chosen = set()
+            for _ in range(fitments):
+                chosen.add(_pick(rng, model_weights))
+            for model in sorted(chosen):
+                yield (self.part_number(index), models[model][0], models[model][2])
+
+def load_synthetic_catalogue(engine, catalogue):
+    """Stream every part of the synthetic catalogue through the bulk-load path; returns stats"""
+    started = time.monotonic()
+    stats = {
+        'components': bulk_load_components(engine, catalogue.component_rows()),
+        'supply_edges': bulk_load_supply_edges(engine, catalogue.supply_rows()),
+        'relationships': bulk_load_relationships(engine, catalogue.relationship_rows()),
+        'vehicle_models': bulk_load_vehicle_models(engine, catalogue.vehicle_model_rows()),
+        'compatibility': bulk_load_compatibility(engine, catalogue.compatibility_rows()),
+    }
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE"))
+
+    stats['seconds'] = round(time.monotonic() - started, 2)
+    logger.info(f"Loaded synthetic catalogue of {catalogue.components} components "
+                f"(seed {catalogue.seed}) in {stats['seconds']}s")
+    return stats
@@ -0,0 +1,90 @@
+import numpy as np
+from src.services import bom_costs
+from src.services.bom_costs import CostIndex
+from tests.conftest import build_graph
+
+def _graph(bolt_price=5):
+    # Assembly 1 contains 2 and 3, which both contain bolt 4 (shared, so counted once per use);
+    # 3 also contains unpriced part 5. 6 and 7 require each other.
+    components = [
+        (1, None, None, 10, 12),
+        (2, None, None, 1, 2),
+        (3, None, None, 3, 3),
+        (4, None, None, bolt_price, bolt_price),
+        (5, None, None, None, None),
+        (6, None, None, 2, 2),
+        (7, None, None, 4, 4),
+    ]
+    return build_graph(
+        components=components,
+        relationships=[
+            ('component', 2, 'component', 1, 'part_of', None),
+            ('component', 1, 'component', 3, 'requires', None),
+            ('component', 4, 'component', 2, 'part_of', None),
+            ('component', 3, 'component', 4, 'requires', None),
+            ('component', 5, 'component', 3, 'part_of', None),
+            ('component', 6, 'component', 7, 'requires', None),
+            ('component', 7, 'component', 6, 'requires', None),
+            # Not a BOM relationship
+            ('component', 1, 'component', 6, 'connects', None),
+        ],
+    )
+
+def test_roll_up_sums_shared_sub_assemblies_per_use():
+    graph = _graph()
+    index = CostIndex(graph)
+    assembly = index.roll_up(graph.node('component', 1))
+    # 10 + (1 + 5) + (3 + 5 + unpriced) and 12 + (2 + 5) + (3 + 5)
+    assert assembly['rollup'] == {'min': 24.0, 'max': 27.0}
+    assert assembly['parts'] == 6
+    assert assembly['unpriced_parts'] == 1
+    assert assembly['depth'] == 3
+    assert assembly['cycle_members'] is None
+
+def test_leaf_roll_up_is_its_own_price():
+    graph = _graph()
+    bolt = CostIndex(graph).roll_up(graph.node('component', 4))
+    assert bolt['rollup'] == {'min': 5.0, 'max': 5.0}
+    assert bolt['parts'] == 1
+    assert bolt['depth'] == 1
+
+def test_cycle_rolls_up_as_one_assembly():
+    graph = _graph()
+    index = CostIndex(graph)
+    first, second = index.roll_up(graph.node('component', 6)), index.roll_up(graph.node('component', 7))
+    assert first == {**second, 'price': first['price']}
+    assert first['rollup'] == {'min': 6.0, 'max': 6.0}
+    assert first['cycle_members'] == 2
+
+def test_sub_components_most_expensive_first():
+    graph = _graph()
+    index = CostIndex(graph)
+    children = index.sub_components(graph.node('component', 1), limit=5)
+    assert [graph.keys[node][1] for node, _ in children] == [3, 2]
+
+def test_price_change_recomputes_only_ancestors(monkeypatch):
+    # Small enough that any change would otherwise cross the full-recompute share
+    monkeypatch.setattr(bom_costs, 'FULL_RECOMPUTE_SHARE', 1.0)
+    index = CostIndex(_graph())
+    repriced = _graph(bolt_price=7)
+    assert index.same_structure(repriced)
+
+    updated = index.with_prices(repriced)
+    assert updated.build['mode'] == 'incremental'
+    # The bolt, both sub-assemblies and the top assembly; not the 6 <-> 7 cycle
+    assert updated.build['recomputed'] == 4
+    assert np.allclose(updated.total, CostIndex(repriced).total)
+    assert updated.roll_up(repriced.node('component', 1))['rollup'] == {'min': 28.0, 'max': 31.0}
+    # The original index is left as it was
+    assert index.roll_up(repriced.node('component', 1))['rollup'] == {'min': 24.0, 'max': 27.0}
+
+def test_wide_price_change_recomputes_everything():
+    index = CostIndex(_graph())
+    updated = index.with_prices(_graph(bolt_price=7))
+    assert updated.build['recomputed'] == index.scc_count
+    assert np.allclose(updated.total, CostIndex(_graph(bolt_price=7)).total)
+
+def test_structure_change_is_detected():
+    graph = _graph()
+    rows = build_graph(components=[(1, None, None, 10, 12), (2, None, None, 1, 2)])
+    assert not CostIndex(graph).same_structure(rows)
@@ -0,0 +1,85 @@
+from src.services.impact import ImpactIndex, DEPENDENCY_DIRECTIONS
+from src.services.supply_graph import COMPONENT, SUPPLIER, VEHICLE_MODEL
+from tests.conftest import build_graph
+
+def _graph():
+    # Supplier 1 makes part 10 and supplier 2 part 11; both are part of assembly 12,
+    # which fits vehicle 100 and controls the 14 <-> 15 control loop. 16 requires 10;
+    # 13 is only an alternative to 10, which does not propagate failures.
+    return build_graph(
+        suppliers=[(1, 'DE'), (2, 'FR')],
+        categories=[(1,)],
+        components=[(10, 1, 1, 1, 2), (11, 2, 1, 1, 2), (12, None, 1, 5, 6), (13, None, 1, 1, 2),
+                    (14, None, 1, 1, 2), (15, None, 1, 1, 2), (16, None, 1, 1, 2)],
+        vehicle_models=[(100, 1)],
+        relationships=[
+            ('component', 10, 'component', 12, 'part_of', 0.9),
+            ('component', 11, 'component', 12, 'part_of', 0.9),
+            ('component', 12, 'component', 14, 'controls', None),
+            ('component', 14, 'component', 15, 'controls', None),
+            ('component', 15, 'component', 14, 'controls', None),
+            ('component', 16, 'component', 10, 'requires', None),
+            ('component', 13, 'component', 10, 'alternative', None),
+        ],
+        compatibility=[(12, 100)],
+    )
+
+def _brute_force_reach(graph, starts):
+    successors = {node: [] for node in range(len(graph))}
+    for edge in graph.edges_of_types(DEPENDENCY_DIRECTIONS):
+        source, target = graph.edge_source[edge], graph.edge_target[edge]
+        if DEPENDENCY_DIRECTIONS[graph.relationship_types[graph.edge_type[edge]]] == 'reverse':
+            source, target = target, source
+        successors[source].append(target)
+    seen, stack = set(starts), list(starts)
+    while stack:
+        for target in successors[stack.pop()]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
+
+def _ids(graph, nodes):
+    return {graph.keys[node][1] for node in nodes}
+
+def test_supplier_failure_reaches_assemblies_vehicles_and_cycles():
+    graph = _graph()
+    index = ImpactIndex(graph)
+    label = index.reach([graph.node('supplier', 1)])
+
+    assert _ids(graph, index.members(label, COMPONENT)) == {10, 12, 14, 15, 16}
+    assert _ids(graph, index.members(label, VEHICLE_MODEL)) == {100}
+    assert index.count(label, COMPONENT) == 5
+    assert index.count(label, SUPPLIER) == 1
+
+def test_peer_relationships_do_not_propagate():
+    graph = _graph()
+    index = ImpactIndex(graph)
+    label = index.reach([graph.node('component', 13)])
+    assert _ids(graph, index.members(label, COMPONENT)) == {13}
+
+def test_cycle_members_share_reach():
+    graph = _graph()
+    index = ImpactIndex(graph)
+    assert index.component[graph.node('component', 14)] == index.component[graph.node('component', 15)]
+    label = index.reach([graph.node('component', 15)])
+    assert _ids(graph, index.members(label, COMPONENT)) == {14, 15}
+
+def test_matches_brute_force_for_every_failure_set():
+    graph = _graph()
+    index = ImpactIndex(graph)
+    for starts in [[node] for node in range(len(graph))] + [[0, 1], [2, 5, 8]]:
+        expected = _brute_force_reach(graph, starts)
+        label = index.reach(starts)
+        for node_type in (SUPPLIER, COMPONENT, VEHICLE_MODEL):
+            members = set(index.members(label, node_type))
+            assert members == {node for node in expected if graph.node_type[node] == node_type}
+            assert index.count(label, node_type) == len(members)
+
+def test_members_honours_exclude_and_limit():
+    graph = _graph()
+    index = ImpactIndex(graph)
+    failed = graph.node('component', 10)
+    label = index.reach([failed])
+    assert failed not in set(index.members(label, COMPONENT, exclude={failed}))
+    assert len(list(index.members(label, COMPONENT, limit=2))) == 2
@@ -0,0 +1,94 @@
+import time
+import pytest
+from sqlalchemy import text
+from src.services.ip_screener_cache import DatabaseCacheBackend, FileCacheBackend, IPScreenerCache
+
+QUERY = {'title': 'Brake caliper', 'summary': 'Hydraulic brake caliper', 'reference': 'RE4DY_VIS'}
+
+@pytest.fixture
+def backend(migrated_url):
+    backend = DatabaseCacheBackend(migrated_url, ttl_seconds=3600)
+    yield backend
+    backend.engine.dispose()
+
+def _write(backend, key, result=None, age_seconds=0):
+    result = result or {'component_name': key}
+    backend.write(key, time.time() - age_seconds, result, '', query=QUERY)
+
+def _row(backend, key):
+    with backend.engine.connect() as conn:
+        return conn.execute(text("""
+            SELECT hit_count, last_accessed_at, created_at FROM ip_screener_cache WHERE query_hash = :key
+        """), {'key': key}).fetchone()
+
+def test_write_and_read_round_trip(backend):
+    _write(backend, 'a', {'risk': 'low'})
+    timestamp, result, size = backend.read('a')
+    assert result == {'risk': 'low'}
+    assert size > 0
+    assert backend.read('missing') is None
+
+def test_expired_entries_are_not_read_and_are_swept(backend):
+    _write(backend, 'old', age_seconds=7200)
+    _write(backend, 'new')
+    assert backend.read('old') is None
+    assert backend.sweep(3600) == 1
+    assert backend.usage()[0] == 1
+
+def test_rewrite_restarts_hits_and_keeps_last_access(backend):
+    _write(backend, 'a')
+    backend.touch({'a': 5})
+    before = _row(backend, 'a')
+    assert before.hit_count == 5
+
+    _write(backend, 'a', {'risk': 'high'})
+    after = _row(backend, 'a')
+    assert after.hit_count == 0
+    assert after.last_accessed_at == before.last_accessed_at
+    assert after.created_at > before.created_at
+    assert backend.read('a')[1] == {'risk': 'high'}
+
+def test_refresh_candidates_rank_by_hits_within_window(backend):
+    for key, age in (('popular', 3500), ('quiet', 3500), ('fresh', 0), ('unread', 3500)):
+        _write(backend, key, age_seconds=age)
+    backend.touch({'popular': 9, 'quiet': 3, 'fresh': 20})
+
+    candidates = backend.refresh_candidates(3600, window_seconds=300, limit=10, hits={}, min_hits=2)
+    assert [c['key'] for c in candidates] == ['popular', 'quiet']
+    assert candidates[0]['title'] == QUERY['title']
+    assert candidates[0]['summary'] == QUERY['summary']
+
+def test_evict_lru_keeps_recently_read_entries(backend):
+    for key, age in (('a', 30), ('b', 20), ('c', 10)):
+        _write(backend, key, {'payload': 'x' * 100}, age_seconds=age)
+    backend.touch({'a': 1})
+
+    entries, total_bytes = backend.usage()
+    assert entries == 3
+    assert backend.evict_lru(total_bytes * 2 // 3) == 1
+    assert backend.read('b') is None
+    assert backend.read('a') is not None and backend.read('c') is not None
+
+@pytest.fixture(params=['file', 'database'])
+def shared_backend(request, tmp_path):
+    if request.param == 'file':
+        yield lambda: FileCacheBackend(str(tmp_path))
+        return
+    url = request.getfixturevalue('migrated_url')
+    backends = []
+    def make():
+        backends.append(DatabaseCacheBackend(url, ttl_seconds=3600))
+        return backends[-1]
+    yield make
+    for backend in backends:
+        backend.engine.dispose()
+
+def test_clear_reaches_other_workers_memory(shared_backend, monkeypatch):
+    monkeypatch.setenv('IPS_MEMORY_CACHE_CHECK_SECONDS', '0')
+    clearing, other = IPScreenerCache(backend=shared_backend()), IPScreenerCache(backend=shared_backend())
+    assert other.get('a') is None
+    other.set('a', {'risk': 'low'}, QUERY)
+    assert other.get('a') == {'risk': 'low'}
+
+    clearing.clear()
+    assert other.get('a') is None
@@ -0,0 +1,106 @@
+from sqlalchemy import text
+import migrate
+
+NODE_TABLES = {'supplier': 'suppliers', 'component': 'components', 'category': 'categories'}
+
+def _create_tables(conn):
+    conn.execute(text("""
+        CREATE TABLE suppliers (id SERIAL PRIMARY KEY, name VARCHAR(255));
+        CREATE TABLE categories (id SERIAL PRIMARY KEY, name VARCHAR(100));
+        CREATE TABLE components (
+            id SERIAL PRIMARY KEY,
+            supplier_id INTEGER REFERENCES suppliers(id),
+            category_id INTEGER REFERENCES categories(id),
+            part_number VARCHAR(100)
+        );
+        CREATE TABLE supply_chain_relationships (
+            id SERIAL PRIMARY KEY,
+            source_type VARCHAR(50), source_id INTEGER,
+            target_type VARCHAR(50), target_id INTEGER,
+            relationship_type VARCHAR(50)
+        );
+    """))
+
+def _edges(conn):
+    return conn.execute(text("""
+        SELECT source_type, source_id, target_type, target_id, relationship_type
+        FROM supply_chain_relationships ORDER BY id
+    """)).fetchall()
+
+def _dangling(conn):
+    return sum(conn.execute(text(f"""
+        SELECT COUNT(*) FROM supply_chain_relationships r
+        WHERE (r.source_type = :type AND r.source_id NOT IN (SELECT id FROM {table}))
+           OR (r.target_type = :type AND r.target_id NOT IN (SELECT id FROM {table}))
+    """), {'type': node_type}).scalar() for node_type, table in NODE_TABLES.items())
+
+def test_deduplicate_merges_rows_and_repoints_foreign_keys(scratch_engine):
+    with scratch_engine.begin() as conn:
+        _create_tables(conn)
+        conn.execute(text("""
+            INSERT INTO suppliers (name) VALUES ('Acme'), ('Bosch'), ('Acme');
+            INSERT INTO components (supplier_id, part_number) VALUES (1, 'P-1'), (3, 'P-2');
+        """))
+        migrate._deduplicate(conn, 'suppliers', ['name'], node_type='supplier')
+
+        assert conn.execute(text("SELECT id, name FROM suppliers ORDER BY id")).fetchall() == [(1, 'Acme'), (2, 'Bosch')]
+        assert conn.execute(text("SELECT supplier_id FROM components ORDER BY id")).scalars().all() == [1, 1]
+
+def test_deduplicate_repoints_typed_edges_of_duplicates(scratch_engine):
+    with scratch_engine.begin() as conn:
+        _create_tables(conn)
+        conn.execute(text("""
+            INSERT INTO suppliers (name) VALUES ('Acme'), ('Bosch'), ('Acme'), ('Bosch');
+            INSERT INTO categories (name) VALUES ('Brakes'), ('Brakes');
+            INSERT INTO components (supplier_id, category_id, part_number) VALUES (1, 1, 'P-1'), (3, 2, 'P-1'), (2, 1, 'P-2');
+            INSERT INTO supply_chain_relationships (source_type, source_id, target_type, target_id, relationship_type) VALUES
+                ('supplier', 1, 'supplier', 2, 'partner'),
+                ('supplier', 3, 'supplier', 4, 'partner'),
+                ('supplier', 3, 'supplier', 1, 'partner'),
+                ('supplier', 3, 'component', 3, 'supplies'),
+                ('component', 2, 'component', 3, 'part_of'),
+                ('component', 3, 'component', 1, 'part_of'),
+                ('category', 2, 'component', 1, 'contains'),
+                ('category', 1, 'component', 1, 'contains');
+        """))
+        migrate._deduplicate(conn, 'suppliers', ['name'], node_type='supplier')
+        migrate._deduplicate(conn, 'components', ['supplier_id', 'part_number'], node_type='component')
+        migrate._deduplicate(conn, 'categories', ['name'], node_type='category')
+
+        # Collisions and new self-loops are dropped; component 3 is untouched by supplier 3 merging into 1
+        assert _edges(conn) == [
+            ('supplier', 1, 'supplier', 2, 'partner'),
+            ('supplier', 1, 'component', 3, 'supplies'),
+            ('component', 1, 'component', 3, 'part_of'),
+            ('component', 3, 'component', 1, 'part_of'),
+            ('category', 1, 'component', 1, 'contains'),
+        ]
+        assert _dangling(conn) == 0
+        conn.execute(text("""
+            CREATE UNIQUE INDEX ON supply_chain_relationships
+                (source_type, source_id, target_type, target_id, relationship_type)
+        """))
+
+def test_deduplicate_leaves_untyped_relationships_to_foreign_keys(scratch_engine):
+    with scratch_engine.begin() as conn:
+        conn.execute(text("""
+            CREATE TABLE suppliers (id SERIAL PRIMARY KEY, name VARCHAR(255));
+            CREATE TABLE components (id SERIAL PRIMARY KEY, supplier_id INTEGER REFERENCES suppliers(id),
+                                     part_number VARCHAR(100));
+            CREATE TABLE supply_chain_relationships (
+                id SERIAL PRIMARY KEY,
+                source_id INTEGER REFERENCES components(id),
+                target_id INTEGER REFERENCES components(id),
+                relationship_type VARCHAR(50)
+            );
+            INSERT INTO suppliers (name) VALUES ('Acme');
+            INSERT INTO components (supplier_id, part_number) VALUES (1, 'P-1'), (1, 'P-2'), (1, 'P-1');
+            INSERT INTO supply_chain_relationships (source_id, target_id, relationship_type) VALUES (3, 2, 'part_of');
+        """))
+        migrate._deduplicate(conn, 'components', ['supplier_id', 'part_number'], node_type='component')
+        assert conn.execute(text("SELECT source_id, target_id FROM supply_chain_relationships")).fetchall() == [(1, 2)]
+
+def test_migrate_builds_an_empty_schema_once(scratch_engine):
+    applied = migrate.migrate(scratch_engine)
+    assert applied == [version for version, _, _ in migrate.MIGRATIONS]
+    assert migrate.migrate(scratch_engine) == []
@@ -0,0 +1,57 @@
+from src.services.paths import PathFinder
+from tests.conftest import build_graph
+
+def _graph():
+    # Three routes from part 1 into assembly 4: strong via 2, weaker via 3, and a direct weak link
+    return build_graph(
+        components=[(component_id, None, None, None, None) for component_id in (1, 2, 3, 4, 5)],
+        relationships=[
+            ('component', 1, 'component', 2, 'part_of', 0.9),
+            ('component', 2, 'component', 4, 'part_of', 0.9),
+            ('component', 1, 'component', 3, 'part_of', 0.5),
+            ('component', 3, 'component', 4, 'part_of', 0.5),
+            ('component', 1, 'component', 4, 'part_of', 0.1),
+            ('component', 5, 'component', 4, 'alternative', 0.8),
+        ],
+    )
+
+def _route(path):
+    return [node['id'] for node in path['nodes']]
+
+def test_strength_ranks_the_strongest_chain_first():
+    graph = _graph()
+    result = PathFinder(graph).find(graph.node('component', 1), graph.node('component', 4), k=3)
+    assert result['status'] == 'ok'
+    assert [_route(path) for path in result['paths']] == [[1, 2, 4], [1, 3, 4], [1, 4]]
+    costs = [path['cost'] for path in result['paths']]
+    assert costs == sorted(costs)
+    assert result['paths'][0]['strength'] == 0.81
+
+def test_hops_prefers_the_direct_link():
+    graph = _graph()
+    result = PathFinder(graph).find(graph.node('component', 1), graph.node('component', 4), weight='hops')
+    assert [_route(path) for path in result['paths']] == [[1, 4]]
+    assert result['paths'][0]['hops'] == 1
+
+def test_downstream_follows_direction_and_any_does_not():
+    graph = _graph()
+    finder = PathFinder(graph)
+    assembly, part = graph.node('component', 4), graph.node('component', 1)
+
+    assert finder.find(assembly, part)['status'] == 'no_path'
+
+    result = finder.find(assembly, part, direction='any', weight='hops')
+    assert _route(result['paths'][0]) == [4, 1]
+    assert result['paths'][0]['edges'][0]['reversed'] is True
+
+def test_peer_edges_only_in_any_direction():
+    graph = _graph()
+    finder = PathFinder(graph)
+    peer, assembly = graph.node('component', 5), graph.node('component', 4)
+    assert finder.find(peer, assembly)['status'] == 'no_path'
+    assert _route(finder.find(peer, assembly, direction='any')['paths'][0]) == [5, 4]
+
+def test_budget_stops_the_search():
+    graph = _graph()
+    result = PathFinder(graph).find(graph.node('component', 1), graph.node('component', 4), k=3, max_nodes=1)
+    assert result['status'] == 'budget_exceeded'
@@ -4,15 +4,17 @@ CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
 -- Create suppliers table
 CREATE TABLE IF NOT EXISTS suppliers (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
     country VARCHAR(100),
+    website VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
 -- Create categories table  
 CREATE TABLE IF NOT EXISTS categories (
     id SERIAL PRIMARY KEY,
-    name VARCHAR(255) NOT NULL,
+    name VARCHAR(255) NOT NULL UNIQUE,
+    description TEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -21,25 +23,62 @@ CREATE TABLE IF NOT EXISTS components (
     id SERIAL PRIMARY KEY,
     part_name VARCHAR(255) NOT NULL,
     part_number VARCHAR(100),
+    subcategory VARCHAR(100),
     supplier_id INTEGER REFERENCES suppliers(id),
     category_id INTEGER REFERENCES categories(id),
     price_min DECIMAL(10,2),
     price_max DECIMAL(10,2),
     currency VARCHAR(10) DEFAULT 'EUR',
     description TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    specifications TEXT,
+    is_active BOOLEAN DEFAULT true,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    row_hash CHAR(32),
+    sync_source VARCHAR(255)
 );
 
--- Create relationships table
+-- Create relationships table (source/target ids refer to the table named by *_type)
 CREATE TABLE IF NOT EXISTS supply_chain_relationships (
     id SERIAL PRIMARY KEY,
-    source_id INTEGER REFERENCES components(id),
-    target_id INTEGER REFERENCES components(id),
+    source_type VARCHAR(20) NOT NULL DEFAULT 'component',
+    source_id INTEGER NOT NULL,
+    target_type VARCHAR(20) NOT NULL DEFAULT 'component',
+    target_id INTEGER NOT NULL,
     relationship_type VARCHAR(100),
-    strength DECIMAL(3,2) DEFAULT 1.0,
+    relationship_strength DECIMAL(3,2) DEFAULT 1.0,
+    volume_annual INTEGER,
+    value_annual DECIMAL(15,2),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Create vehicle tables
+CREATE TABLE IF NOT EXISTS vehicle_manufacturers (
+    id SERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL UNIQUE,
+    country VARCHAR(100),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS vehicle_models (
+    id SERIAL PRIMARY KEY,
+    manufacturer_id INTEGER NOT NULL REFERENCES vehicle_manufacturers(id),
+    model_name VARCHAR(100) NOT NULL,
+    model_year_start INTEGER,
+    model_year_end INTEGER,
+    vehicle_type VARCHAR(50),
+    generation VARCHAR(50),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS component_compatibility (
+    id SERIAL PRIMARY KEY,
+    component_id INTEGER NOT NULL REFERENCES components(id),
+    vehicle_model_id INTEGER NOT NULL REFERENCES vehicle_models(id),
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    UNIQUE (component_id, vehicle_model_id)
+);
+
 -- Create IP screener usage tracking table
 CREATE TABLE IF NOT EXISTS ip_screener_usage (
     id SERIAL PRIMARY KEY,
@@ -52,11 +91,34 @@ CREATE TABLE IF NOT EXISTS ip_screener_usage (
     from_cache BOOLEAN DEFAULT FALSE
 );
 
+-- Create shared IP screener result cache (keyed by SHA-256 query hash)
+CREATE TABLE IF NOT EXISTS ip_screener_cache (
+    query_hash VARCHAR(64) PRIMARY KEY,
+    part_name VARCHAR(200),
+    description TEXT,
+    reference VARCHAR(100),
+    response_data TEXT NOT NULL,
+    is_simulation BOOLEAN DEFAULT FALSE,
+    size_bytes INTEGER,
+    hit_count INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_accessed_at TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_components_supplier ON components(supplier_id);
 CREATE INDEX IF NOT EXISTS idx_components_category ON components(category_id);
-CREATE INDEX IF NOT EXISTS idx_relationships_source ON supply_chain_relationships(source_id);
-CREATE INDEX IF NOT EXISTS idx_relationships_target ON supply_chain_relationships(target_id);
+CREATE INDEX IF NOT EXISTS idx_components_active_part_name ON components(part_name) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_components_active_category ON components(category_id, part_name) WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_components_active_supplier ON components(supplier_id, part_name) WHERE is_active;
+CREATE UNIQUE INDEX IF NOT EXISTS uq_supply_chain_relationships_edge
+    ON supply_chain_relationships(source_type, source_id, target_type, target_id, relationship_type);
+CREATE INDEX IF NOT EXISTS idx_scr_target ON supply_chain_relationships(target_type, target_id);
+CREATE INDEX IF NOT EXISTS idx_scr_strength ON supply_chain_relationships(relationship_strength DESC);
+CREATE INDEX IF NOT EXISTS idx_vehicle_models_manufacturer ON vehicle_models(manufacturer_id);
+CREATE INDEX IF NOT EXISTS idx_component_compatibility_model ON component_compatibility(vehicle_model_id);
 CREATE INDEX IF NOT EXISTS idx_usage_component ON ip_screener_usage(component_id);
 CREATE INDEX IF NOT EXISTS idx_usage_timestamp ON ip_screener_usage(timestamp);
+CREATE INDEX IF NOT EXISTS idx_ip_screener_cache_expires ON ip_screener_cache(expires_at);
 